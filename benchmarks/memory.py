@@ -0,0 +1,232 @@
+"""
+The memory harness of the entry points and of the batch and streaming APIs, based on tracemalloc.
+
+For each case, the caches are warmed up first, then the case is traced:
+
+- `peak_bytes`: the largest amount of the temporary memory alive at once (e.g. the temporary datetimes), above the memory before the run
+- `retained_bytes_per_call` and `retained_blocks_per_call`: the growth of the memory still allocated after a run, which should be zero unless there is a leak
+
+Run from the root of the repository:
+
+    python -m benchmarks.memory --output memory.json
+    python -m benchmarks.memory --budgets benchmarks/memory_budgets.json
+    python -m benchmarks.memory --save-budgets benchmarks/memory_budgets.json --headroom 2
+"""
+# Python
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+# Time Utility
+from time_utility import TimeUtility, BoundaryTable, BusinessCalendar, Instant, PeriodIndex, TumblingWindowAggregator
+from time_utility import columnar, instant, ordinals, parallel
+
+# This Package
+from . import run
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# The number of the values of the batch cases
+BATCH_SIZE = 1000
+
+# The minimum number of the calls of each traced run
+MIN_CALLS = 1000
+
+# The number of the traced runs of the retained memory, of which the smallest growth is used
+RETAINED_RUNS = 3
+
+# The extra bytes allowed above the measured values when the budgets are saved
+BUDGET_SLACK_BYTES = 4096
+
+
+def get_cases() -> dict[str, tuple[Callable[[], object], int]]:
+    """
+    Returns the cases by name: the entry points of `benchmarks.run` and the batch and streaming APIs.
+    Each case is a function and the number of the calls (or the values) it handles. The numpy cases are only included if numpy is installed
+    """
+    cases = dict(run.get_cases())
+
+    start = datetime(2021, 1, 1)
+    datetimes = [start + timedelta(minutes=37 * i) for i in range(BATCH_SIZE)]
+    dates = [d.date() for d in datetimes]
+    epochs = [int((d - datetime(1970, 1, 1)).total_seconds()) for d in datetimes]
+    strings = [d.isoformat() + 'Z' for d in datetimes]
+
+    cases["make_aware_many"] = (lambda: TimeUtility.make_aware_many(datetimes, 'Europe/Berlin', 'earliest', 'shift_forward'), BATCH_SIZE)
+    cases["parse_many"] = (lambda: TimeUtility.parse_many(strings), BATCH_SIZE)
+    cases["get_four_week_period_many"] = (lambda: TimeUtility.get_four_week_period_many(dates, as_id=True), BATCH_SIZE)
+    cases["get_week_numbers"] = (lambda: TimeUtility.get_week_numbers(dates), BATCH_SIZE)
+    cases["range[daily]"] = (lambda: sum(1 for _ in TimeUtility.range(datetimes[0], datetimes[-1], TimeUtility.DAILY)), 1)
+
+    cases["instant.get_period_of"] = run.over([e * 1_000_000 for e in epochs], lambda m: instant.get_period_of(m, TimeUtility.MONTHLY))
+    cases["ordinals.to_ordinals[list]"] = (lambda: ordinals.to_ordinals(dates, TimeUtility.FOUR_WEEKLY), BATCH_SIZE)
+    cases["slice_periods[list]"] = (lambda: TimeUtility.slice_periods(datetimes, TimeUtility.DAILY), BATCH_SIZE)
+    cases["parallel.bucket"] = (lambda: parallel.bucket(epochs, TimeUtility.DAILY, workers=1), BATCH_SIZE)
+
+    index = PeriodIndex(TimeUtility.range(datetimes[0], datetimes[-1], TimeUtility.DAILY))
+    aware = [TimeUtility.make_aware(d) for d in datetimes]
+    cases["PeriodIndex.containing"] = run.over(aware, index.containing)
+
+    calendar = BusinessCalendar(holidays=[date(2021, 1, 1), date(2021, 12, 25)])
+    cases["BusinessCalendar.count"] = run.over(dates, lambda d: calendar.count(dates[0], d))
+    cases["BusinessCalendar.add"] = run.over(dates, lambda d: calendar.add(d, 10))
+
+    table = BoundaryTable(['Europe/Berlin', 'America/New_York'])
+    cases["BoundaryTable.get"] = run.over(['Europe/Berlin', 'America/New_York'] * 50, lambda z: table.get(z, TimeUtility.MONTHLY))
+
+    expression = TimeUtility.compile_expression("start of previous month in Europe/Berlin")
+    cases["Expression.evaluate_many[list]"] = (lambda: expression.evaluate_many(aware), BATCH_SIZE)
+
+    events = [(d, 1) for d in aware]
+    cases["TumblingWindowAggregator.process"] = (lambda: sum(1 for _ in TumblingWindowAggregator(TimeUtility.DAILY).process(events)), BATCH_SIZE)
+
+    cases["Instant.from_datetime"] = run.over(aware, Instant.from_datetime)
+
+    if np is not None:
+        epoch_array = np.array(epochs, dtype=np.int64)
+        datetime64 = np.array(datetimes, dtype='datetime64[us]')
+        cases["difference_many"] = (lambda: TimeUtility.difference_many(epoch_array, epoch_array[::-1], TimeUtility.HOUR), BATCH_SIZE)
+        cases["from_epoch_many"] = (lambda: TimeUtility.from_epoch_many(epoch_array, 'Europe/Berlin'), BATCH_SIZE)
+        cases["range_array[daily]"] = (lambda: TimeUtility.range_array(datetimes[0], datetimes[-1], TimeUtility.DAILY), 1)
+        cases["adjust_offset_buffer"] = (lambda: TimeUtility.adjust_offset_buffer(epoch_array, 60, False, unit='s'), BATCH_SIZE)
+        cases["ordinals.to_ordinals[numpy]"] = (lambda: ordinals.to_ordinals(epoch_array, TimeUtility.MONTHLY), BATCH_SIZE)
+        cases["slice_periods[numpy]"] = (lambda: TimeUtility.slice_periods(epoch_array, TimeUtility.DAILY), BATCH_SIZE)
+        cases["Expression.evaluate_many[numpy]"] = (lambda: expression.evaluate_many(datetime64), BATCH_SIZE)
+        cases["columnar.write_period_keys"] = (lambda: _write_period_keys(epoch_array), BATCH_SIZE)
+
+    return cases
+
+
+def _write_period_keys(values) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'epochs.bin')
+        columnar.write_epochs(path, values)
+        columnar.write_period_keys(path, os.path.join(directory, 'keys.bin'), TimeUtility.DAILY, chunk_size=256)
+
+
+def measure(function: Callable[[], object], calls: int) -> dict[str, float]:
+    """
+    Measures the peak and the retained traced memory of a case. The retained memory is the smallest growth of a few traced runs,
+    so the caches filling up (e.g. the caches of the interpreter) and the values replaced in the caches are not counted,
+    but the leaks, which grow in every run, are
+
+    :param function: The function of the case
+    :param calls: The number of the calls (or the values) that the function handles
+    """
+    # The cases with a few calls are repeated, so the constant overhead of the measurement is negligible per call
+    rounds = max(1, MIN_CALLS // calls)
+
+    function()  # Warm up the caches before measuring the memory
+    gc.collect()
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    for _ in range(rounds):
+        function()
+    current, peak = tracemalloc.get_traced_memory()
+
+    retained, blocks = None, None
+    for _ in range(RETAINED_RUNS):
+        previous, previous_blocks = current, sys.getallocatedblocks()
+        for _ in range(rounds):
+            function()
+        current, _ = tracemalloc.get_traced_memory()
+        if retained is None or current - previous < retained:
+            retained, blocks = current - previous, sys.getallocatedblocks() - previous_blocks
+    tracemalloc.stop()
+
+    return {
+        "peak_bytes": float(peak - start),
+        "retained_bytes_per_call": retained / calls / rounds,
+        "retained_blocks_per_call": blocks / calls / rounds,
+    }
+
+
+def check(results: dict, budgets: dict) -> list[str]:
+    """
+    Returns the descriptions of the measurements above their budgets
+
+    :param results: The results of the harness
+    :param budgets: The budgets by case name, e.g. `{"get_week": {"peak_bytes": 2048}}`. The cases without a budget are not checked
+    """
+    violations = []
+    for name, budget in budgets.items():
+        result = results["results"].get(name)
+        if result is None:
+            continue
+        for metric, limit in budget.items():
+            if result[metric] > limit:
+                violations.append("{n} {m}: {v:.1f} (budget {b:.1f})".format(n=name, m=metric, v=result[metric], b=limit))
+    return violations
+
+
+def get_budgets(results: dict, headroom: float) -> dict:
+    """
+    Returns the budgets of the results with the headroom, e.g. 2 for twice the measured values
+
+    :param results: The results of the harness
+    :param headroom: The factor of the measured values
+    """
+    return {
+        name: {
+            "peak_bytes": round(result["peak_bytes"] * headroom + BUDGET_SLACK_BYTES),
+            "retained_bytes_per_call": round(max(result["retained_bytes_per_call"], 0) * headroom + 16, 1),
+        }
+        for name, result in results["results"].items()
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory harness of the time_utility entry points")
+    parser.add_argument("--filter", default="", help="Only run the cases containing this text")
+    parser.add_argument("--output", help="Write the results as JSON to this file instead of stdout")
+    parser.add_argument("--budgets", help="Fail if a case exceeds its budget in this JSON file")
+    parser.add_argument("--save-budgets", help="Write the results with the headroom as the new budgets to this file")
+    parser.add_argument("--headroom", type=float, default=2.0, help="The factor of the measured values for the saved budgets [default: 2]")
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "results": {},
+    }
+    for name, (function, calls) in get_cases().items():
+        if args.filter in name:
+            results["results"][name] = measure(function, calls)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.save_budgets:
+        with open(args.save_budgets, "w") as f:
+            f.write(json.dumps(get_budgets(results, args.headroom), indent=2, sort_keys=True))
+
+    if args.budgets:
+        with open(args.budgets) as f:
+            violations = check(results, json.load(f))
+        for violation in violations:
+            print("Budget exceeded: {v}".format(v=violation), file=sys.stderr)
+        if violations:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Benchmarks of the TimeUtility and TimeUtilityWeek entry points.
+
+Run from the root of the repository:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --filter import --import-budget-ms 50
+"""
+# Python
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from datetime import date, datetime
+from typing import Callable
+
+# Time Utility
+from time_utility import TimeUtility
+
+
+# Representative dates, including the weeks around the year boundaries
+DATES = [
+    date(2020, 6, 5),
+    date(2020, 1, 1),
+    date(2019, 12, 31),
+    date(2019, 12, 29),
+    date(2018, 1, 1),
+    date(2021, 1, 7),
+    date(2021, 1, 1),
+    date(2017, 12, 20),
+    date(2020, 12, 31),
+    date(2021, 2, 27),
+]
+
+IMPORT_CASE = "import time_utility"
+
+WEEK_NUMBERS = [(2021, 32), (2020, 1), (2020, 53), (2019, 49), (2021, 4)]
+
+DATETIME_PAIRS = [
+    (datetime(2021, 3, 1, 12, 30, 15, 500), datetime(2021, 2, 27, 10, 0, 0, 250)),
+    (TimeUtility.make_aware(datetime(2021, 1, 1, 5)), TimeUtility.make_aware(datetime(2020, 12, 31, 23))),
+]
+
+
+def get_cases() -> dict[str, tuple[Callable[[], object], int]]:
+    """
+    Returns the benchmark cases by name. Each case is a function and the number of the calls it makes
+    """
+    cases = {}
+
+    for period in (TimeUtility.DAILY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY):
+        cases["get_period[{p}]".format(p=period)] = over(DATES, lambda d, p=period: TimeUtility.get_period(d.year, d.month, d.day, p))
+        cases["get_period[{p},offset]".format(p=period)] = over(DATES, lambda d, p=period: TimeUtility.get_period(d.year, d.month, d.day, p, 330))
+
+    for unit in (TimeUtility.MICROSECOND, TimeUtility.SECOND, TimeUtility.MINUTE, TimeUtility.HOUR, TimeUtility.DAY):
+        cases["difference[{u}]".format(u=unit)] = over(DATETIME_PAIRS, lambda pair, u=unit: TimeUtility.difference(pair[0], pair[1], u))
+
+    for name in ("get_date_start", "get_date_end", "get_month_start", "get_month_end", "get_year_start", "get_year_end"):
+        function = getattr(TimeUtility, name)
+        cases["{n}[now]".format(n=name)] = (function, 1)
+        if name.startswith("get_date"):
+            cases["{n}[date]".format(n=name)] = over(DATES, lambda d, f=function: f(year=d.year, month=d.month, day=d.day))
+        elif name.startswith("get_month"):
+            cases["{n}[date]".format(n=name)] = over(DATES, lambda d, f=function: f(year=d.year, month=d.month))
+        else:
+            cases["{n}[date]".format(n=name)] = over(DATES, lambda d, f=function: f(year=d.year))
+
+    cases["get_week"] = over(DATES, TimeUtility.get_week)
+    cases["get_week_by_week_number"] = over(WEEK_NUMBERS, lambda pair: TimeUtility.get_week_by_week_number(*pair))
+    cases["get_four_week_period"] = over(DATES, TimeUtility.get_four_week_period)
+
+    return cases
+
+
+def over(inputs: list, function: Callable) -> tuple[Callable[[], object], int]:
+    """
+    Returns a case calling the function once per input
+
+    :param inputs: The inputs of the calls
+    :param function: The function called with each input
+    """
+    def run():
+        for value in inputs:
+            function(value)
+    return run, len(inputs)
+
+
+def measure(function: Callable[[], object], calls: int, repeat: int = 3) -> dict[str, float]:
+    """
+    Measures the nanoseconds and the peak traced memory per call of a case
+
+    :param function: The function of the case
+    :param calls: The number of the calls that the function makes
+    :param repeat: The number of the timing rounds, of which the fastest is used
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+
+    function()  # Warm up the caches before measuring the memory
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ns_per_call": best / number / calls * 1e9,
+        "peak_bytes_per_call": (peak - baseline) / calls,
+    }
+
+
+def measure_import(repeat: int = 3) -> dict[str, float]:
+    """
+    Measures the time of importing the package in a new interpreter, which is the startup cost of the short-lived processes
+
+    :param repeat: The number of the imports, of which the fastest is used
+    """
+    code = "import time; s = time.perf_counter_ns(); import time_utility; print(time.perf_counter_ns() - s)"
+    times = [int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout) for _ in range(repeat)]
+    return {
+        "ns_per_call": float(min(times)),
+        "peak_bytes_per_call": 0.0,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the names of the cases that are slower than the baseline by more than the threshold
+
+    :param results: The current results
+    :param baseline: The baseline results
+    :param threshold: The allowed slowdown, e.g. 0.2 for 20%
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        if result["ns_per_call"] > base["ns_per_call"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def check_import_budget(results: dict, budget_ms: float) -> str | None:
+    """
+    Returns the description of the import time above the budget, or None if it is within the budget (or was not measured)
+
+    :param results: The current results
+    :param budget_ms: The allowed import time in milliseconds
+    """
+    result = results["results"].get(IMPORT_CASE)
+    if result is None:
+        return None
+    import_ms = result["ns_per_call"] / 1e6
+    if import_ms > budget_ms:
+        return "Import budget exceeded: {i:.1f} ms (budget {b:.1f} ms)".format(i=import_ms, b=budget_ms)
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of the time_utility entry points")
+    parser.add_argument("--filter", default="", help="Only run the cases containing this text")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of the timing rounds")
+    parser.add_argument("--output", help="Write the results as JSON to this file instead of stdout")
+    parser.add_argument("--baseline", help="Compare the results with this baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="The allowed slowdown compared with the baseline [default: 0.25]")
+    parser.add_argument("--save-baseline", help="Write the results as the new baseline to this file")
+    parser.add_argument("--import-budget-ms", type=float, help="Fail if importing the package takes longer than this")
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "results": {},
+    }
+    for name, (function, calls) in get_cases().items():
+        if args.filter in name:
+            results["results"][name] = measure(function, calls, args.repeat)
+    if args.filter in IMPORT_CASE:
+        results["results"][IMPORT_CASE] = measure_import(args.repeat)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(output)
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name in regressions:
+            print("Regression: {n} {c:.0f} ns/call (baseline {b:.0f} ns/call)".format(
+                n=name,
+                c=results["results"][name]["ns_per_call"],
+                b=baseline["results"][name]["ns_per_call"]
+            ), file=sys.stderr)
+        failed = failed or bool(regressions)
+
+    if args.import_budget_ms is not None:
+        violation = check_import_budget(results, args.import_budget_ms)
+        if violation is not None:
+            print(violation, file=sys.stderr)
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# Python
+import unittest
+from datetime import datetime, date, timedelta
+
+# Third Party
+import pytz
+
+# Time Utility
+from time_utility import TimeUtility, BoundaryTable, ManualClock
+
+
+class TestBoundaryTable(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = ManualClock(datetime(2024, 3, 30, 22, 30))
+        self.table = BoundaryTable(['Europe/Berlin', 'America/New_York', pytz.utc], clock=self.clock)
+
+    def test_get(self):
+        # 23:30 in Berlin (UTC+1) on the day before the DST change
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.DAILY), (
+            datetime(2024, 3, 29, 23, tzinfo=pytz.utc),
+            datetime(2024, 3, 30, 22, 59, 59, 999999, tzinfo=pytz.utc),
+        ))
+        # The next day is 23 hours long
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.DAILY, 1), (
+            datetime(2024, 3, 30, 23, tzinfo=pytz.utc),
+            datetime(2024, 3, 31, 21, 59, 59, 999999, tzinfo=pytz.utc),
+        ))
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.MONTHLY), (
+            datetime(2024, 2, 29, 23, tzinfo=pytz.utc),
+            datetime(2024, 3, 31, 21, 59, 59, 999999, tzinfo=pytz.utc),
+        ))
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.ANNUAL, -1)[0], datetime(2022, 12, 31, 23, tzinfo=pytz.utc))
+        self.assertEqual(self.table.get(pytz.utc, TimeUtility.FOUR_WEEKLY)[0].date(), TimeUtility.get_four_week_period(date(2024, 3, 30))[0])
+
+        self.assertEqual(
+            self.table.get_many(['America/New_York', pytz.utc], TimeUtility.DAILY),
+            [self.table.get('America/New_York', TimeUtility.DAILY), self.table.get(pytz.utc, TimeUtility.DAILY)],
+        )
+
+        with self.assertRaises(ValueError):
+            self.table.get('Europe/Berlin', TimeUtility.DAILY, 2)
+
+    def test_refresh(self):
+        before = self.table.get('Europe/Berlin', TimeUtility.DAILY)
+        self.clock.advance(timedelta(hours=1))
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.DAILY, -1), before)
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.DAILY)[0], datetime(2024, 3, 30, 23, tzinfo=pytz.utc))
+
+        self.clock.advance(timedelta(days=-3))
+        self.assertEqual(self.table.get('Europe/Berlin', TimeUtility.DAILY)[0], datetime(2024, 3, 27, 23, tzinfo=pytz.utc))
+
+    def test_register(self):
+        self.assertEqual(len(self.table), 3)
+        self.table.get('Asia/Tokyo', TimeUtility.DAILY)
+        self.assertIn('Asia/Tokyo', self.table)
+        self.table.unregister('Asia/Tokyo')
+        self.assertNotIn('Asia/Tokyo', self.table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# Python
+import mmap
+import unittest
+from array import array
+from datetime import datetime
+from unittest import mock
+
+# Time Utility
+from time_utility import TimeUtility
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestAdjustOffsetBuffer(unittest.TestCase):
+
+    def test_same_as_adjust_offset(self):
+        epoch = datetime(1970, 1, 1)
+        values = [datetime(2021, 1, 1, 12), datetime(2021, 6, 30, 23, 59)]
+        seconds = array('q', [int((v - epoch).total_seconds()) for v in values])
+
+        for local_to_utc in (True, False):
+            adjusted = TimeUtility.adjust_offset_buffer(seconds, 330, local_to_utc, unit='s')
+            expected = [int((TimeUtility.adjust_offset(v, 330, local_to_utc) - epoch).total_seconds()) for v in values]
+            self.assertEqual(list(adjusted), expected)
+
+        # The original buffer is unchanged
+        self.assertEqual(list(seconds), [int((v - epoch).total_seconds()) for v in values])
+
+    def test_in_place_and_offsets(self):
+        values = array('q', [0, 0, 0])
+        result = TimeUtility.adjust_offset_buffer(values, array('i', [60, -60, 0]), True, unit='ms', in_place=True)
+        self.assertIs(result, values)
+        self.assertEqual(list(values), [-3_600_000, 3_600_000, 0])
+
+        with mmap.mmap(-1, 32) as mm:
+            view = memoryview(mm)[8:24]
+            TimeUtility.adjust_offset_buffer(view, 1, False, in_place=True)
+            self.assertEqual(list(memoryview(mm).cast('q')), [0, 60_000_000, 60_000_000, 0])
+            view.release()
+
+        with self.assertRaises(ValueError):
+            TimeUtility.adjust_offset_buffer(array('d', [0.0]), 1, False)
+        with self.assertRaises(ValueError):
+            TimeUtility.adjust_offset_buffer(array('q', [0]), array('q', [1, 2]), False)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        values = np.array([0, 1000], dtype=np.int64)
+        result = TimeUtility.adjust_offset_buffer(values, np.array([1, 2]), False, unit='s')
+        self.assertEqual(result.tolist(), [60, 1120])
+        self.assertEqual(values.tolist(), [0, 1000])
+
+        with self.assertRaises(ValueError):
+            TimeUtility.adjust_offset_buffer(bytes(8), 1, False, in_place=True)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_integer_offset(self):
+        values = np.array([0, 1000], dtype=np.int64)
+        result = TimeUtility.adjust_offset_buffer(values, np.int64(60), False, unit='s')
+        self.assertEqual(result.tolist(), [3600, 4600])
+
+        with mock.patch('time_utility.buffers.require_numpy', side_effect=ImportError):
+            adjusted = TimeUtility.adjust_offset_buffer(array('q', [0, 10]), np.int32(2), True, unit='s')
+            self.assertEqual(list(adjusted), [-120, -110])
+
+    def test_without_numpy(self):
+        with mock.patch('time_utility.buffers.require_numpy', side_effect=ImportError):
+            values = array('q', [0, 10])
+            adjusted = TimeUtility.adjust_offset_buffer(values, 2, True, unit='s')
+            self.assertIsInstance(adjusted, array)
+            self.assertEqual(list(adjusted), [-120, -110])
+            TimeUtility.adjust_offset_buffer(values, array('q', [1, 1]), False, unit='s', in_place=True)
+            self.assertEqual(list(values), [60, 70])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# Python
+import random
+import threading
+import unittest
+from datetime import date, datetime, timedelta
+
+# Third Party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Time Utility
+from time_utility import BusinessCalendar
+
+
+class TestBusinessCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.holidays = [date(2023, 12, 25), date(2024, 1, 1), date(2024, 5, 1), datetime(2024, 12, 25, 10)]
+        self.calendar = BusinessCalendar(holidays=self.holidays)
+
+    def _is_business_day(self, d: date) -> bool:
+        return d.weekday() < 5 and d not in (date(2023, 12, 25), date(2024, 1, 1), date(2024, 5, 1), date(2024, 12, 25))
+
+    def test_scalar(self):
+        self.assertTrue(self.calendar.is_business_day(date(2024, 1, 2)))
+        self.assertFalse(self.calendar.is_business_day(date(2024, 1, 1)))
+        self.assertFalse(self.calendar.is_business_day(date(2024, 1, 6)))
+
+        self.assertEqual(self.calendar.next_business_day(date(2023, 12, 29)), date(2024, 1, 2))
+        self.assertEqual(self.calendar.previous_business_day(date(2024, 1, 6)), date(2024, 1, 5))
+        self.assertEqual(self.calendar.previous_business_day(date(2024, 1, 2)), date(2023, 12, 29))
+        self.assertEqual(self.calendar.add(date(2024, 1, 6), 0), date(2024, 1, 8))
+        self.assertEqual(self.calendar.add(date(2024, 1, 6), -1), date(2024, 1, 4))
+        self.assertEqual(self.calendar.add(date(2023, 12, 22), 2), date(2023, 12, 27))
+
+        friday_only = BusinessCalendar(weekend=(0, 1, 2, 3, 5, 6))
+        self.assertEqual(friday_only.count(date(2024, 1, 1), date(2025, 1, 1)), 52)
+
+        with self.assertRaises(ValueError):
+            BusinessCalendar(weekend=range(7))
+
+    def test_random(self):
+        rng = random.Random(11)
+        days = [date(2020, 1, 1) + timedelta(days=rng.randrange(0, 2000)) for _ in range(200)]
+        for start, end in zip(days[:-1], days[1:], strict=True):
+            low, high = min(start, end), max(start, end)
+            expected = sum(self._is_business_day(low + timedelta(days=i)) for i in range((high - low).days))
+            self.assertEqual(self.calendar.count(low, high), expected)
+            reverse = sum(self._is_business_day(low + timedelta(days=i)) for i in range(1, (high - low).days + 1))
+            self.assertEqual(self.calendar.count(high, low), -reverse)
+
+            n = rng.randrange(-300, 300)
+            result = self.calendar.add(start, n)
+            self.assertTrue(self._is_business_day(result))
+            if n > 0 and self._is_business_day(start):
+                self.assertEqual(self.calendar.count(start, result), n)
+
+        self.assertEqual(self.calendar.count_many(days[:-1], days[1:]), [self.calendar.count(a, b) for a, b in zip(days[:-1], days[1:], strict=True)])
+        self.assertEqual(self.calendar.add_many(days, 5), [self.calendar.add(d, 5) for d in days])
+        with self.assertRaises(ValueError):
+            self.calendar.count_many(days, days[1:])
+        with self.assertRaises(ValueError):
+            self.calendar.add_many(days, [1, 2])
+        self.assertEqual(self.calendar.is_business_day_many(days), [self._is_business_day(d) for d in days])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy(self):
+        rng = random.Random(12)
+        days = [date(2020, 1, 1) + timedelta(days=rng.randrange(0, 2000)) for _ in range(200)]
+        offsets = [rng.randrange(-50, 50) for _ in days]
+        array = np.array(days, dtype='datetime64[D]')
+
+        self.assertEqual(self.calendar.is_business_day_many(array).tolist(), self.calendar.is_business_day_many(days))
+        self.assertEqual(self.calendar.count_many(array, array[::-1]).tolist(), self.calendar.count_many(days, days[::-1]))
+        self.assertEqual(self.calendar.add_many(array, offsets).tolist(), self.calendar.add_many(days, offsets))
+
+    def test_threads(self):
+        expected = BusinessCalendar().count(date(1990, 1, 1), date(2030, 1, 1))
+        calendar = BusinessCalendar()
+        results = []
+
+        def count():
+            results.append(calendar.count(date(1990, 1, 1), date(2030, 1, 1)))
+
+        threads = [threading.Thread(target=count) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [expected] * 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# Python
+import unittest
+from datetime import datetime, date, timedelta
+from unittest import mock
+
+# Third Party
+import pytz
+
+# Time Utility
+from time_utility import TimeUtility, Clock, CoarseClock, FrozenClock, ManualClock, SystemClock
+
+
+class TestClock(unittest.TestCase):
+
+    def tearDown(self):
+        TimeUtility.set_clock(SystemClock())
+
+    def test_default(self):
+        self.assertIsInstance(TimeUtility.get_clock(), SystemClock)
+
+    def test_abstract(self):
+        class BrokenClock(Clock):
+            pass
+
+        with self.assertRaises(TypeError):
+            BrokenClock()
+        with self.assertRaises(TypeError):
+            Clock()
+
+    def test_frozen(self):
+        previous = TimeUtility.set_clock(FrozenClock(datetime(2020, 12, 31, 23, 30)))
+        self.assertIsInstance(previous, SystemClock)
+
+        self.assertEqual(TimeUtility.now(), datetime(2020, 12, 31, 23, 30, tzinfo=pytz.utc))
+        self.assertEqual(TimeUtility.today(), date(2020, 12, 31))
+        self.assertEqual(TimeUtility.today('Europe/Berlin'), date(2021, 1, 1))
+        self.assertEqual(TimeUtility.get_month_end().day, 31)
+        self.assertEqual(TimeUtility.get_year_start('Europe/Berlin').year, 2021)
+        self.assertTrue(TimeUtility.is_leap_year())
+
+    def test_manual(self):
+        manual = ManualClock(datetime(2021, 1, 1, tzinfo=pytz.utc))
+        TimeUtility.set_clock(manual)
+        self.assertEqual(TimeUtility.get_date_start().day, 1)
+
+        manual.advance(timedelta(days=1))
+        self.assertEqual(TimeUtility.get_date_start().day, 2)
+
+        manual.set(datetime(2022, 3, 4))
+        self.assertEqual(TimeUtility.today(), date(2022, 3, 4))
+
+    def test_coarse(self):
+        coarse = CoarseClock(timedelta(seconds=1))
+        with mock.patch('time_utility.clock.time.monotonic_ns', return_value=5_000_000_000):
+            first = coarse.now(pytz.utc)
+            self.assertIs(coarse.now(pytz.utc), first)
+        with mock.patch('time_utility.clock.time.monotonic_ns', return_value=6_000_000_000):
+            self.assertIsNot(coarse.now(pytz.utc), first)
+
+        with self.assertRaises(ValueError):
+            CoarseClock(timedelta(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
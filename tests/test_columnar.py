@@ -0,0 +1,132 @@
+# Python
+import gc
+import os
+import random
+import tempfile
+import unittest
+import warnings
+from array import array
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Third Party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Time Utility
+from time_utility import TimeUtility, columnar
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _expected_key(value: int, period: str, offset: int) -> int:
+    d = (_EPOCH + timedelta(seconds=value - offset * 60)).date()
+    if period == TimeUtility.DAILY:
+        return d.toordinal()
+    elif period == TimeUtility.WEEKLY:
+        return (TimeUtility.get_week(d).week_start.toordinal() - 1) // 7
+    elif period == TimeUtility.MONTHLY:
+        return d.year * 12 + d.month - 1
+    elif period == TimeUtility.ANNUAL:
+        return d.year
+    return TimeUtility.get_four_week_period_many([d], as_id=True)[0]
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.values = [rng.randrange(-100_000_000, 1_800_000_000) for _ in range(1000)]
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'epochs.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_open(self):
+        self.assertEqual(columnar.write_epochs(self.path, iter(self.values), unit='ms', chunk_size=100), 1000)
+        self.assertEqual(os.path.getsize(self.path), 16 + 8000)
+        with columnar.open_epochs(self.path) as f:
+            self.assertEqual(f.unit, 'ms')
+            self.assertEqual(len(f), 1000)
+            self.assertEqual(list(f.values(10, 20)), self.values[10:20])
+            self.assertEqual([len(chunk) for chunk in f.chunks(300)], [300, 300, 300, 100])
+
+        columnar.write_epochs(self.path, array('q', self.values), header=False)
+        self.assertEqual(os.path.getsize(self.path), 8000)
+        with columnar.open_epochs(self.path, unit='us') as f:
+            self.assertEqual(f.unit, 'us')
+            self.assertEqual(list(f.values()), self.values)
+
+        columnar.write_epochs(self.path, [])
+        with columnar.open_epochs(self.path) as f:
+            self.assertEqual(len(f.values()), 0)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'123')
+        with self.assertRaises(ValueError):
+            columnar.open_epochs(self.path)
+
+        # The invalid files are closed before the error is raised
+        columnar.write_epochs(self.path, self.values)
+        with open(self.path, 'r+b') as f:
+            f.seek(4)
+            f.write(b'\xff')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            with self.assertRaises(ValueError):
+                columnar.open_epochs(self.path)
+            gc.collect()
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [])
+
+    def test_period_keys(self):
+        for period in (TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY):
+            for offset in (0, 345):
+                expected = [_expected_key(v, period, offset) for v in self.values]
+                self.assertEqual(list(columnar.period_keys(array('q', self.values), period, offset)), expected)
+                with mock.patch('time_utility.ordinals.require_numpy', side_effect=ImportError):
+                    self.assertEqual(list(columnar.period_keys(self.values, period, offset)), expected)
+
+        with self.assertRaises(ValueError):
+            columnar.period_keys(self.values, "hourly")
+
+    def test_values_without_numpy(self):
+        columnar.write_epochs(self.path, self.values)
+        with mock.patch('time_utility.columnar.require_numpy', side_effect=ImportError), columnar.open_epochs(self.path) as f:
+            view = f.values(10, 20)
+            self.assertEqual(list(view), self.values[10:20])
+            del view
+
+            # On a big-endian host the little-endian values are swapped
+            with mock.patch('time_utility.columnar.sys.byteorder', 'big'):
+                swapped = list(f.values(10, 20))
+            self.assertEqual(swapped, [int.from_bytes(v.to_bytes(8, 'little', signed=True), 'big', signed=True) for v in self.values[10:20]])
+
+    def test_write_period_keys(self):
+        columnar.write_epochs(self.path, [v * 1000 for v in self.values], unit='ms')
+        output = os.path.join(self.directory.name, 'keys.bin')
+        self.assertEqual(columnar.write_period_keys(self.path, output, TimeUtility.MONTHLY, chunk_size=128), 1000)
+        with columnar.open_epochs(output) as f:
+            self.assertIsNone(f.unit)
+            self.assertEqual(list(f.values()), [_expected_key(v, TimeUtility.MONTHLY, 0) for v in self.values])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_zero_copy(self):
+        columnar.write_epochs(self.path, np.array(self.values, dtype=np.int64))
+        with columnar.open_epochs(self.path, writable=True) as f:
+            view = f.values()
+            self.assertFalse(view.flags.owndata)
+            view[0] = 42
+            del view
+        with columnar.open_epochs(self.path) as f:
+            view = f.values()
+            self.assertEqual(int(view[0]), 42)
+            self.assertFalse(view.flags.writeable)
+            del view
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# Python
+import random
+import unittest
+from datetime import datetime, date, timedelta
+
+# Third Party
+import pytz
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Time Utility
+from time_utility import TimeUtility, FrozenClock, SystemClock
+
+
+def _micros(value: datetime) -> int:
+    return (value - datetime(1970, 1, 1, tzinfo=pytz.utc)) // timedelta(microseconds=1)
+
+
+class TestExpressions(unittest.TestCase):
+
+    def tearDown(self):
+        TimeUtility.set_clock(SystemClock())
+
+    def test_evaluate(self):
+        reference = datetime(2024, 3, 31, 12, tzinfo=pytz.utc)
+        berlin = pytz.timezone('Europe/Berlin')
+
+        value = TimeUtility.compile_expression("start of previous month in Europe/Berlin").evaluate(reference)
+        self.assertEqual(value, berlin.localize(datetime(2024, 2, 1)))
+        value = TimeUtility.compile_expression("End of this month in Europe/Berlin").evaluate(reference)
+        self.assertEqual(value, berlin.localize(datetime(2024, 3, 31, 23, 59, 59, 999999)))
+        self.assertEqual(value.utcoffset(), timedelta(hours=2))
+
+        value = TimeUtility.compile_expression("end of the four-week period containing today").evaluate(reference)
+        period = TimeUtility.get_four_week_period(date(2024, 3, 31))
+        self.assertEqual(value, TimeUtility.get_period(2024, 3, 31, TimeUtility.FOUR_WEEKLY)[1])
+        self.assertEqual(value.date(), period[2])
+
+        self.assertEqual(
+            TimeUtility.compile_expression("start of next four week").evaluate(reference).date(),
+            period[2] + timedelta(days=1),
+        )
+        self.assertEqual(
+            TimeUtility.compile_expression("start of the next week").evaluate(reference),
+            datetime(2024, 4, 1, tzinfo=pytz.utc),
+        )
+        self.assertEqual(
+            TimeUtility.compile_expression("end of last year").evaluate(reference),
+            TimeUtility.get_period(2023, 1, 1, TimeUtility.ANNUAL)[1],
+        )
+
+        TimeUtility.set_clock(FrozenClock(datetime(2021, 6, 15, 10)))
+        self.assertEqual(TimeUtility.compile_expression("start of day").evaluate(), datetime(2021, 6, 15, tzinfo=pytz.utc))
+
+        for text in ("start", "middle of month", "start of month in", "start of previous fortnight", "start of month containing", "end of day in UTC now"):
+            with self.assertRaises(ValueError):
+                TimeUtility.compile_expression(text)
+
+    def test_evaluate_many(self):
+        rng = random.Random(4)
+        references = [datetime(2024, 1, 1, tzinfo=pytz.utc) + timedelta(minutes=rng.randrange(0, 200_000)) for _ in range(500)]
+        for text in ("start of next day in America/New_York", "end of previous week in Europe/Berlin", "start of this four-week period"):
+            expression = TimeUtility.compile_expression(text)
+            expected = [expression.evaluate(r) for r in references]
+            self.assertEqual(expression.evaluate_many(references), expected)
+
+            if np is None:
+                continue
+            micros = [_micros(r) for r in references]
+            self.assertEqual(expression.evaluate_many(np.array(micros, dtype=np.int64)).tolist(), [_micros(e) for e in expected])
+            result = expression.evaluate_many(np.array(micros, dtype='datetime64[us]'))
+            self.assertEqual(result.astype(np.int64).tolist(), [_micros(e) for e in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# Python
+import pickle
+import unittest
+from datetime import datetime, date, timedelta
+
+# Third Party
+import pytz
+
+# Time Utility
+from time_utility import TimeUtility, Instant, instant
+
+
+class TestInstant(unittest.TestCase):
+
+    def test_civil(self):
+        d = date(1, 1, 1)
+        while d.year < 2500:
+            days = d.toordinal() - date(1970, 1, 1).toordinal()
+            self.assertEqual(instant.days_from_civil(d.year, d.month, d.day), days)
+            self.assertEqual(instant.civil_from_days(days), (d.year, d.month, d.day))
+            d += timedelta(days=13)
+        self.assertEqual(instant.civil_from_days(-1), (1969, 12, 31))
+
+    def test_boundaries(self):
+        def to_int(d: datetime) -> int:
+            return Instant.from_datetime(d).micros
+
+        for year in (1900, 2000, 2023, 2024):
+            self.assertEqual(instant.is_leap_year(year), TimeUtility.is_leap_year(year))
+            for month in range(1, 13):
+                for period in (TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY):
+                    for offset in (0, 210, -300):
+                        start, end = TimeUtility.get_period(year, month, 28, period, offset)
+                        self.assertEqual(instant.get_period(year, month, 28, period, offset), (to_int(start), to_int(end)))
+                        self.assertEqual(instant.get_period_of(to_int(end), period, offset), (to_int(start), to_int(end)))
+
+        self.assertEqual(instant.month_end(2024, 2), to_int(datetime(2024, 2, 29, 23, 59, 59, 999999)))
+        self.assertEqual(instant.year_start(2024), to_int(datetime(2024, 1, 1)))
+        self.assertEqual(instant.date_end(1969, 12, 31), -1)
+        self.assertEqual(instant.four_week_period_id(2024, 1, 1), TimeUtility.get_four_week_period_many([date(2024, 1, 1)], as_id=True)[0])
+
+        with self.assertRaises(ValueError):
+            instant.get_period(2024, 1, 1, "hourly")
+
+    def test_get_period_invalid_date(self):
+        for year, month, day in ((2021, 2, 30), (2021, 13, 1), (2021, 0, 1), (2021, 1, 0), (2021, 4, 31), (0, 1, 1), (10000, 1, 1)):
+            for period in (TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY):
+                with self.subTest(year=year, month=month, day=day, period=period):
+                    with self.assertRaises(ValueError):
+                        TimeUtility.get_period(year, month, day, period)
+                    with self.assertRaises(ValueError):
+                        instant.get_period(year, month, day, period)
+
+    def test_difference(self):
+        pairs = [
+            (datetime(2024, 3, 1, 12, 30, 15, 500), datetime(2024, 2, 27, 1, 2, 3, 400)),
+            (datetime(2024, 3, 1), datetime(2024, 3, 1, 5, 45, 10, 20)),
+        ]
+        for large, small in pairs:
+            for span in (TimeUtility.MICROSECOND, TimeUtility.SECOND, TimeUtility.MINUTE, TimeUtility.HOUR, TimeUtility.DAY):
+                self.assertEqual(
+                    Instant.from_datetime(large).difference(Instant.from_datetime(small), span),
+                    TimeUtility.difference(large, small, span)
+                )
+        self.assertEqual(instant.difference(3 * 86_400_000_000, 0, TimeUtility.HOUR, total=True), 72)
+
+        with self.assertRaises(ValueError):
+            instant.difference(1, 0, "week")
+
+    def test_conversion(self):
+        value = datetime(2024, 3, 31, 1, 30, 0, 123456, tzinfo=pytz.utc)
+        i = Instant.from_datetime(value)
+        self.assertEqual(i.to_datetime(), value)
+        self.assertEqual(Instant.from_datetime(i.to_datetime("Europe/Berlin")), i)
+        self.assertEqual(Instant.from_datetime(value.replace(tzinfo=None)), i)
+        self.assertEqual(Instant.from_datetime(datetime(1, 1, 1)).to_datetime(), datetime(1, 1, 1, tzinfo=pytz.utc))
+        self.assertEqual(i.civil, (2024, 3, 31))
+        self.assertEqual(Instant.from_date(date(2024, 3, 31)), Instant(i.days * instant.MICROSECONDS_PER_DAY))
+        self.assertEqual(Instant.from_epoch(i.to_epoch('ms'), 'ms'), Instant(i.micros - 456))
+
+        start, end = i.get_period(TimeUtility.MONTHLY)
+        self.assertEqual(start.to_datetime(), datetime(2024, 3, 1, tzinfo=pytz.utc))
+        self.assertLess(start, i)
+        self.assertEqual(i.add(1), Instant(i.micros + 1))
+
+    def test_immutable(self):
+        i = Instant(5)
+        with self.assertRaises(AttributeError):
+            i.micros = 6
+        with self.assertRaises(AttributeError):
+            i.other = 6
+        with self.assertRaises(AttributeError):
+            del i.micros
+        self.assertEqual(i.micros, 5)
+        self.assertEqual(pickle.loads(pickle.dumps(i)), i)
+        self.assertEqual(len({Instant(5), i}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
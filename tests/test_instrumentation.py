@@ -0,0 +1,64 @@
+# Python
+import unittest
+from datetime import datetime
+
+# Time Utility
+from time_utility import TimeUtility, instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        original = TimeUtility.__dict__['get_period']
+        TimeUtility.get_period(2021, 1, 1, TimeUtility.DAILY)
+
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(instrumentation.snapshot()["methods"], {})
+
+        instrumentation.enable()
+        self.assertIsNot(TimeUtility.__dict__['get_period'], original)
+        instrumentation.disable()
+        self.assertIs(TimeUtility.__dict__['get_period'], original)
+
+    def test_enabled(self):
+        instrumentation.enable()
+        TimeUtility.get_period(2021, 1, 1, TimeUtility.DAILY)
+        TimeUtility.get_period(2021, 1, 1, period=TimeUtility.MONTHLY)
+        TimeUtility.difference(datetime(2021, 1, 2), datetime(2021, 1, 1), TimeUtility.HOUR)
+        with self.assertRaises(ValueError):
+            TimeUtility.get_period(2021, 1, 1, 'hourly')
+
+        snapshot = instrumentation.snapshot()
+        self.assertTrue(snapshot["enabled"])
+
+        get_period = snapshot["methods"]["get_period"]
+        self.assertEqual(get_period["calls"], 3)
+        self.assertEqual(get_period["constants"], {TimeUtility.DAILY: 1, TimeUtility.MONTHLY: 1})
+        self.assertGreater(get_period["total_ns"], 0)
+        self.assertLessEqual(get_period["p50_ns"], get_period["p99_ns"])
+        self.assertEqual(snapshot["methods"]["difference"]["constants"], {TimeUtility.HOUR: 1})
+        self.assertIn("hit_rate", snapshot["caches"]["boundary"])
+        self.assertIn("hit_rate", snapshot["caches"]["iso_year"])
+
+    def test_nested_calls(self):
+        instrumentation.enable()
+        # `difference` calls `is_aware` and `make_aware` internally
+        TimeUtility.difference(datetime(2021, 1, 2), datetime(2021, 1, 1), TimeUtility.HOUR)
+        TimeUtility.make_aware(datetime(2021, 1, 1))
+
+        methods = instrumentation.snapshot()["methods"]
+        self.assertEqual(methods["difference"]["calls"], 1)
+        self.assertEqual(methods["make_aware"]["calls"], 1)
+        self.assertNotIn("is_aware", methods)
+        self.assertNotIn("boundary_cache_info", methods)
+
+
+if __name__ == '__main__':
+    unittest.main()
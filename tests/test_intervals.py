@@ -0,0 +1,82 @@
+# Python
+import random
+import unittest
+from datetime import datetime, date
+
+# Third Party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Time Utility
+from time_utility import TimeUtility, PeriodIndex
+
+
+class TestPeriodIndex(unittest.TestCase):
+
+    def test_periods(self):
+        months = [TimeUtility.get_period(2024, month, 1, TimeUtility.MONTHLY) for month in range(1, 13)]
+        index = PeriodIndex((start, end, start.month) for start, end in months)
+
+        point = TimeUtility.make_aware(datetime(2024, 3, 15))
+        self.assertEqual(index.containing(point), [(*months[2], 3)])
+        self.assertEqual([p[2] for p in index.overlapping(months[1][1], months[3][0])], [2, 3, 4])
+        self.assertEqual(index.next_boundary(point), months[2][1])
+        self.assertEqual(index.next_boundary(months[11][1]), None)
+        self.assertEqual(index.containing(TimeUtility.make_aware(datetime(2025, 1, 1))), [])
+
+        index.add(months[0][0], months[11][1], 'year')
+        self.assertEqual([p[2] for p in index.containing(point)], ['year', 3])
+
+        with self.assertRaises(ValueError):
+            index.add(months[1][0], months[0][0])
+
+    def test_random(self):
+        rng = random.Random(7)
+        periods = []
+        for _ in range(300):
+            start = rng.randrange(0, 10_000)
+            periods.append((start, start + rng.randrange(0, 500), len(periods)))
+
+        index = PeriodIndex(periods[:100])
+        for period in periods[100:]:
+            index.add(*period)
+        self.assertEqual(len(index), 300)
+
+        ordered = sorted(periods, key=lambda p: (p[0], p[1]))
+        boundaries = sorted({b for p in periods for b in p[:2]})
+        for _ in range(200):
+            a = rng.randrange(-100, 10_600)
+            b = a + rng.randrange(0, 300)
+            expected = [p for p in ordered if p[0] <= b and p[1] >= a]
+            self.assertEqual(sorted(index.overlapping(a, b)), sorted(expected))
+            self.assertEqual([p[:2] for p in index.overlapping(a, b)], [p[:2] for p in expected])
+            self.assertEqual(index.next_boundary(a), next((x for x in boundaries if x > a), None))
+
+        points = [rng.randrange(0, 10_000) for _ in range(50)]
+        self.assertEqual(index.containing_many(points), [index.containing(p) for p in points])
+        self.assertEqual(index.next_boundary_many(points), [index.next_boundary(p) for p in points])
+        self.assertEqual(index.overlapping_many([(1, 2), (5, 9)]), [index.overlapping(1, 2), index.overlapping(5, 9)])
+
+        if np is not None:
+            result = index.next_boundary_many(np.array(points + [20_000], dtype=np.int64))
+            self.assertEqual(result.tolist(), [index.next_boundary(p) for p in points] + [np.iinfo(np.int64).min])
+
+            # -1 is a valid boundary (e.g. the epoch value of 1969-12-31T23:59:59), so it is not used as the marker
+            negative = PeriodIndex([(-10, -1)])
+            self.assertEqual(negative.next_boundary_many(np.array([-5, -1], dtype=np.int64)).tolist(), [-1, np.iinfo(np.int64).min])
+            self.assertEqual(PeriodIndex().next_boundary_many(np.array([1], dtype=np.int32)).tolist(), [np.iinfo(np.int32).min])
+            floats = negative.next_boundary_many(np.array([-5.0, 0.0]))
+            self.assertEqual(floats[0], -1.0)
+            self.assertTrue(np.isnan(floats[1]))
+
+    def test_four_week_periods(self):
+        periods = [TimeUtility.get_four_week_period(date(2024, 1, 1))]
+        index = PeriodIndex([(p[0], p[2]) for p in periods])
+        self.assertEqual(index.containing(date(2024, 1, 15)), [(periods[0][0], periods[0][2], None)])
+        self.assertEqual(PeriodIndex().containing(date(2024, 1, 15)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
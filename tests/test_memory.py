@@ -0,0 +1,42 @@
+# Python
+import json
+import os
+import unittest
+
+# Time Utility
+from benchmarks import memory
+
+
+_BUDGETS = os.path.join(os.path.dirname(memory.__file__), 'memory_budgets.json')
+
+
+class TestMemory(unittest.TestCase):
+
+    # Measuring all the cases takes a while, and the budgets only hold for the interpreter they were recorded on
+    @unittest.skipUnless(os.environ.get('TIME_UTILITY_MEMORY_BUDGETS'), "set TIME_UTILITY_MEMORY_BUDGETS=1 to check the memory budgets")
+    def test_budgets(self):
+        with open(_BUDGETS) as f:
+            budgets = json.load(f)
+        cases = memory.get_cases()
+        self.assertFalse(set(cases) - set(budgets), "The cases without a budget, see `python -m benchmarks.memory --save-budgets`")
+
+        results = {"results": {name: memory.measure(*cases[name]) for name in budgets if name in cases}}
+        self.assertEqual(memory.check(results, budgets), [])
+
+    def test_check(self):
+        results = {"results": {"a": {"peak_bytes": 2048.0, "retained_bytes_per_call": 0.0}}}
+        self.assertEqual(memory.check(results, {"a": {"peak_bytes": 4096}, "b": {"peak_bytes": 1}}), [])
+        self.assertEqual(memory.check(results, {"a": {"peak_bytes": 1024}}), ["a peak_bytes: 2048.0 (budget 1024.0)"])
+
+    def test_leak(self):
+        leaked = []
+        result = memory.measure(lambda: leaked.extend(object() for _ in range(100)), 100)
+        self.assertGreaterEqual(result["retained_bytes_per_call"], 8)
+        self.assertGreaterEqual(result["retained_blocks_per_call"], 0.9)
+
+        budgets = memory.get_budgets({"results": {"a": result}}, 2)
+        self.assertGreaterEqual(budgets["a"]["peak_bytes"], result["peak_bytes"] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
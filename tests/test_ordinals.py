@@ -0,0 +1,138 @@
+# Python
+import random
+import unittest
+from array import array
+from datetime import datetime, date, timedelta
+from unittest import mock
+
+# Third Party
+import pytz
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Time Utility
+from time_utility import TimeUtility, Instant, ordinals
+
+
+_PERIODS = (TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY)
+
+
+class TestOrdinals(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(9)
+        self.dates = [date(1990, 1, 1) + timedelta(days=rng.randrange(0, 20000)) for _ in range(300)]
+
+    def test_scalar(self):
+        for period in _PERIODS:
+            for d in self.dates[:100]:
+                ordinal = ordinals.to_ordinal(d, period)
+                self.assertEqual(ordinals.to_period(ordinal, period), TimeUtility.get_period(d.year, d.month, d.day, period))
+                self.assertEqual(ordinals.to_period(ordinal, period, 90), TimeUtility.get_period(d.year, d.month, d.day, period, 90))
+                self.assertLessEqual(ordinals.to_date(ordinal, period), d)
+                self.assertGreater(ordinals.to_date(ordinal + 1, period), d)
+                self.assertEqual(ordinals.to_ordinal(ordinals.to_date(ordinal - 1, period), period), ordinal - 1)
+
+        d = date(2024, 3, 15)
+        self.assertEqual(ordinals.to_ordinal(d, TimeUtility.DAILY), d.toordinal())
+        self.assertEqual(ordinals.to_ordinal(d, TimeUtility.MONTHLY), 2024 * 12 + 2)
+        self.assertEqual(ordinals.to_ordinal(d, TimeUtility.ANNUAL), 2024)
+        self.assertEqual(ordinals.to_ordinal(d, TimeUtility.FOUR_WEEKLY), TimeUtility.get_four_week_period_many([d], as_id=True)[0])
+        self.assertEqual(ordinals.to_date(ordinals.to_ordinal(d, TimeUtility.WEEKLY), TimeUtility.WEEKLY), TimeUtility.get_week(d).week_start)
+
+        # With the offset of 60 minutes, the day of `get_period` ends at 00:59:59 UTC of the next day
+        late = datetime(2024, 3, 16, 0, 30, tzinfo=pytz.utc)
+        start, end = ordinals.to_period(d.toordinal(), TimeUtility.DAILY, 60)
+        self.assertTrue(start <= late <= end)
+        self.assertEqual(ordinals.to_ordinal(late, TimeUtility.DAILY, 60), d.toordinal())
+        self.assertEqual(ordinals.to_ordinal(Instant.from_datetime(late), TimeUtility.DAILY, 60), d.toordinal())
+        self.assertEqual(ordinals.to_ordinal(late.replace(tzinfo=None), TimeUtility.DAILY, 60), d.toordinal() + 1)
+
+        with self.assertRaises(ValueError):
+            ordinals.to_ordinal(d, "hourly")
+
+    def test_batch(self):
+        epochs = [int((datetime.combine(d, datetime.min.time()) - datetime(1970, 1, 1)).total_seconds()) + 3600 for d in self.dates]
+        for period in _PERIODS:
+            expected = [ordinals.to_ordinal(d, period) for d in self.dates]
+            self.assertEqual(ordinals.to_ordinals(self.dates, period), expected)
+            if np is None:
+                continue
+            self.assertEqual(ordinals.to_ordinals(np.array(self.dates, dtype='datetime64[D]'), period).tolist(), expected)
+            self.assertEqual(ordinals.to_ordinals(np.array(epochs, dtype=np.int64), period).tolist(), expected)
+
+            starts, ends = ordinals.to_periods(np.array(expected), period, offset=-60, unit='s')
+            periods = ordinals.to_periods(expected, period, offset=-60)
+            self.assertEqual(starts.tolist(), [int(p[0].timestamp()) for p in periods])
+            self.assertEqual(ends.tolist(), [int(p[1].timestamp()) for p in periods])
+
+
+    def test_slice_periods(self):
+        rng = random.Random(4)
+        epochs = sorted(rng.randrange(1_500_000_000, 1_700_000_000) for _ in range(2000))
+        for period in _PERIODS:
+            for offset in (0, 330, -480):
+                # The slices of calling `get_period` per value
+                expected = []
+                for i, epoch in enumerate(epochs):
+                    local = datetime(1970, 1, 1) + timedelta(seconds=epoch - offset * 60)
+                    start = TimeUtility.get_period(local.year, local.month, local.day, period, offset)[0]
+                    if expected and expected[-1][0] == start:
+                        expected[-1] = (start, expected[-1][1], i + 1)
+                    else:
+                        expected.append((start, i, i + 1))
+
+                aware = [datetime(1970, 1, 1, tzinfo=pytz.utc) + timedelta(seconds=epoch) for epoch in epochs]
+                self.assertEqual(ordinals.slice_periods(aware, period, offset), expected)
+                self.assertEqual(ordinals.slice_periods([Instant.from_epoch(epoch) for epoch in epochs], period, offset), expected)
+                self.assertEqual(TimeUtility.slice_periods(aware, period, offset), expected)
+
+                expected_epochs = [(int(start.timestamp()), i, j) for start, i, j in expected]
+                with mock.patch('time_utility.ordinals.require_numpy', side_effect=ImportError()):
+                    self.assertEqual(ordinals.slice_periods(array('q', epochs), period, offset), expected_epochs)
+                    self.assertEqual(ordinals.slice_periods(epochs, period, offset), expected_epochs)
+                if np is None:
+                    continue
+                starts, start_indexes, end_indexes = ordinals.slice_periods(np.array(epochs, dtype=np.int64) * 1000, period, offset, unit='ms')
+                self.assertEqual(list(zip((starts // 1000).tolist(), start_indexes.tolist(), end_indexes.tolist(), strict=True)), expected_epochs)
+                starts, start_indexes, end_indexes = ordinals.slice_periods(epochs, period, offset)
+                self.assertEqual(list(zip(starts.tolist(), start_indexes.tolist(), end_indexes.tolist(), strict=True)), expected_epochs)
+                # A list of the numpy integers is sliced as the epoch values too
+                starts, start_indexes, end_indexes = ordinals.slice_periods(list(np.array(epochs, dtype=np.int64)), period, offset)
+                self.assertEqual(list(zip(starts.tolist(), start_indexes.tolist(), end_indexes.tolist(), strict=True)), expected_epochs)
+                starts, start_indexes, end_indexes = ordinals.slice_periods(np.array(epochs, dtype='datetime64[s]'), period, offset)
+                self.assertEqual(starts.dtype, np.dtype('datetime64[us]'))
+                self.assertEqual(list(zip((starts.astype(np.int64) // 1_000_000).tolist(), start_indexes.tolist(), end_indexes.tolist(), strict=True)), expected_epochs)
+
+                # The sparse values are sliced period by period
+                sparse = epochs[::250]
+                starts, start_indexes, end_indexes = ordinals.slice_periods(np.array(sparse, dtype=np.int64), period, offset)
+                expected_sparse = [(int(start.timestamp()), i, j) for start, i, j in ordinals.slice_periods(aware[::250], period, offset)]
+                self.assertEqual(list(zip(starts.tolist(), start_indexes.tolist(), end_indexes.tolist(), strict=True)), expected_sparse)
+
+    def test_slice_periods_naive(self):
+        dates = sorted(self.dates)
+        slices = ordinals.slice_periods(dates, TimeUtility.MONTHLY)
+        self.assertEqual(sum(j - i for _, i, j in slices), len(dates))
+        for start, i, j in slices:
+            self.assertEqual({(d.year, d.month) for d in dates[i:j]}, {(start.year, start.month)})
+
+        # A naive datetime is considered to be in local time, same as `to_ordinal`
+        values = [datetime(2024, 3, 15, 23, 30), datetime(2024, 3, 16, 0, 30), datetime(2024, 3, 16, 12)]
+        self.assertEqual(ordinals.slice_periods(values, TimeUtility.DAILY, 60), [
+            (ordinals.to_period(date(2024, 3, 15).toordinal(), TimeUtility.DAILY, 60)[0], 0, 1),
+            (ordinals.to_period(date(2024, 3, 16).toordinal(), TimeUtility.DAILY, 60)[0], 1, 3),
+        ])
+
+        self.assertEqual(ordinals.slice_periods([], TimeUtility.DAILY), [])
+        if np is not None:
+            starts, start_indexes, end_indexes = ordinals.slice_periods(np.array([], dtype=np.int64), TimeUtility.DAILY)
+            self.assertEqual((starts.size, start_indexes.size, end_indexes.size), (0, 0, 0))
+        with self.assertRaises(ValueError):
+            ordinals.slice_periods(dates, "hourly")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# Python
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Time Utility
+from time_utility import TimeUtility, Instant, parallel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _expected(times: list[int], period: str, offset: int, weights: list | None = None) -> dict:
+    result = {}
+    for i, t in enumerate(times):
+        local = _EPOCH + timedelta(seconds=t - offset * 60)
+        start = TimeUtility.get_period(local.year, local.month, local.day, period, offset)[0]
+        key = Instant.from_datetime(start).to_epoch('s')
+        result[key] = result.get(key, 0) + (1 if weights is None else weights[i])
+    return dict(sorted(result.items()))
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.times = [rng.randrange(1_600_000_000, 1_750_000_000) for _ in range(2000)]
+
+    def test_bucket(self):
+        for period in (TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY):
+            for offset in (0, -330):
+                self.assertEqual(
+                    parallel.bucket(self.times, period, offset, workers=1, chunk_size=300),
+                    _expected(self.times, period, offset),
+                )
+
+        pairs = [(t, 2) for t in self.times]
+        self.assertEqual(
+            parallel.bucket(iter(pairs), TimeUtility.MONTHLY, aggregate='sum', workers=1),
+            _expected(self.times, TimeUtility.MONTHLY, 0, [2] * len(self.times)),
+        )
+        # The integer sums are exact beyond 2**53, with or without numpy, and the float sums stay floats
+        large = [(t, 2 ** 53 + 1) for t in self.times[:10]]
+        expected = _expected(self.times[:10], TimeUtility.ANNUAL, 0, [2 ** 53 + 1] * 10)
+        self.assertEqual(parallel.bucket(large, TimeUtility.ANNUAL, aggregate='sum', workers=1), expected)
+        with mock.patch('time_utility.parallel.require_numpy', side_effect=ImportError):
+            self.assertEqual(parallel.bucket(large, TimeUtility.ANNUAL, aggregate='sum', workers=1), expected)
+        self.assertEqual(parallel.bucket([(t, 2 ** 70) for t in self.times[:10]], TimeUtility.ANNUAL, aggregate='sum', workers=1),
+                         _expected(self.times[:10], TimeUtility.ANNUAL, 0, [2 ** 70] * 10))
+        halves = parallel.bucket([(t, 0.5) for t in self.times], TimeUtility.ANNUAL, aggregate='sum', workers=1)
+        self.assertEqual(halves, _expected(self.times, TimeUtility.ANNUAL, 0, [0.5] * len(self.times)))
+        self.assertTrue(all(isinstance(v, float) for v in halves.values()))
+
+        ms = parallel.bucket([t * 1000 for t in self.times], TimeUtility.ANNUAL, epoch_unit='ms', workers=1)
+        self.assertEqual({k // 1000: v for k, v in ms.items()}, _expected(self.times, TimeUtility.ANNUAL, 0))
+
+        with self.assertRaises(ValueError):
+            parallel.bucket(self.times, "hourly")
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_integer_weights(self):
+        # The uint64 weights above int64 and the int64 sums which would overflow are added up in Python
+        times = self.times[:10]
+        for weights in (np.full(10, 2 ** 64 - 1, dtype=np.uint64), np.full(10, 2 ** 62, dtype=np.int64), np.full(10, -2 ** 62, dtype=np.int64)):
+            expected = _expected(times, TimeUtility.ANNUAL, 0, [int(w) for w in weights])
+            self.assertEqual(parallel.bucket(zip(times, weights, strict=True), TimeUtility.ANNUAL, aggregate='sum', workers=1), expected)
+
+    def test_processes(self):
+        expected = parallel.bucket(self.times, TimeUtility.FOUR_WEEKLY, workers=1)
+        result = parallel.bucket(self.times, TimeUtility.FOUR_WEEKLY, workers=2, chunk_size=128)
+        self.assertEqual(list(result.items()), list(expected.items()))
+
+    def test_without_numpy(self):
+        with mock.patch('time_utility.parallel.require_numpy', side_effect=ImportError):
+            self.assertEqual(
+                parallel.bucket(self.times, TimeUtility.MONTHLY, workers=1, chunk_size=500),
+                _expected(self.times, TimeUtility.MONTHLY, 0),
+            )
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'epochs.txt')
+            with open(path, 'w') as f:
+                f.write('\n'.join(str(t) for t in self.times) + '\n')
+
+            for workers, chunk_bytes in ((1, 1000), (1, 7), (2, 4096)):
+                self.assertEqual(
+                    parallel.bucket_file(path, TimeUtility.DAILY, workers=workers, chunk_bytes=chunk_bytes),
+                    _expected(self.times, TimeUtility.DAILY, 0),
+                )
+
+            path = os.path.join(directory, 'events.csv')
+            with open(path, 'w') as f:
+                f.write('id,created,amount\n')
+                for i, t in enumerate(self.times):
+                    f.write('{i},{d},{a}\n'.format(i=i, d=(_EPOCH + timedelta(seconds=t)).isoformat() + 'Z', a=i % 5))
+
+            self.assertEqual(
+                parallel.bucket_file(path, TimeUtility.MONTHLY, column='created', header=True, workers=1, chunk_bytes=5000),
+                _expected(self.times, TimeUtility.MONTHLY, 0),
+            )
+            sums = parallel.bucket_file(path, TimeUtility.MONTHLY, aggregate='sum', column=1, value_column='amount', header=True, workers=1)
+            self.assertEqual(sums, _expected(self.times, TimeUtility.MONTHLY, 0, [i % 5 for i in range(len(self.times))]))
+            self.assertTrue(all(isinstance(v, int) for v in sums.values()))
+
+            with self.assertRaises(ValueError):
+                parallel.bucket_file(path, TimeUtility.MONTHLY, column='missing', header=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# Python
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Time Utility
+from benchmarks import run
+
+
+def _results(**ns_per_call) -> dict:
+    return {"results": {name: {"ns_per_call": ns, "peak_bytes_per_call": 0.0} for name, ns in ns_per_call.items()}}
+
+
+class TestRun(unittest.TestCase):
+
+    def test_compare(self):
+        baseline = _results(a=100.0, b=100.0)
+        self.assertEqual(run.compare(_results(a=120.0, b=130.0, c=1000.0), baseline, 0.25), ["b"])
+        self.assertEqual(run.compare(_results(a=125.0), baseline, 0.25), [])
+
+    def test_check_import_budget(self):
+        results = {"results": {run.IMPORT_CASE: {"ns_per_call": 30e6, "peak_bytes_per_call": 0.0}}}
+        self.assertIsNone(run.check_import_budget(results, 50))
+        self.assertEqual(run.check_import_budget(results, 20), "Import budget exceeded: 30.0 ms (budget 20.0 ms)")
+        self.assertIsNone(run.check_import_budget(_results(a=1.0), 20))
+
+    def test_main_reports_every_failure(self):
+        cases = {"a": (lambda: None, 1)}
+        imported = {"ns_per_call": 30e6, "peak_bytes_per_call": 0.0}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            with open(path, 'w') as f:
+                json.dump(_results(a=1e-6), f)
+            with mock.patch.object(run, 'get_cases', return_value=cases), \
+                    mock.patch.object(run, 'measure_import', return_value=imported), \
+                    mock.patch('sys.stderr') as stderr, mock.patch('builtins.print', wraps=print) as printed:
+                code = run.main(['--baseline', path, '--import-budget-ms', '20', '--repeat', '1', '--output', os.path.join(directory, 'out.json')])
+
+        self.assertEqual(code, 1)
+        messages = [call.args[0] for call in printed.call_args_list if call.kwargs.get('file') is stderr]
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(messages[0].startswith("Regression: a "))
+        self.assertTrue(messages[1].startswith("Import budget exceeded"))
+
+
+if __name__ == '__main__':
+    unittest.main()
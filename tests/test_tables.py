@@ -0,0 +1,99 @@
+# Python
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+# Time Utility
+from time_utility import TimeUtility, tables
+from time_utility._periods import compute_four_week_periods, compute_iso_year, get_four_week_periods, get_iso_year
+
+
+class TestTables(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = tables.build(os.path.join(cls.directory, 'calendar.bin'))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def tearDown(self):
+        tables.unload()
+        get_four_week_periods.cache_clear()
+        get_iso_year.cache_clear()
+
+    def _write_corrupted(self, name: str, offset: int | None = None, size: int | None = None) -> str:
+        with open(self.path, 'rb') as f:
+            data = bytearray(f.read())
+        if offset is not None:
+            data[offset] ^= 0xFF
+        if size is not None:
+            data = data[:size]
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_tables(self):
+        with tables.CalendarTables(self.path) as calendar_tables:
+            self.assertEqual((calendar_tables.first_year, calendar_tables.last_year), (1, 9999))
+            self.assertIn(2021, calendar_tables)
+            self.assertNotIn(10000, calendar_tables)
+
+            for year in range(1, 10000):
+                self.assertEqual(calendar_tables.get_iso_year(year), compute_iso_year(year))
+            for year in (1, 4, 100, 1582, 1900, 2000, 2015, 2020, 2021, 2024, 2100, 9999):
+                self.assertEqual(calendar_tables.get_four_week_periods(year), compute_four_week_periods(year))
+                self.assertEqual(calendar_tables.is_leap_year(year), year % 4 == 0 and (year % 100 != 0 or year % 400 == 0))
+                self.assertEqual(calendar_tables.get_days_in_month(year, 2), 29 if calendar_tables.is_leap_year(year) else 28)
+            self.assertEqual(calendar_tables.get_days_in_month(2021, 4), 30)
+
+            with self.assertRaises(ValueError):
+                calendar_tables.get_iso_year(0)
+
+    def test_invalid(self):
+        size = os.path.getsize(self.path)
+        for path in (
+            self._write_corrupted('checksum.bin', offset=size - 1),
+            self._write_corrupted('magic.bin', offset=0),
+            self._write_corrupted('truncated.bin', size=size - 84),
+            self._write_corrupted('empty.bin', size=0),
+        ):
+            with self.assertRaises(ValueError):
+                tables.CalendarTables(path)
+            self.assertFalse(tables.load(path))
+            self.assertIsNone(tables.get_tables())
+
+        self.assertFalse(tables.load(os.path.join(self.directory, 'missing.bin')))
+
+    def test_lookups(self):
+        rng = random.Random(5)
+        dates = [date.fromordinal(rng.randrange(1, date(9999, 12, 31).toordinal() + 1)) for _ in range(300)]
+        dates += [date(2020, 12, 31), date(2021, 1, 1), date(2021, 1, 4), date(2026, 12, 28), date(9999, 12, 31)]
+
+        tables.unload()
+        expected = [(TimeUtility.get_four_week_period(d), TimeUtility.get_week(d).week_number) for d in dates]
+
+        get_four_week_periods.cache_clear()
+        get_iso_year.cache_clear()
+        self.assertTrue(tables.load(self.path))
+        self.assertIsNotNone(tables.get_tables())
+        self.assertEqual([(TimeUtility.get_four_week_period(d), TimeUtility.get_week(d).week_number) for d in dates], expected)
+        self.assertEqual(TimeUtility.get_week_by_week_number(2020, 53).week_start, date(2020, 12, 28))
+
+    def test_default_path(self):
+        with mock.patch.dict(os.environ, {'TIME_UTILITY_CALENDAR_TABLES': self.path}):
+            self.assertEqual(tables.get_default_path(), self.path)
+            self.assertTrue(tables.load())
+        with mock.patch.dict(os.environ, {'TIME_UTILITY_CALENDAR_TABLES': '', 'XDG_CACHE_HOME': self.directory}):
+            self.assertEqual(tables.get_default_path(), os.path.join(self.directory, 'time_utility', 'calendar-v1.bin'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,20 @@
 # Python
+import pickle
+import subprocess
+import sys
 import unittest
-from datetime import datetime, date
+import zoneinfo
+from datetime import datetime, date, timedelta, timezone
 from calendar import monthrange
 
 # Third Party
 import pytz
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Time Utility
 from time_utility import TimeUtility
 
@@ -21,6 +30,79 @@ class TestTimeUtility(unittest.TestCase):
     def test_make_aware(self):
         self.assertTrue(TimeUtility.is_aware(TimeUtility.make_aware(datetime.now())))
 
+    def test_make_aware_many(self):
+        berlin = pytz.timezone('Europe/Berlin')
+        values = [datetime(2021, 1, 15, 12), datetime(2021, 7, 15, 12)]
+        aware = TimeUtility.make_aware_many(values, berlin)
+        self.assertEqual(aware, [berlin.localize(v) for v in values])
+        self.assertEqual([a.utcoffset().seconds // 3600 for a in aware], [1, 2])
+
+        # The clocks are turned back at 03:00 on 2021-10-31 and forward at 02:00 on 2021-03-28
+        ambiguous = [datetime(2021, 10, 31, 2, 30)]
+        with self.assertRaises(ValueError):
+            TimeUtility.make_aware_many(ambiguous, berlin)
+        self.assertEqual(TimeUtility.make_aware_many(ambiguous, berlin, ambiguous='earliest'), [berlin.localize(ambiguous[0], is_dst=True)])
+        self.assertEqual(TimeUtility.make_aware_many(ambiguous, berlin, ambiguous='latest'), [berlin.localize(ambiguous[0], is_dst=False)])
+
+        nonexistent = [datetime(2021, 3, 28, 2, 30)]
+        with self.assertRaises(ValueError):
+            TimeUtility.make_aware_many(nonexistent, berlin)
+        self.assertEqual(TimeUtility.make_aware_many(nonexistent, berlin, nonexistent='none'), [None])
+        forward = TimeUtility.make_aware_many(nonexistent, berlin, nonexistent='shift_forward')[0]
+        self.assertEqual(forward, berlin.localize(datetime(2021, 3, 28, 3)))
+        backward = TimeUtility.make_aware_many(nonexistent, berlin, nonexistent='shift_backward')[0]
+        self.assertEqual(backward, berlin.localize(datetime(2021, 3, 28, 1, 59, 59, 999999)))
+
+        epochs = [0, 1625313600]
+        self.assertEqual(TimeUtility.from_epoch_many(epochs, berlin), [datetime.fromtimestamp(e, tz=berlin) for e in epochs])
+
+        if np is not None:
+            arr = np.array(values + ambiguous + nonexistent, dtype='datetime64[us]')
+            utc = TimeUtility.make_aware_many(arr, berlin, ambiguous='earliest', nonexistent='shift_forward')
+            expected = aware + TimeUtility.make_aware_many(ambiguous, berlin, ambiguous='earliest') + [forward]
+            self.assertEqual(utc.tolist(), [int(a.timestamp()) * 1000000 for a in expected])
+
+    def test_make_aware_many_without_transitions(self):
+        # The static pytz timezones have no transition table, so their fixed offset is used
+        static = pytz.timezone('Etc/GMT-3')
+        self.assertFalse(hasattr(static, '_utc_transition_times'))
+        values = [datetime(2021, 1, 15, 12), datetime(2021, 7, 15, 12)]
+        self.assertEqual(TimeUtility.make_aware_many(values, static), [static.localize(v) for v in values])
+        self.assertEqual(TimeUtility.from_epoch_many([0, 1625313600], static), [datetime.fromtimestamp(e, tz=static) for e in (0, 1625313600)])
+        self.assertEqual(TimeUtility.make_aware_many(values, pytz.utc), [pytz.utc.localize(v) for v in values])
+
+    def test_lazy_import(self):
+        code = "import sys, time_utility; print('pytz' in sys.modules, 'numpy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False False")
+
+    def test_zoneinfo_backend(self):
+        TimeUtility.set_timezone_backend('zoneinfo')
+        try:
+            self.assertIs(TimeUtility.now().tzinfo, timezone.utc)
+            berlin = TimeUtility.get_timezone('Europe/Berlin')
+            self.assertIsInstance(berlin, zoneinfo.ZoneInfo)
+            self.assertEqual(TimeUtility.get_month_start('Europe/Berlin', 2021, 7).tzinfo, berlin)
+            self.assertEqual(TimeUtility.get_period(2021, 7, 1, TimeUtility.DAILY)[0], datetime(2021, 7, 1, tzinfo=timezone.utc))
+
+            # zoneinfo has no transition table, so the ambiguous and nonexistent times are resolved with `fold`
+            pytz_berlin = pytz.timezone('Europe/Berlin')
+            values = [datetime(2021, 7, 15, 12), datetime(2021, 10, 31, 2, 30), datetime(2021, 3, 28, 2, 30)]
+            aware = TimeUtility.make_aware_many(values, 'Europe/Berlin', ambiguous='latest', nonexistent='shift_forward')
+            expected = TimeUtility.make_aware_many(values, pytz_berlin, ambiguous='latest', nonexistent='shift_forward')
+            # PEP 495 never considers the ambiguous times equal across timezones, so the instants are compared
+            self.assertEqual([a.timestamp() for a in aware], [e.timestamp() for e in expected])
+            self.assertEqual(aware[2].replace(tzinfo=None), datetime(2021, 3, 28, 3))
+            backward = TimeUtility.make_aware_many(values[2:], berlin, nonexistent='shift_backward')
+            self.assertEqual(backward, TimeUtility.make_aware_many(values[2:], pytz_berlin, nonexistent='shift_backward'))
+            if np is not None:
+                utc = TimeUtility.make_aware_many(np.array(values, dtype='datetime64[us]'), berlin, 'latest', 'shift_forward')
+                self.assertEqual(utc.tolist(), [int(e.timestamp()) * 1000000 for e in expected])
+            self.assertEqual(TimeUtility.from_epoch_many([0], berlin), [datetime(1970, 1, 1, 1, tzinfo=berlin)])
+        finally:
+            TimeUtility.set_timezone_backend('pytz')
+        self.assertIs(TimeUtility.now().tzinfo, pytz.utc)
+
     def test_now(self):
         self.assertEqual(type(TimeUtility.now()), type(datetime.now()))
 
@@ -75,6 +157,11 @@ class TestTimeUtility(unittest.TestCase):
         self.assertEqual(start.second, 59)
         self.assertEqual(start.microsecond, 999999)
 
+        # Same as `calendar.monthrange`, an invalid month raises ValueError
+        for month in (0, 13):
+            with self.assertRaises(ValueError):
+                TimeUtility.get_month_end(year=2020, month=month)
+
     def test_get_year_start(self):
         start = TimeUtility.get_year_start()
         manual = datetime.now(tz=pytz.utc)
@@ -99,6 +186,23 @@ class TestTimeUtility(unittest.TestCase):
         self.assertEqual(start.second, 59)
         self.assertEqual(start.microsecond, 999999)
 
+    def test_boundary_cache(self):
+        TimeUtility.boundary_cache_clear()
+        start, end = TimeUtility.get_period(2020, 2, 10, TimeUtility.DAILY)
+        self.assertEqual(start, datetime(2020, 2, 10, tzinfo=pytz.utc))
+        self.assertEqual(end, datetime(2020, 2, 10, 23, 59, 59, 999999, tzinfo=pytz.utc))
+        self.assertEqual(TimeUtility.boundary_cache_info().misses, 2)
+
+        again_start, _ = TimeUtility.get_period(2020, 2, 10, TimeUtility.DAILY)
+        self.assertIs(again_start, start)
+        self.assertEqual(TimeUtility.boundary_cache_info().hits, 2)
+
+        # The tzinfo of the clock snapshot is kept, same as replacing the fields of `datetime.now`
+        berlin = pytz.timezone('Europe/Berlin')
+        month_end = TimeUtility.get_month_end(berlin, 2020, 2)
+        self.assertEqual(month_end, datetime.now(tz=berlin).replace(year=2020, month=2, day=29, hour=23, minute=59, second=59, microsecond=999999))
+        self.assertEqual(month_end.tzinfo, datetime.now(tz=berlin).tzinfo)
+
     def test_adjust_offset(self):
         utc_time = TimeUtility.now()
         local_time = datetime.now()
@@ -144,6 +248,52 @@ class TestTimeUtility(unittest.TestCase):
         self.assertEqual(week_3.week_start, date(2020, 6, 1))
         self.assertEqual(week_3.week_end, date(2020, 6, 7))
 
+    def test_shared_week(self):
+        week = TimeUtility.get_week(date(2021, 8, 13))
+        self.assertIs(TimeUtility.get_week(date(2021, 8, 13)), week)
+
+        # Weeks are equal if they are the same ISO week
+        other_day = TimeUtility.get_week(date(2021, 8, 9))
+        self.assertEqual(week, other_day)
+        self.assertEqual(hash(week), hash(other_day))
+        self.assertNotEqual(week, TimeUtility.get_week(date(2021, 8, 16)))
+        self.assertEqual(len({week, other_day, TimeUtility.get_week_by_week_number(2021, 32)}), 1)
+        self.assertEqual(week.iso_year, 2021)
+
+        # The data of the week is stored once and shared by the dates of the week
+        self.assertIs(week.week_start, other_day.week_start)
+        self.assertIs(week.week_end, TimeUtility.get_week_by_week_number(2021, 32).week_end)
+        self.assertEqual(TimeUtility.get_week(date(2021, 1, 3)).week_start, date(2020, 12, 28))
+        self.assertEqual(TimeUtility.get_week(date(9999, 12, 31)).week_number, 52)
+
+        with self.assertRaises(AttributeError):
+            week.od = date(2021, 8, 14)
+        with self.assertRaises(AttributeError):
+            week.extra = 1
+
+        restored = pickle.loads(pickle.dumps(week))
+        self.assertEqual(restored.od, week.od)
+        self.assertEqual(restored.week_end, date(2021, 8, 15))
+
+    def test_week_numbers(self):
+        dates = [date(2019, 12, 30), date(2021, 1, 3), date(2020, 12, 31), date(2021, 8, 13)]
+        expected = [(2020, 1), (2020, 53), (2020, 53), (2021, 32)]
+        self.assertEqual(TimeUtility.get_week_numbers(dates), expected)
+
+        starts = TimeUtility.get_week_starts_by_week_numbers(expected)
+        self.assertEqual(starts, [date(2019, 12, 30), date(2020, 12, 28), date(2020, 12, 28), date(2021, 8, 9)])
+
+        # Same as strptime, the week 53 of a 52-week year is the first week of the next year
+        self.assertEqual(TimeUtility.get_week_by_week_number(2021, 53).week_start, date(2022, 1, 3))
+        with self.assertRaises(ValueError):
+            TimeUtility.get_week_by_week_number(2021, 54)
+
+        if np is not None:
+            arr = TimeUtility.get_week_numbers(np.array(dates, dtype='datetime64[D]'))
+            self.assertEqual([tuple(pair) for pair in arr.tolist()], expected)
+            arr_starts = TimeUtility.get_week_starts_by_week_numbers(np.array(expected))
+            self.assertEqual(arr_starts.astype(object).tolist(), starts)
+
     def test_four_week_period(self):
         # 1. The week is neither in the first nor in the last four weeks of the year
         one_date = date(2020, 6, 5)
@@ -244,6 +394,109 @@ class TestTimeUtility(unittest.TestCase):
         self.assertEqual(eleven_end_week, 8)
         self.assertEqual(eleven_end_date, date(2021, 2, 28))
 
+    def test_range(self):
+        start = datetime(2020, 12, 30, 15)
+        end = datetime(2021, 3, 2)
+
+        for period in [TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY]:
+            periods = list(TimeUtility.range(start, end, period))
+            self.assertEqual(periods[0], TimeUtility.get_period(2020, 12, 30, period))
+            self.assertEqual(periods[-1], TimeUtility.get_period(2021, 3, 2, period))
+            for (_, previous_end), (next_start, _) in zip(periods[:-1], periods[1:], strict=True):
+                self.assertEqual(next_start - previous_end, timedelta(microseconds=1))
+
+        self.assertEqual(len(list(TimeUtility.range(start, end, TimeUtility.DAILY))), 63)
+        self.assertEqual([p[0].day for p in TimeUtility.range(start, end, TimeUtility.DAILY, step=30)], [30, 29, 28])
+
+        # The periods follow the DST of the timezone
+        berlin = pytz.timezone('Europe/Berlin')
+        days = list(TimeUtility.range(datetime(2021, 3, 27), datetime(2021, 3, 28), TimeUtility.DAILY, timezone=berlin))
+        self.assertEqual(days[0][0], berlin.localize(datetime(2021, 3, 27)))
+        self.assertEqual(days[1][1] - days[1][0], timedelta(hours=23) - timedelta(microseconds=1))
+
+        if np is not None:
+            for period in [TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY]:
+                starts, ends = TimeUtility.range_array(start, end, period, step=2, timezone=berlin)
+                expected = list(TimeUtility.range(start, end, period, step=2, timezone=berlin))
+                epoch = datetime(1970, 1, 1, tzinfo=pytz.utc)
+                self.assertEqual(starts.tolist(), [(p[0] - epoch) // timedelta(microseconds=1) for p in expected])
+                self.assertEqual(ends.tolist(), [(p[1] - epoch) // timedelta(microseconds=1) for p in expected])
+
+    def test_parse_many(self):
+        aware = TimeUtility.parse_many(['2024-03-01T12:34:56.123+02:00', '2024-03-01T23:00:00Z', '2024-03-01T12:00:00-0530'])
+        self.assertEqual(aware, [
+            datetime(2024, 3, 1, 10, 34, 56, 123000, tzinfo=pytz.utc),
+            datetime(2024, 3, 1, 23, tzinfo=pytz.utc),
+            datetime(2024, 3, 1, 17, 30, tzinfo=pytz.utc),
+        ])
+
+        # Javascript local times with `-1 * getTimezoneOffset()`, same as `adjust_offset`
+        local = ['2024-03-01T12:34:56', '2024-03-01 01:00:00']
+        offsets = [330, -300]
+        expected = [
+            TimeUtility.make_aware(TimeUtility.adjust_offset(datetime.strptime(s.replace(' ', 'T'), '%Y-%m-%dT%H:%M:%S'), o, True))
+            for s, o in zip(local, offsets, strict=True)
+        ]
+        self.assertEqual(TimeUtility.parse_many(local, offsets), expected)
+        self.assertEqual(TimeUtility.parse_many(iter(local)), [datetime(2024, 3, 1, 12, 34, 56, tzinfo=pytz.utc), datetime(2024, 3, 1, 1, tzinfo=pytz.utc)])
+        self.assertEqual(TimeUtility.parse_many(local[:1], timezone='Europe/Berlin'), [datetime(2024, 3, 1, 11, 34, 56, tzinfo=pytz.utc)])
+
+        if np is not None:
+            epoch = datetime(1970, 1, 1, tzinfo=pytz.utc)
+            self.assertEqual(TimeUtility.parse_many(local, offsets, as_epoch=True, epoch_unit='s').tolist(), [int((e - epoch).total_seconds()) for e in expected])
+            self.assertEqual(TimeUtility.parse_many(local, np.array(offsets), as_epoch=True).tolist(), [(e - epoch) // timedelta(microseconds=1) for e in expected])
+            self.assertEqual(TimeUtility.parse_many(['2024-03-01T00:00:00Z'], as_epoch=True, epoch_unit='ms').tolist(), [1709251200000])
+            self.assertEqual(
+                TimeUtility.parse_many(['2024-03-01T12:00:00+02', '2024-03-01T12:00:00-0530'], as_epoch=True, epoch_unit='s').tolist(),
+                [int(d.timestamp()) for d in TimeUtility.parse_many(['2024-03-01T12:00:00+02', '2024-03-01T12:00:00-0530'])],
+            )
+
+        # The shape of every string is checked, not only of the first one
+        for mixed in (['2024-03-01T12:00:00', '2024-03-01T12:00:00+02:00'], ['2024-03-01T12:00:00+02:00', '2024-03-01T12:00:00']):
+            with self.assertRaises(ValueError):
+                TimeUtility.parse_many(mixed)
+            if np is not None:
+                with self.assertRaises(ValueError):
+                    TimeUtility.parse_many(mixed, as_epoch=True)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_difference_many(self):
+        large = [datetime(2021, 3, 1, 12, 30, 15, 500), datetime(2021, 1, 1), datetime(2020, 2, 29, 23, 59, 59)]
+        small = [datetime(2021, 2, 27, 10, 0, 0, 250), datetime(2021, 1, 1, 5, 0, 0), datetime(2020, 2, 28)]
+        large_arr = np.array(large, dtype='datetime64[us]')
+        small_arr = np.array(small, dtype='datetime64[us]')
+
+        for unit in [TimeUtility.MICROSECOND, TimeUtility.SECOND, TimeUtility.MINUTE, TimeUtility.HOUR, TimeUtility.DAY]:
+            expected = [TimeUtility.difference(lt, st, unit) for lt, st in zip(large, small, strict=True)]
+            self.assertEqual(TimeUtility.difference_many(large_arr, small_arr, unit).tolist(), expected)
+
+        # Epoch values and total duration
+        large_epoch = np.array([7200, 90000], dtype=np.int64)
+        small_epoch = np.array([0, 0], dtype=np.int64)
+        self.assertEqual(TimeUtility.difference_many(large_epoch, small_epoch, TimeUtility.HOUR).tolist(), [2, 1])
+        self.assertEqual(TimeUtility.difference_many(large_epoch, small_epoch, TimeUtility.HOUR, total=True).tolist(), [2, 25])
+        self.assertEqual(TimeUtility.difference_many(large_epoch * 1000, small_epoch, TimeUtility.MINUTE, total=True, epoch_unit='ms').tolist(), [120, 1500])
+
+        with self.assertRaises(ValueError):
+            TimeUtility.difference_many(large_epoch, small_epoch, 'week')
+
+    def test_four_week_period_many(self):
+        dates = [date(2017, 12, 25) + timedelta(days=i) for i in range(365 * 5)]
+        expected = [TimeUtility.get_four_week_period(d) for d in dates]
+
+        from_dates, first_weeks, to_dates, last_weeks = TimeUtility.get_four_week_period_many(dates)
+        self.assertEqual(list(zip(from_dates, first_weeks, to_dates, last_weeks, strict=True)), expected)
+
+        ids = TimeUtility.get_four_week_period_many(dates, as_id=True)
+        self.assertEqual(ids[0], 2017 * 13 + 12)
+        self.assertEqual(ids[-1] - ids[0], len(set(expected)) - 1)
+
+        if np is not None:
+            arr = np.array(dates, dtype='datetime64[D]')
+            arr_from, arr_first, arr_to, arr_last = TimeUtility.get_four_week_period_many(arr)
+            self.assertEqual(list(zip(arr_from.astype(object).tolist(), arr_first.tolist(), arr_to.astype(object).tolist(), arr_last.tolist(), strict=True)), expected)
+            self.assertEqual(TimeUtility.get_four_week_period_many(arr, as_id=True).tolist(), ids)
+
 
 if __name__ == '__main__':
     unittest.main()
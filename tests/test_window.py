@@ -0,0 +1,85 @@
+# Python
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+# Third Party
+import pytz
+
+# Time Utility
+from time_utility import TimeUtility, TumblingWindowAggregator
+
+
+class TestTumblingWindowAggregator(unittest.TestCase):
+
+    def test_daily(self):
+        aggregator = TumblingWindowAggregator(TimeUtility.DAILY)
+        stream = [
+            (datetime(2021, 1, 1, 10), 1),
+            (datetime(2021, 1, 1, 23), 2),
+            (datetime(2021, 1, 3, 1), 5),
+            (datetime(2021, 1, 3, 2), 5),
+        ]
+        windows = list(aggregator.process(stream))
+
+        self.assertEqual([(w.start, w.count, w.value) for w in windows], [
+            (datetime(2021, 1, 1, tzinfo=pytz.utc), 2, 3),
+            (datetime(2021, 1, 3, tzinfo=pytz.utc), 2, 10),
+        ])
+        self.assertEqual(windows[0].end, TimeUtility.get_period(2021, 1, 1, TimeUtility.DAILY)[1])
+
+    def test_watermark_and_lateness(self):
+        aggregator = TumblingWindowAggregator(TimeUtility.DAILY, allowed_lateness=timedelta(hours=2))
+        self.assertEqual(aggregator.add(datetime(2021, 1, 1, 23), 1), [])
+
+        # Still within the allowed lateness of the first window
+        self.assertEqual(aggregator.add(datetime(2021, 1, 2, 1), 1), [])
+        self.assertEqual(aggregator.add(datetime(2021, 1, 1, 22), 1), [])
+
+        closed = aggregator.add(datetime(2021, 1, 2, 3), 1)
+        self.assertEqual([(w.start.day, w.count) for w in closed], [(1, 2)])
+
+        # The first window is already emitted
+        self.assertEqual(aggregator.add(datetime(2021, 1, 1, 12), 1), [])
+        self.assertEqual(aggregator.late_events, 1)
+        self.assertEqual([(w.start.day, w.count) for w in aggregator.flush()], [(2, 2)])
+
+    def test_late_unopened_window(self):
+        aggregator = TumblingWindowAggregator(TimeUtility.DAILY)
+        aggregator.add(datetime(2021, 1, 1, 10), 1)
+        closed = aggregator.add(datetime(2021, 1, 3, 10), 1)
+        self.assertEqual([w.start.day for w in closed], [1])
+
+        # The 2nd of January ended before the watermark, so its window is not opened and emitted out of order
+        self.assertEqual(aggregator.add(datetime(2021, 1, 2, 12), 1), [])
+        self.assertEqual(aggregator.late_events, 1)
+        self.assertEqual([(w.start.day, w.count) for w in aggregator.flush()], [(3, 1)])
+
+    def test_offset_and_four_weekly(self):
+        # With the offset of 60 minutes, the day starts at 01:00 UTC
+        aggregator = TumblingWindowAggregator(TimeUtility.DAILY, offset=60)
+        windows = list(aggregator.process([(datetime(2021, 1, 2, 0, 30), 1), (datetime(2021, 1, 2, 1, 30), 1)]))
+        self.assertEqual([w.start for w in windows], [datetime(2021, 1, 1, 1, tzinfo=pytz.utc), datetime(2021, 1, 2, 1, tzinfo=pytz.utc)])
+
+        aggregator = TumblingWindowAggregator(TimeUtility.FOUR_WEEKLY)
+        windows = list(aggregator.process([(datetime(2021, 1, 7), 1), (datetime(2021, 1, 31, 12), 1), (datetime(2021, 2, 1), 1)]))
+        self.assertEqual([(w.start.date(), w.end.date(), w.count) for w in windows], [
+            (TimeUtility.get_four_week_period(datetime(2021, 1, 7).date())[0], datetime(2021, 1, 31).date(), 2),
+            (datetime(2021, 2, 1).date(), datetime(2021, 2, 28).date(), 1),
+        ])
+
+    def test_async(self):
+        async def stream():
+            for month in range(1, 4):
+                yield datetime(2021, month, 15), month
+
+        async def collect():
+            aggregator = TumblingWindowAggregator(TimeUtility.MONTHLY)
+            return [w async for w in aggregator.process_async(stream())]
+
+        windows = asyncio.run(collect())
+        self.assertEqual([(w.start.month, w.value) for w in windows], [(1, 1), (2, 2), (3, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,26 @@
 from .main import TimeUtility
+from .clock import Clock, CoarseClock, FrozenClock, ManualClock, SystemClock
+from .window import TumblingWindowAggregator, Window
+from .instant import Instant
+from .intervals import PeriodIndex
+from .business import BusinessCalendar
+from .boundaries import BoundaryTable
+from . import instant, ordinals
+from . import instrumentation
 __all__ = [
-    "TimeUtility"
+    "TimeUtility",
+    "Clock",
+    "CoarseClock",
+    "FrozenClock",
+    "ManualClock",
+    "SystemClock",
+    "TumblingWindowAggregator",
+    "Window",
+    "Instant",
+    "instant",
+    "ordinals",
+    "PeriodIndex",
+    "BusinessCalendar",
+    "BoundaryTable",
+    "instrumentation",
 ]
@@ -0,0 +1,50 @@
+"""
+The calendar and time unit definitions shared by the modules. It imports nothing, so every module (including `tz`) can import it
+"""
+
+MICROSECONDS_PER_SECOND = 1_000_000
+MICROSECONDS_PER_MINUTE = 60 * MICROSECONDS_PER_SECOND
+MICROSECONDS_PER_HOUR = 60 * MICROSECONDS_PER_MINUTE
+MICROSECONDS_PER_DAY = 24 * MICROSECONDS_PER_HOUR
+
+# The microseconds of the time unit constants of TimeUtility, e.g. `TimeUtility.HOUR`
+TIME_SPAN_MICROSECONDS = {
+    "microsecond": 1,
+    "second": MICROSECONDS_PER_SECOND,
+    "minute": MICROSECONDS_PER_MINUTE,
+    "hour": MICROSECONDS_PER_HOUR,
+    "day": MICROSECONDS_PER_DAY,
+}
+
+# The microseconds of the epoch units, i.e. the `unit` and `epoch_unit` arguments
+EPOCH_UNIT_MICROSECONDS = {
+    's': MICROSECONDS_PER_SECOND,
+    'ms': 1_000,
+    'us': 1,
+}
+
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def is_leap_year(year: int) -> bool:
+    """
+    Checks whether the given year is a leap year
+
+    :param year: The target year
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year: int, month: int) -> int:
+    """
+    Same as `calendar.monthrange(year, month)[1]`, without importing `calendar` (which imports `locale` and `re`)
+
+    :param year: The target year
+    :param month: The target month
+    :raises ValueError: If the month is not between 1 and 12, same as `calendar.monthrange`
+    """
+    if not 1 <= month <= 12:
+        raise ValueError("month must be in 1..12")
+    if month == 2 and is_leap_year(year):
+        return 29
+    return DAYS_IN_MONTH[month]
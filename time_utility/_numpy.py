@@ -0,0 +1,20 @@
+def require_numpy():
+    """
+    Imports and returns numpy, which is only needed by the batch (array) functions
+
+    :raises ImportError: If numpy is not installed
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("This function requires numpy. Install it via `pip3 install time_utility[numpy]`") from e
+    return numpy
+
+
+def is_numpy_array(value) -> bool:
+    """
+    Checks if the given value is a numpy array, without importing numpy
+
+    :param value: The value to be checked
+    """
+    return type(value).__module__ == 'numpy' and hasattr(value, 'dtype')
@@ -0,0 +1,241 @@
+"""
+The calendar periods shared by the modules: the period names, the per-year index of the ISO weeks, the per-year tables of the four-week periods,
+and the period arithmetic on dates. The functions work on dates and ordinals, so they do not depend on `TimeUtilityWeek`
+"""
+# Python
+from bisect import bisect_right
+from datetime import date, time, timedelta
+from functools import lru_cache
+
+# This Package
+from . import tables
+from ._calendar import is_leap_year
+
+
+# Period names, same as the period constants of TimeUtility
+DAILY = "daily"
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+ANNUAL = "annual"
+FOUR_WEEKLY = "four_weekly"
+
+PERIODS = (DAILY, WEEKLY, MONTHLY, ANNUAL, FOUR_WEEKLY)
+
+# The last instant of a day
+DAY_END = time(23, 59, 59, 999999)
+
+# Each calendar year is split into 13 four-week periods
+FOUR_WEEK_PERIODS_PER_YEAR = 13
+
+
+@lru_cache(maxsize=None)
+def get_iso_year(year: int) -> tuple[int, int]:
+    """
+    Returns the ordinal of the first day (Monday) of the week 1 and the number of ISO weeks of the given year.
+    They are read from the precomputed calendar tables if available
+
+    :param year: The target ISO year
+    """
+    calendar_tables = tables.get_tables()
+    if calendar_tables is not None and year in calendar_tables:
+        return calendar_tables.get_iso_year(year)
+    return compute_iso_year(year)
+
+
+def compute_iso_year(year: int) -> tuple[int, int]:
+    """
+    Computes the value of `get_iso_year`, without the calendar tables
+
+    :param year: The target ISO year
+    """
+    jan_1 = date(year, 1, 1)
+    jan_4 = jan_1 + timedelta(days=3)
+    week_one = jan_4.toordinal() - jan_4.weekday()
+
+    # A year has 53 weeks if it starts on a Thursday, or if it is a leap year starting on a Wednesday
+    weekday = jan_1.isoweekday()
+    weeks = 53 if weekday == 4 or (weekday == 3 and is_leap_year(year)) else 52
+
+    return week_one, weeks
+
+
+def get_week_start_ordinal(year: int, week: int) -> int:
+    """
+    Returns the ordinal of the first day (Monday) of the given ISO week.
+    Same as `strptime` with `%G-W%V-%u`, the week 53 of a 52-week year is the week 1 of the next year
+
+    :param year: The target ISO year
+    :param week: The target ISO week number
+    """
+    if week < 1 or week > 53:
+        raise ValueError()
+    return get_iso_year(year)[0] + (week - 1) * 7
+
+
+def get_week_number(d: date) -> tuple[int, int]:
+    """
+    Returns the ISO year and the ISO week number of the given date
+
+    :param d: The target date
+    """
+    o = d.toordinal()
+    year = d.year
+    week_one, weeks = get_iso_year(year)
+    if o < week_one:
+        year -= 1
+        week_one, weeks = get_iso_year(year)
+    elif o >= week_one + weeks * 7:
+        year += 1
+        week_one = week_one + weeks * 7
+    return year, (o - week_one) // 7 + 1
+
+
+@lru_cache(maxsize=None)
+def get_four_week_periods(year: int) -> tuple[tuple[int, ...], tuple[tuple[date, int, date, int], ...]]:
+    """
+    Returns the start ordinals and the four-week periods of the given year, as returned by `TimeUtility.get_four_week_period`.
+    They are read from the precomputed calendar tables if available
+
+    :param year: The target year
+    """
+    calendar_tables = tables.get_tables()
+    if calendar_tables is not None and year in calendar_tables:
+        return calendar_tables.get_four_week_periods(year)
+    return compute_four_week_periods(year)
+
+
+def compute_four_week_periods(year: int) -> tuple[tuple[int, ...], tuple[tuple[date, int, date, int], ...]]:
+    """
+    Computes the value of `get_four_week_periods`, without the calendar tables
+
+    :param year: The target year
+    """
+    periods = []
+    d = date(year, 1, 1)
+    while d.year == year:
+        period = compute_four_week_period(d)
+        periods.append(period)
+        if period[2] == date(year, 12, 31):
+            break
+        d = period[2] + timedelta(days=1)
+    return tuple(p[0].toordinal() for p in periods), tuple(periods)
+
+
+def compute_four_week_period(d: date) -> tuple[date, int, date, int]:
+    """
+    Computes the four-week period of the given date, as returned by `TimeUtility.get_four_week_period`.
+    Used without the calendar tables, and to build the tables
+
+    :param d: The target date
+    """
+    week_number = get_week_number(d)[1]
+    week_start = d - timedelta(days=d.weekday())
+
+    first_week = 1
+    last_week = 4
+
+    if week_number == 1 and d.month == 12:  # The last few days of year but in the first week of next year
+        first_week = 49
+        last_week = 1
+
+        from_d = _get_week_start(d.year, 49)
+        to_d = date(week_start.year, 12, 31)
+
+    elif week_number == 1 and d.month == 1 and week_start.month == 12:  # The Week 1 starts before Jan 1 and the selected date is in the new year
+        first_week = 1
+        last_week = 4
+        from_d = date(d.year, 1, 1)
+        to_d = _get_week_end(week_start.year + 1, 4)
+
+    elif week_number == 1 and week_start.month == 1 and week_start.isoweekday() == 1 and week_start.day == 1:  # The first day of year and the first day of the week 1
+        first_week = 1
+        last_week = 4
+        from_d = date(week_start.year, 1, 1)
+        to_d = date(week_start.year, 1, 28)
+    elif week_number == 1 and week_start.month == 1 and week_start.isoweekday() > 1:  # The first day of the week 1 starts after Jan 1
+        last_day_of_last_week = week_start - timedelta(days=1)
+        last_week_of_year = get_week_number(last_day_of_last_week)[1]
+        first_week = last_week_of_year
+        last_week = 4
+        from_d = week_start  # date(d.year, 1, 1)
+        to_d = _get_week_end(week_start.year, 4)
+    elif week_number >= 52 and d.year > week_start.year:  # The first few days of the year in the last week of the last year
+        first_week = week_number
+        last_week = 4
+        from_d = date(d.year, 1, 1)
+        to_d = _get_week_end(d.year, 4)
+    elif week_number >= 49:
+        first_week = 49
+        from_d = _get_week_start(week_start.year, 49)
+        to_d = date(week_start.year, 12, 31)
+        last_week = get_week_number(to_d)[1]
+    elif week_number <= 4:
+        from_d = date(week_start.year, 1, 1)
+        first_week = get_week_number(from_d)[1]
+        last_week = 4
+        to_d = _get_week_end(week_start.year, 4)
+    else:
+        if week_number % 4 == 0:
+            first_week = week_number - 3
+            last_week = week_number
+        else:
+            first_week = week_number - ((week_number % 4) - 1)
+            last_week = week_number + (4 - (week_number % 4))
+
+        # The first and last calculated weeks
+        from_d = _get_week_start(d.year, first_week)
+        to_d = _get_week_end(d.year, last_week)
+
+    return from_d, first_week, to_d, last_week
+
+
+def _get_week_start(year: int, week: int) -> date:
+    return date.fromordinal(get_week_start_ordinal(year, week))
+
+
+def _get_week_end(year: int, week: int) -> date:
+    return date.fromordinal(get_week_start_ordinal(year, week) + 6)
+
+
+def get_period_start(d: date, period: str) -> date:
+    """
+    Returns the first day of the period containing the date
+
+    :param d: The target date
+    :param period: One of `PERIODS`
+    """
+    if period == DAILY:
+        return d
+    elif period == WEEKLY:
+        return d - timedelta(days=d.weekday())
+    elif period == MONTHLY:
+        return d.replace(day=1)
+    elif period == ANNUAL:
+        return date(d.year, 1, 1)
+    starts, periods = get_four_week_periods(d.year)
+    return periods[bisect_right(starts, d.toordinal()) - 1][0]
+
+
+def advance(d: date, period: str, count: int) -> date:
+    """
+    Returns the start of the period `count` periods after the period starting at `d`
+
+    :param d: The first day of a period
+    :param period: One of `PERIODS`
+    :param count: The number of the periods to move, negative to move backward
+    """
+    if period == DAILY:
+        return d + timedelta(days=count)
+    elif period == WEEKLY:
+        return d + timedelta(days=7 * count)
+    elif period == MONTHLY:
+        months = d.month - 1 + count
+        return date(d.year + months // 12, months % 12 + 1, 1)
+    elif period == ANNUAL:
+        return date(d.year + count, 1, 1)
+
+    # The four-week periods are numbered `year * 13 + index`, so moving forward is an addition
+    starts, _ = get_four_week_periods(d.year)
+    period_id = d.year * FOUR_WEEK_PERIODS_PER_YEAR + bisect_right(starts, d.toordinal()) - 1 + count
+    year, index = divmod(period_id, FOUR_WEEK_PERIODS_PER_YEAR)
+    return get_four_week_periods(year)[1][index][0]
@@ -0,0 +1,125 @@
+# Python
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+import threading
+
+# This Package
+from . import tz
+from .clock import Clock, get_clock
+from ._periods import DAY_END, PERIODS, advance, get_period_start
+
+
+class _ZoneBoundaries:
+    """The boundaries of the previous, the current, and the next periods of a timezone, valid during the current day"""
+
+    __slots__ = ('valid_from', 'valid_until', 'periods')
+
+    def __init__(self, valid_from: datetime, valid_until: datetime, periods: dict[str, tuple[tuple[datetime, datetime], ...]]):
+        self.valid_from = valid_from
+        self.valid_until = valid_until
+        self.periods = periods
+
+
+class BoundaryTable:
+    """
+    The precomputed UTC boundaries of the previous, the current, and the next day, week, month, year, and four-week period
+    of many timezones. The boundaries of a timezone are recomputed when its current day ends, so the lookups only
+    read the clock and a dict. The boundaries are in local time (i.e. the local midnight in UTC), with the DST transitions
+    handled the same as `TimeUtility.range`
+    """
+
+    def __init__(self, timezones: Iterable = (), clock: Clock | None = None):
+        """
+        :param timezones: The timezones to register (tzinfos or the names of the timezones)
+        :param clock: The clock of the current time, defaults to the clock of TimeUtility
+        """
+        self.clock = clock
+        self._zones: dict[object, _ZoneBoundaries] = {}
+        self._tzinfos: dict[object, object] = {}
+        self._lock = threading.Lock()
+        self.register(*timezones)
+
+    def __len__(self) -> int:
+        return len(self._tzinfos)
+
+    def __contains__(self, timezone) -> bool:
+        return timezone in self._tzinfos
+
+    def register(self, *timezones) -> None:
+        """
+        Registers and computes the boundaries of the timezones. The unregistered timezones are registered on their first lookup
+
+        :param timezones: The timezones (tzinfos or the names of the timezones)
+        """
+        now = self._now()
+        for timezone in timezones:
+            self._get(timezone, now)
+
+    def unregister(self, timezone) -> None:
+        """
+        :param timezone: The timezone, as given to `register`
+        """
+        with self._lock:
+            self._tzinfos.pop(timezone, None)
+            self._zones.pop(timezone, None)
+
+    def get(self, timezone, period: str, relative: int = 0) -> tuple[datetime, datetime]:
+        """
+        Returns the UTC beginning and ending of a period in the timezone
+
+        :param timezone: The timezone (a tzinfo or the name of a timezone)
+        :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+        :param relative: -1 for the previous period, 0 for the current period, and 1 for the next period
+        """
+        if period not in PERIODS or relative not in (-1, 0, 1):
+            raise ValueError()
+        return self._get(timezone, self._now()).periods[period][relative + 1]
+
+    def get_many(self, timezones: Iterable, period: str, relative: int = 0) -> list[tuple[datetime, datetime]]:
+        """
+        The bulk version of `get`. The clock is read once for all the timezones
+
+        :param timezones: The timezones (tzinfos or the names of the timezones)
+        :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+        :param relative: -1 for the previous period, 0 for the current period, and 1 for the next period
+        """
+        if period not in PERIODS or relative not in (-1, 0, 1):
+            raise ValueError()
+        now = self._now()
+        return [self._get(timezone, now).periods[period][relative + 1] for timezone in timezones]
+
+    def _now(self) -> datetime:
+        return (self.clock or get_clock()).now(tz.utc())
+
+    def _get(self, timezone, now: datetime) -> _ZoneBoundaries:
+        boundaries = self._zones.get(timezone)
+        if boundaries is not None and boundaries.valid_from <= now < boundaries.valid_until:
+            return boundaries
+
+        with self._lock:
+            zone = self._tzinfos.get(timezone)
+            if zone is None:
+                zone = self._tzinfos[timezone] = tz.resolve(timezone)
+            # Replaced rather than modified, so the concurrent readers never see a partially updated entry
+            boundaries = self._zones[timezone] = _compute(zone, now)
+        return boundaries
+
+
+def _compute(zone, now: datetime) -> _ZoneBoundaries:
+    utc = tz.utc()
+    today = now.astimezone(zone).date()
+    periods = {}
+    for period in PERIODS:
+        current = get_period_start(today, period)
+        periods[period] = tuple(
+            _get_utc_boundaries(start, advance(start, period, 1), zone, utc)
+            for start in (advance(current, period, -1), current, advance(current, period, 1))
+        )
+    return _ZoneBoundaries(periods["daily"][1][0], periods["daily"][2][0], periods)
+
+
+def _get_utc_boundaries(start: date, following: date, zone, utc) -> tuple[datetime, datetime]:
+    return (
+        tz.localize(datetime.combine(start, time()), zone, tz.AMBIGUOUS_EARLIEST, tz.NONEXISTENT_SHIFT_FORWARD).astimezone(utc),
+        tz.localize(datetime.combine(following - timedelta(days=1), DAY_END), zone, tz.AMBIGUOUS_LATEST, tz.NONEXISTENT_SHIFT_BACKWARD).astimezone(utc),
+    )
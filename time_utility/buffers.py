@@ -0,0 +1,83 @@
+# Python
+from array import array
+from numbers import Integral
+
+# This Package
+from ._calendar import EPOCH_UNIT_MICROSECONDS, MICROSECONDS_PER_MINUTE
+from ._numpy import require_numpy, is_numpy_array
+
+
+def adjust_offset_buffer(values, offset, local_to_utc: bool, unit: str = 'us', in_place: bool = False):
+    """
+    The buffer version of `TimeUtility.adjust_offset` for the int64 epoch values.
+    With numpy installed, the values are adjusted through a zero-copy view of the buffer without creating any Python objects per value.
+    Without numpy, the values are adjusted one by one
+
+    :param values: Any object exposing the buffer protocol with the int64 epoch values, e.g. `array('q')`, `memoryview`, numpy arrays, or mmap slices
+    :param offset: The offset in minutes (any integer, including the numpy integers), or a buffer of the offsets with one offset per value
+    :param local_to_utc: Set to True if the values are in local time and set to False if they are in UTC
+    :param unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+    :param in_place: Modify the given buffer (which must be writable) instead of returning a new one
+    :returns: The given buffer if `in_place` is True, otherwise a new numpy array (or `array('q')` without numpy)
+    """
+    if unit not in EPOCH_UNIT_MICROSECONDS:
+        raise ValueError()
+    # One minute in the unit of the values, with the sign of the adjustment
+    minute = (-MICROSECONDS_PER_MINUTE if local_to_utc else MICROSECONDS_PER_MINUTE) // EPOCH_UNIT_MICROSECONDS[unit]
+
+    try:
+        np = require_numpy()
+    except ImportError:
+        np = None
+
+    if np is not None:
+        view = _as_int64_array(np, values)
+        if in_place and not view.flags.writeable:
+            raise ValueError("The buffer is read-only")
+        target = view if in_place else view.copy()
+        if isinstance(offset, Integral):
+            target += int(offset) * minute
+        else:
+            offsets = np.asarray(offset) if is_numpy_array(offset) else np.asarray(memoryview(offset))
+            if offsets.shape != target.shape:
+                raise ValueError()
+            target += offsets.astype(np.int64) * minute
+        return values if in_place else target
+
+    view = as_int64_memoryview(values)
+    target = view if in_place else memoryview(array('q', view))
+    if isinstance(offset, Integral):
+        delta = int(offset) * minute
+        for i in range(len(target)):
+            target[i] += delta
+    else:
+        offsets = memoryview(offset)
+        if len(offsets) != len(target):
+            raise ValueError()
+        for i in range(len(target)):
+            target[i] += offsets[i] * minute
+    return values if in_place else target.obj
+
+
+def _as_int64_array(np, values):
+    """Returns a zero-copy int64 numpy view of the buffer"""
+    if is_numpy_array(values):
+        if values.dtype != np.int64:
+            raise ValueError("The values must be int64")
+        return values
+    return np.frombuffer(as_int64_memoryview(values), dtype=np.int64)
+
+
+def as_int64_memoryview(values) -> memoryview:
+    """
+    Returns a zero-copy 1-dimensional int64 memoryview of the buffer. Raw bytes (e.g. mmap slices) are interpreted as native int64
+
+    :param values: Any object exposing the buffer protocol with the int64 values or their raw bytes
+    :raises ValueError: If the buffer does not hold int64 values
+    """
+    view = memoryview(values)
+    if view.ndim == 1 and view.itemsize == 8 and view.format.lstrip('@=') in ('q', 'l'):
+        return view
+    if view.format in ('B', 'b', 'c') and view.c_contiguous and view.nbytes % 8 == 0:
+        return view.cast('B').cast('q')
+    raise ValueError("The values must be int64")
@@ -0,0 +1,216 @@
+# Python
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import date
+import threading
+
+# This Package
+from ._numpy import is_numpy_array, require_numpy
+
+
+class _Year:
+    """The business days of a year: a bitset of the days of the year and the ordinals of the business days"""
+
+    __slots__ = ('first', 'bits', 'ordinals')
+
+    def __init__(self, first: int, bits: int, ordinals: tuple[int, ...]):
+        self.first = first
+        self.bits = bits
+        self.ordinals = ordinals
+
+
+class BusinessCalendar:
+    """
+    The business days with the configurable weekend days and holidays.
+    The business days of each year are calculated once, as a bitset of the days of the year, so the business days
+    between two dates are counted with popcounts instead of iterating the days.
+    A calendar is immutable and can be shared between threads
+    """
+
+    def __init__(self, weekend: Iterable[int] = (5, 6), holidays: Iterable[date] = ()):
+        """
+        :param weekend: The weekdays that are not business days (Monday is 0 and Sunday is 6), defaults to Saturday and Sunday
+        :param holidays: The dates that are not business days
+        """
+        self.weekend = frozenset(weekend)
+        if not self.weekend.issubset(range(7)) or len(self.weekend) == 7:
+            raise ValueError()
+        self.holidays = frozenset(d if type(d) is date else date(d.year, d.month, d.day) for d in holidays)
+
+        self._holiday_ordinals: dict[int, list[int]] = {}
+        for d in self.holidays:
+            self._holiday_ordinals.setdefault(d.year, []).append(d.toordinal())
+        self._years: dict[int, _Year] = {}
+        self._lock = threading.Lock()
+        self._numpy_calendar = None
+
+    def is_business_day(self, d: date) -> bool:
+        """
+        :param d: The target date
+        """
+        year = self._get_year(d.year)
+        return bool(year.bits >> (d.toordinal() - year.first) & 1)
+
+    def count(self, start: date, end: date) -> int:
+        """
+        Counts the business days from the start (inclusive) to the end (exclusive), same as `numpy.busday_count`.
+        If the end is before the start, the business days after the end up to the start (inclusive) are counted negatively
+
+        :param start: The first date
+        :param end: The date after the last date
+        """
+        if end < start:
+            return -self.count(date.fromordinal(end.toordinal() + 1), date.fromordinal(start.toordinal() + 1))
+
+        first, last = self._get_year(start.year), self._get_year(end.year)
+        start_index = start.toordinal() - first.first
+        end_index = end.toordinal() - last.first
+        if start.year == end.year:
+            return (first.bits >> start_index & ((1 << (end_index - start_index)) - 1)).bit_count()
+
+        total = (first.bits >> start_index).bit_count() + (last.bits & ((1 << end_index) - 1)).bit_count()
+        for year in range(start.year + 1, end.year):
+            total += len(self._get_year(year).ordinals)
+        return total
+
+    def add(self, d: date, days: int) -> date:
+        """
+        Returns the date the given number of business days after (or before, if negative) the date.
+        If the date is not a business day, it is first moved to the next (or the previous, if negative) business day
+
+        :param d: The target date
+        :param days: The number of business days
+        """
+        year = d.year
+        ordinals = self._get_year(year).ordinals
+        ordinal = d.toordinal()
+        if days >= 0:
+            index = bisect_left(ordinals, ordinal) + days
+            while index >= len(ordinals):
+                index -= len(ordinals)
+                year += 1
+                ordinals = self._get_year(year).ordinals
+        else:
+            index = bisect_right(ordinals, ordinal) - 1 + days
+            while index < 0:
+                year -= 1
+                ordinals = self._get_year(year).ordinals
+                index += len(ordinals)
+        return date.fromordinal(ordinals[index])
+
+    def next_business_day(self, d: date) -> date:
+        """
+        Returns the first business day after the date
+
+        :param d: The target date
+        """
+        year = d.year
+        ordinals = self._get_year(year).ordinals
+        index = bisect_right(ordinals, d.toordinal())
+        while index >= len(ordinals):
+            year += 1
+            ordinals = self._get_year(year).ordinals
+            index = 0
+        return date.fromordinal(ordinals[index])
+
+    def previous_business_day(self, d: date) -> date:
+        """
+        Returns the last business day before the date
+
+        :param d: The target date
+        """
+        year = d.year
+        ordinals = self._get_year(year).ordinals
+        index = bisect_left(ordinals, d.toordinal()) - 1
+        while index < 0:
+            year -= 1
+            ordinals = self._get_year(year).ordinals
+            index = len(ordinals) - 1
+        return date.fromordinal(ordinals[index])
+
+    def is_business_day_many(self, dates):
+        """
+        The batch version of `is_business_day`
+
+        :param dates: A list of dates or a numpy `datetime64` array
+        :returns: A list of bools, or a numpy bool array for a numpy array
+        """
+        if is_numpy_array(dates):
+            np = require_numpy()
+            return np.is_busday(dates.astype('datetime64[D]'), busdaycal=self._get_numpy_calendar())
+        return [self.is_business_day(d) for d in dates]
+
+    def count_many(self, starts, ends):
+        """
+        The batch version of `count`
+
+        :param starts: A list of dates or a numpy `datetime64` array
+        :param ends: The end dates, in the same form and of the same length as `starts`
+        :returns: A list of ints, or a numpy int64 array for numpy arrays
+        """
+        if is_numpy_array(starts):
+            np = require_numpy()
+            return np.busday_count(
+                starts.astype('datetime64[D]'), np.asarray(ends).astype('datetime64[D]'), busdaycal=self._get_numpy_calendar()
+            ).astype(np.int64)
+        return [self.count(start, end) for start, end in zip(starts, ends, strict=True)]
+
+    def add_many(self, dates, days):
+        """
+        The batch version of `add`
+
+        :param dates: A list of dates or a numpy `datetime64` array
+        :param days: The number of business days, either one number for all the dates or one per date
+        :returns: A list of dates, or a numpy `datetime64[D]` array for a numpy array
+        """
+        if is_numpy_array(dates):
+            np = require_numpy()
+            dates = dates.astype('datetime64[D]')
+            days = np.asarray(days, dtype=np.int64)
+            calendar = self._get_numpy_calendar()
+            forward = np.busday_offset(dates, days, roll='forward', busdaycal=calendar)
+            backward = np.busday_offset(dates, days, roll='backward', busdaycal=calendar)
+            return np.where(days >= 0, forward, backward)
+        if isinstance(days, int):
+            return [self.add(d, days) for d in dates]
+        return [self.add(d, n) for d, n in zip(dates, days, strict=True)]
+
+    def _get_year(self, year: int) -> _Year:
+        cached = self._years.get(year)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            cached = self._years.get(year)
+            if cached is None:
+                cached = self._years[year] = self._build_year(year)
+        return cached
+
+    def _build_year(self, year: int) -> _Year:
+        first = date(year, 1, 1).toordinal()
+        length = date(year + 1, 1, 1).toordinal() - first if year < 9999 else 365
+
+        # The weekdays of a week starting on the weekday of January 1st, repeated over the year
+        week = 0
+        for i in range(7):
+            if (first - 1 + i) % 7 not in self.weekend:
+                week |= 1 << i
+        bits = 0
+        for i in range(0, length, 7):
+            bits |= week << i
+        bits &= (1 << length) - 1
+
+        for ordinal in self._holiday_ordinals.get(year, ()):
+            bits &= ~(1 << (ordinal - first))
+
+        ordinals = tuple(first + i for i in range(length) if bits >> i & 1)
+        return _Year(first, bits, ordinals)
+
+    def _get_numpy_calendar(self):
+        if self._numpy_calendar is None:
+            np = require_numpy()
+            self._numpy_calendar = np.busdaycalendar(
+                weekmask=[0 if i in self.weekend else 1 for i in range(7)],
+                holidays=np.array(sorted(self.holidays), dtype='datetime64[D]'),
+            )
+        return self._numpy_calendar
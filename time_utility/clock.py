@@ -0,0 +1,122 @@
+# Python
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+import time
+
+
+class Clock(ABC):
+    """The source of the current time used by TimeUtility"""
+
+    @abstractmethod
+    def now(self, tz) -> datetime:
+        """
+        Returns the current date and time in the given timezone
+
+        :param tz: The tzinfo of the result
+        """
+
+
+class SystemClock(Clock):
+    """Reads the system clock on every call (the default)"""
+
+    def now(self, tz) -> datetime:
+        return datetime.now(tz=tz)
+
+
+class CoarseClock(Clock):
+    """
+    Reads the system clock at most once per granularity (and timezone) and reuses the value until the next tick.
+    Useful for the high-QPS callers that do not need a precision finer than the granularity
+    """
+
+    def __init__(self, granularity: timedelta = timedelta(milliseconds=1)):
+        """
+        :param granularity: How long a reading of the clock is reused, e.g. `timedelta(seconds=1)`
+        """
+        granularity_ns = granularity // timedelta(microseconds=1) * 1000
+        if granularity_ns <= 0:
+            raise ValueError()
+        self.granularity = granularity
+        self._granularity_ns = granularity_ns
+        self._tick = -1
+        self._values: dict = {}
+
+    def now(self, tz) -> datetime:
+        tick = time.monotonic_ns() // self._granularity_ns
+        if tick != self._tick:
+            # Replaced rather than cleared, so the concurrent readers never see a partially updated cache
+            self._values = {}
+            self._tick = tick
+        values = self._values
+        value = values.get(tz)
+        if value is None:
+            value = values[tz] = datetime.now(tz=tz)
+        return value
+
+
+class FrozenClock(Clock):
+    """Always returns the same instant, e.g. for tests"""
+
+    def __init__(self, value: datetime):
+        """
+        :param value: The frozen instant. A naive datetime is considered to be in UTC
+        """
+        self.value = _to_utc(value)
+
+    def now(self, tz) -> datetime:
+        if tz is None:
+            return self.value.astimezone().replace(tzinfo=None)
+        return self.value.astimezone(tz)
+
+
+class ManualClock(FrozenClock):
+    """A frozen clock that can be moved by the caller"""
+
+    def set(self, value: datetime) -> None:
+        """
+        :param value: The new instant. A naive datetime is considered to be in UTC
+        """
+        self.value = _to_utc(value)
+
+    def advance(self, delta: timedelta) -> None:
+        """
+        :param delta: The time to move the clock forward (or backward if negative)
+        """
+        self.value = self.value + delta
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """
+    Returns the clock used by TimeUtility
+    """
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Replaces the clock used by TimeUtility and returns the previous one
+
+    :param clock: The new clock
+    """
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+
+def now(tz) -> datetime:
+    """
+    Returns the current date and time of the clock used by TimeUtility
+
+    :param tz: The tzinfo of the result
+    """
+    return _clock.now(tz)
+
+
+def _to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,236 @@
+"""
+Memory-mapped files of int64 epoch values.
+
+The files are either raw (only the little-endian int64 values) or start with a 16-byte header:
+the magic `TUEP`, the version (uint16), the unit of the values (uint8), a reserved byte, and the number of the values (uint64).
+"""
+# Python
+from array import array
+from itertools import islice
+import mmap
+import os
+import struct
+import sys
+
+# This Package
+from . import ordinals
+from .buffers import as_int64_memoryview
+from ._numpy import is_numpy_array, require_numpy
+
+
+MAGIC = b'TUEP'
+VERSION = 1
+
+# The units of the values in the header. The period keys are written without a unit
+_UNITS = {None: 0, 's': 1, 'ms': 2, 'us': 3}
+_UNIT_NAMES = {code: name for name, code in _UNITS.items()}
+
+_HEADER = struct.Struct('<4sHBBQ')
+
+
+class EpochFile:
+    """
+    A memory-mapped file of int64 epoch values. The values are exposed as zero-copy views (numpy arrays, or memoryviews without numpy).
+    The views must be released before the file is closed
+    """
+
+    def __init__(self, path: str, unit: str | None = 's', writable: bool = False):
+        """
+        :param path: The path of the file
+        :param unit: The unit of the values of the raw files. The unit of the files with a header is read from the header
+        :param writable: Map the file for writing, so the values can be modified in place
+        """
+        self.path = path
+        self.unit = unit
+        # The file stays open as long as the mapping, so it is closed by `close` (or below if the file is invalid)
+        self._file = open(path, 'r+b' if writable else 'rb')  # noqa: SIM115
+        self._mmap = None
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+            self._offset = 0
+            if size >= _HEADER.size and self._mmap[:4] == MAGIC:
+                _, version, unit_code, _, count = _HEADER.unpack_from(self._mmap)
+                if version != VERSION or unit_code not in _UNIT_NAMES or size != _HEADER.size + count * 8:
+                    raise ValueError("Invalid epoch file: {p}".format(p=path))
+                self._offset = _HEADER.size
+                self.unit = _UNIT_NAMES[unit_code]
+            elif size % 8:
+                raise ValueError("Invalid epoch file: {p}".format(p=path))
+        except BaseException:
+            self.close()
+            raise
+        self._count = (size - self._offset) // 8
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> 'EpochFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the file. Raises BufferError if a view of the values is still in use"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def values(self, start: int = 0, stop: int | None = None):
+        """
+        Returns a zero-copy view of the values, a numpy int64 array or an int64 memoryview without numpy.
+        Without numpy on a big-endian host, the memoryview is a swapped copy
+
+        :param start: The index of the first value
+        :param stop: The index after the last value, defaults to the number of the values
+        """
+        start, stop, _ = slice(start, stop).indices(self._count)
+        stop = max(start, stop)
+        try:
+            np = require_numpy()
+        except ImportError:
+            np = None
+
+        if np is not None:
+            if self._mmap is None:
+                return np.empty(0, dtype='<i8')
+            return np.frombuffer(self._mmap, dtype='<i8', count=stop - start, offset=self._offset + start * 8)
+        if self._mmap is None:
+            return memoryview(array('q'))
+        view = memoryview(self._mmap)[self._offset + start * 8:self._offset + stop * 8]
+        if sys.byteorder != 'little':
+            # The values are little-endian, so they are copied and swapped on the big-endian hosts
+            swapped = array('q', bytes(view))
+            swapped.byteswap()
+            return memoryview(swapped)
+        return view.cast('q')
+
+    def chunks(self, chunk_size: int = 1 << 20):
+        """
+        Yields the zero-copy views of the consecutive chunks of the values
+
+        :param chunk_size: The number of the values per chunk
+        """
+        if chunk_size < 1:
+            raise ValueError()
+        for start in range(0, self._count, chunk_size):
+            yield self.values(start, start + chunk_size)
+
+
+def open_epochs(path: str, unit: str | None = 's', writable: bool = False) -> EpochFile:
+    """
+    Opens a file of int64 epoch values with mmap
+
+    :param path: The path of the file
+    :param unit: The unit of the values of the raw files. The unit of the files with a header is read from the header
+    :param writable: Map the file for writing, so the values can be modified in place
+    """
+    return EpochFile(path, unit, writable)
+
+
+def write_epochs(path: str, values, unit: str | None = 's', header: bool = True, chunk_size: int = 1 << 20) -> int:
+    """
+    Writes the int64 epoch values to a file. The iterables are written in chunks, so they are never fully materialized
+
+    :param path: The path of the file
+    :param values: A numpy array, an object exposing the buffer protocol with the int64 values, or an iterable of ints
+    :param unit: The unit of the values written to the header. The options are `s`, `ms`, `us`, and None (e.g. for the period keys)
+    :param header: Write the header. Set to False to write a raw file
+    :param chunk_size: The number of the values of an iterable written at once
+    :returns: The number of the written values
+    """
+    if unit not in _UNITS:
+        raise ValueError()
+
+    return _write_chunks(path, _iter_chunks(values, chunk_size), unit, header)
+
+
+def period_keys(values, period: str, offset: int = 0, unit: str = 's'):
+    """
+    Returns the integer key of the period of each epoch value, with the boundaries of `TimeUtility.get_period`.
+    The keys are the period ordinals of the `ordinals` module
+
+    :param values: A numpy int64 array (or buffer) of the epoch values, or an iterable of ints without numpy
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    :param unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+    :returns: A numpy int64 array, or an `array('q')` without numpy
+    """
+    if not is_numpy_array(values):
+        try:
+            memoryview(values)
+        except TypeError:
+            values = array('q', values)
+    return ordinals.to_ordinals(values, period, offset, unit)
+
+
+def write_period_keys(path: str, output_path: str, period: str, offset: int = 0, unit: str | None = None,
+                      header: bool = True, chunk_size: int = 1 << 20) -> int:
+    """
+    Streams the period keys (see `period_keys`) of an epoch file to another file, one chunk at a time
+
+    :param path: The path of the epoch file
+    :param output_path: The path of the file of the keys
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    :param unit: The unit of the values of a raw epoch file (defaults to `s`). The unit of the files with a header is read from the header
+    :param header: Write the header (without a unit) to the output file
+    :param chunk_size: The number of the values processed at once
+    :returns: The number of the written keys
+    """
+    with open_epochs(path, unit or 's') as source:
+        return _write_chunks(
+            output_path,
+            (_to_bytes(period_keys(chunk, period, offset, source.unit)) for chunk in source.chunks(chunk_size)),
+            None,
+            header,
+        )
+
+
+def _write_chunks(path: str, chunks, unit: str | None, header: bool) -> int:
+    """Writes the chunks of the int64 bytes (with the header) and returns the number of the written values"""
+    count = 0
+    with open(path, 'wb') as f:
+        if header:
+            f.write(_HEADER.pack(MAGIC, VERSION, _UNITS[unit], 0, 0))
+        for chunk in chunks:
+            f.write(chunk)
+            count += len(chunk) // 8
+        if header:
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, _UNITS[unit], 0, count))
+    return count
+
+
+def _iter_chunks(values, chunk_size: int):
+    """Yields the little-endian int64 bytes of the values, in chunks for the iterables"""
+    if is_numpy_array(values):
+        yield _to_bytes(values)
+        return
+    try:
+        view = as_int64_memoryview(values)
+    except TypeError:
+        view = None
+    if view is not None:
+        yield _to_bytes(array('q', view)) if sys.byteorder != 'little' else view.cast('B')
+        return
+
+    iterator = iter(values)
+    while True:
+        chunk = array('q', islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield _to_bytes(chunk)
+
+
+def _to_bytes(values):
+    """Returns the little-endian int64 bytes of a numpy array or an `array('q')`"""
+    if is_numpy_array(values):
+        return values.astype('<i8', copy=False).tobytes()
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
@@ -0,0 +1,175 @@
+"""
+The relative date expressions, e.g. `start of previous month in Europe/Berlin` or `end of the four-week period containing today`.
+
+    expression := ("start" | "end") "of" ["the"] [relative] period ["period"] ["containing" ("today" | "now")] ["in" timezone]
+    relative   := "previous" | "last" | "this" | "current" | "next"
+    period     := "day" | "week" | "month" | "year" | "four-week"
+
+An expression is parsed once by `Expression` (or `TimeUtility.compile_expression`) and can be evaluated many times.
+"""
+# Python
+from datetime import datetime, time, timedelta
+
+# This Package
+from . import clock, tz
+from ._calendar import EPOCH_UNIT_MICROSECONDS
+from ._numpy import is_numpy_array, require_numpy
+from ._periods import DAY_END, advance, get_period_start
+
+
+_EDGES = {"start": True, "beginning": True, "end": False}
+_RELATIVES = {"previous": -1, "last": -1, "this": 0, "current": 0, "next": 1}
+_PERIODS = {
+    "day": "daily",
+    "week": "weekly",
+    "month": "monthly",
+    "year": "annual",
+    "four-week": "four_weekly",
+    "four_week": "four_weekly",
+}
+_REFERENCES = ("today", "now")
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+class Expression:
+    """
+    A compiled relative date expression
+    """
+
+    __slots__ = ('text', 'is_start', 'relative', 'period', 'timezone')
+
+    def __init__(self, text: str):
+        """
+        :param text: The expression, e.g. `start of previous month in Europe/Berlin`
+        """
+        self.text = text
+        tokens = text.split()
+        words = [token.lower() for token in tokens]
+
+        def fail():
+            raise ValueError("Invalid expression: {t!r}".format(t=text))
+
+        if len(words) < 3 or words[0] not in _EDGES or words[1] != "of":
+            fail()
+        self.is_start = _EDGES[words[0]]
+        i = 2
+        if words[i] == "the":
+            i += 1
+        self.relative = 0
+        if i < len(words) and words[i] in _RELATIVES:
+            self.relative = _RELATIVES[words[i]]
+            i += 1
+
+        # "four week" is accepted as two words
+        if i + 1 < len(words) and words[i] == "four" and words[i + 1] == "week":
+            words[i + 1] = "four-week"
+            i += 1
+        if i >= len(words) or words[i] not in _PERIODS:
+            fail()
+        self.period = _PERIODS[words[i]]
+        i += 1
+        if i < len(words) and words[i] == "period":
+            i += 1
+
+        if i < len(words) and words[i] == "containing":
+            if i + 1 >= len(words) or words[i + 1] not in _REFERENCES:
+                fail()
+            i += 2
+
+        timezone = None
+        if i < len(words) and words[i] == "in":
+            if i + 2 != len(words):
+                fail()
+            timezone = tz.resolve(tokens[i + 1])
+            i += 2
+        if i != len(words):
+            fail()
+        self.timezone = timezone
+
+    def __repr__(self):
+        return "Expression({t!r})".format(t=self.text)
+
+    def evaluate(self, reference: datetime | None = None) -> datetime:
+        """
+        Returns the datetime of the expression, in the timezone of the expression (UTC by default)
+
+        :param reference: The reference instant (e.g. "today"). A naive datetime is considered to be in UTC. Defaults to the current time of the clock of TimeUtility
+        """
+        if reference is None:
+            reference = clock.now(tz.utc())
+        return self._evaluate(reference)[0]
+
+    def evaluate_many(self, references, unit: str = 'us'):
+        """
+        The batch version of `evaluate`. The expression is evaluated once per period of the references (e.g. once per day for
+        `start of next day`), since the result is the same for all the references within the same period
+
+        :param references: A list of datetimes, or a numpy `datetime64` array or int64 array of the epoch values (UTC)
+        :param unit: The unit of the epoch values of an int64 array, and of the returned epoch values. The options are `s`, `ms`, and `us`
+        :returns: A list of datetimes for a list, a numpy `datetime64[us]` array for a `datetime64` array, and a numpy int64 array of the epoch values for an int64 array
+        """
+        if unit not in EPOCH_UNIT_MICROSECONDS:
+            raise ValueError()
+
+        if not is_numpy_array(references):
+            references = list(references)
+            order = sorted(range(len(references)), key=lambda i: _to_utc(references[i]))
+            results = [None] * len(references)
+            value, until = None, None
+            for i in order:
+                reference = _to_utc(references[i])
+                if until is None or reference > until:
+                    value, until = self._evaluate(reference)
+                results[i] = value
+            return results
+
+        np = require_numpy()
+        is_datetime64 = references.dtype.kind == 'M'
+        if is_datetime64:
+            micros = references.astype('datetime64[us]').astype(np.int64)
+        else:
+            micros = references.astype(np.int64) * EPOCH_UNIT_MICROSECONDS[unit]
+
+        order = np.argsort(micros, kind='stable')
+        ordered = micros[order]
+        results = np.empty(len(micros), dtype=np.int64)
+        utc = tz.utc()
+        i = 0
+        while i < len(ordered):
+            reference = (_EPOCH + timedelta(microseconds=int(ordered[i]))).replace(tzinfo=utc)
+            value, until = self._evaluate(reference)
+            following = int(np.searchsorted(ordered, _to_micros(until), side='right'))
+            results[order[i:following]] = _to_micros(value)
+            i = following
+
+        if is_datetime64:
+            return results.astype('datetime64[us]')
+        return results // EPOCH_UNIT_MICROSECONDS[unit]
+
+    def _evaluate(self, reference: datetime) -> tuple[datetime, datetime]:
+        """Returns the result and the UTC ending of the period of the reference (the result is the same until then)"""
+        zone = self.timezone if self.timezone is not None else tz.utc()
+        local = (reference if reference.tzinfo is not None else reference.replace(tzinfo=tz.utc())).astimezone(zone)
+        current = get_period_start(local.date(), self.period)
+        following = advance(current, self.period, 1)
+        until = tz.localize(datetime.combine(following, time()), zone, tz.AMBIGUOUS_EARLIEST, tz.NONEXISTENT_SHIFT_FORWARD) - _ONE_MICROSECOND
+
+        start = advance(current, self.period, self.relative) if self.relative else current
+        if self.is_start:
+            value = tz.localize(datetime.combine(start, time()), zone, tz.AMBIGUOUS_EARLIEST, tz.NONEXISTENT_SHIFT_FORWARD)
+        else:
+            end = advance(start, self.period, 1) - timedelta(days=1)
+            value = tz.localize(datetime.combine(end, DAY_END), zone, tz.AMBIGUOUS_LATEST, tz.NONEXISTENT_SHIFT_BACKWARD)
+        return value, until
+
+
+def _to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=tz.utc())
+    return value
+
+
+def _to_micros(value: datetime) -> int:
+    return (value.astimezone(tz.utc()).replace(tzinfo=None) - _EPOCH) // _ONE_MICROSECOND
@@ -0,0 +1,310 @@
+"""
+Integer versions of the TimeUtility functions, working on the UTC epoch microseconds.
+
+The calendar calculations use the days-from-civil algorithm (https://howardhinnant.github.io/date_algorithms.html),
+so no datetime object is created.
+"""
+# Python
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+# This Package
+from . import tz
+from ._calendar import (
+    EPOCH_UNIT_MICROSECONDS, MICROSECONDS_PER_DAY, MICROSECONDS_PER_MINUTE, MICROSECONDS_PER_SECOND, TIME_SPAN_MICROSECONDS,
+    days_in_month,
+)
+from ._calendar import is_leap_year as is_leap_year  # Re-exported as a part of the integer API of the module
+from ._periods import ANNUAL, DAILY, FOUR_WEEK_PERIODS_PER_YEAR, FOUR_WEEKLY, MONTHLY, WEEKLY, get_four_week_periods
+
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """
+    Returns the number of days since 1970-01-01 of the given date
+
+    :param year: The year
+    :param month: The month (1-12)
+    :param day: The day of the month
+    """
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def civil_from_days(days: int) -> tuple[int, int, int]:
+    """
+    Returns the (year, month, day) of the given number of days since 1970-01-01
+
+    :param days: The number of days since 1970-01-01
+    """
+    days += 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    mp = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    return year_of_era + era * 400 + (1 if month <= 2 else 0), month, day
+
+
+def date_start(year: int, month: int, day: int) -> int:
+    """Returns the epoch microseconds of the beginning of the day in UTC"""
+    return days_from_civil(year, month, day) * MICROSECONDS_PER_DAY
+
+
+def date_end(year: int, month: int, day: int) -> int:
+    """Returns the epoch microseconds of the ending of the day in UTC"""
+    return (days_from_civil(year, month, day) + 1) * MICROSECONDS_PER_DAY - 1
+
+
+def month_start(year: int, month: int) -> int:
+    """Returns the epoch microseconds of the beginning of the month in UTC"""
+    return days_from_civil(year, month, 1) * MICROSECONDS_PER_DAY
+
+
+def month_end(year: int, month: int) -> int:
+    """Returns the epoch microseconds of the ending of the month in UTC"""
+    return (days_from_civil(year, month, 1) + days_in_month(year, month)) * MICROSECONDS_PER_DAY - 1
+
+
+def year_start(year: int) -> int:
+    """Returns the epoch microseconds of the beginning of the year in UTC"""
+    return days_from_civil(year, 1, 1) * MICROSECONDS_PER_DAY
+
+
+def year_end(year: int) -> int:
+    """Returns the epoch microseconds of the ending of the year in UTC"""
+    return days_from_civil(year + 1, 1, 1) * MICROSECONDS_PER_DAY - 1
+
+
+def get_period(year: int, month: int, day: int, period: str, offset: int = 0) -> tuple[int, int]:
+    """
+    The integer version of `TimeUtility.get_period`. Returns the epoch microseconds of the beginning and the ending of the period
+
+    :param year: The target year
+    :param month: The target month
+    :param day: The target day
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    :raises ValueError: If the date is not valid, same as `TimeUtility.get_period`
+    """
+    # Same checks as `date(year, month, day)`, the day arithmetic below would silently roll an invalid date over
+    if not 1 <= year <= 9999 or not 1 <= month <= 12 or not 1 <= day <= days_in_month(year, month):
+        raise ValueError()
+
+    if period == DAILY:
+        start_day = days_from_civil(year, month, day)
+        end_day = start_day + 1
+    elif period == WEEKLY:
+        days = days_from_civil(year, month, day)
+        start_day = days - (days + 3) % 7  # 1970-01-01 is a Thursday
+        end_day = start_day + 7
+    elif period == MONTHLY:
+        start_day = days_from_civil(year, month, 1)
+        end_day = start_day + days_in_month(year, month)
+    elif period == ANNUAL:
+        start_day = days_from_civil(year, 1, 1)
+        end_day = days_from_civil(year + 1, 1, 1)
+    elif period == FOUR_WEEKLY:
+        starts, periods = get_four_week_periods(year)
+        ordinal = days_from_civil(year, month, day) + _EPOCH_ORDINAL
+        from_d, _, to_d, _ = periods[bisect_right(starts, ordinal) - 1]
+        start_day = from_d.toordinal() - _EPOCH_ORDINAL
+        end_day = to_d.toordinal() - _EPOCH_ORDINAL + 1
+    else:
+        raise ValueError()
+
+    shift = offset * MICROSECONDS_PER_MINUTE
+    return start_day * MICROSECONDS_PER_DAY + shift, end_day * MICROSECONDS_PER_DAY - 1 + shift
+
+
+def get_period_of(micros: int, period: str, offset: int = 0) -> tuple[int, int]:
+    """
+    Returns the epoch microseconds of the beginning and the ending of the period containing the given instant,
+    with the boundaries of `get_period`
+
+    :param micros: The epoch microseconds
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    """
+    year, month, day = civil_from_days((micros - offset * MICROSECONDS_PER_MINUTE) // MICROSECONDS_PER_DAY)
+    return get_period(year, month, day, period, offset)
+
+
+def four_week_period_id(year: int, month: int, day: int) -> int:
+    """
+    Returns the id of the four-week period of the given date (`year * 13 + index of the period in the year`)
+    """
+    starts, _ = get_four_week_periods(year)
+    return year * FOUR_WEEK_PERIODS_PER_YEAR + bisect_right(starts, days_from_civil(year, month, day) + _EPOCH_ORDINAL) - 1
+
+
+def difference(large: int, small: int, time_span: str = 'second', total: bool = False) -> int:
+    """
+    The integer version of `TimeUtility.difference`. The values can also be int64 numpy arrays, see `TimeUtility.difference_many`
+
+    :param large: The larger epoch microseconds
+    :param small: The smaller epoch microseconds
+    :param time_span: The time unit constants of TimeUtility, e.g. `TimeUtility.HOUR`
+    :param total: If False, the result matches `TimeUtility.difference`. If True, the total duration is returned
+    """
+    unit = TIME_SPAN_MICROSECONDS.get(time_span)
+    if unit is None:
+        raise ValueError()
+
+    delta = large - small
+    if total:
+        return abs(delta) // unit
+    # Same normalization as `timedelta`, i.e. the days may be negative while the seconds and microseconds are not
+    if time_span == "day":
+        return abs(delta // MICROSECONDS_PER_DAY)
+    elif time_span == "microsecond":
+        return delta % MICROSECONDS_PER_SECOND
+    return (delta // MICROSECONDS_PER_SECOND) % 86400 // (unit // MICROSECONDS_PER_SECOND)
+
+
+class Instant:
+    """
+    A compact, immutable UTC instant stored as the epoch microseconds
+    """
+
+    __slots__ = ('micros',)
+
+    def __init__(self, micros: int):
+        object.__setattr__(self, 'micros', micros)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Instant is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Instant is immutable")
+
+    def __reduce__(self):
+        return self.__class__, (self.micros,)
+
+    def __eq__(self, other):
+        if not isinstance(other, Instant):
+            return NotImplemented
+        return self.micros == other.micros
+
+    def __lt__(self, other):
+        if not isinstance(other, Instant):
+            return NotImplemented
+        return self.micros < other.micros
+
+    def __le__(self, other):
+        if not isinstance(other, Instant):
+            return NotImplemented
+        return self.micros <= other.micros
+
+    def __gt__(self, other):
+        if not isinstance(other, Instant):
+            return NotImplemented
+        return self.micros > other.micros
+
+    def __ge__(self, other):
+        if not isinstance(other, Instant):
+            return NotImplemented
+        return self.micros >= other.micros
+
+    def __hash__(self):
+        return hash(self.micros)
+
+    def __int__(self):
+        return self.micros
+
+    def __repr__(self):
+        return "Instant({m})".format(m=self.micros)
+
+    @classmethod
+    def from_datetime(cls, value: datetime) -> 'Instant':
+        """
+        :param value: The datetime. A naive datetime is considered to be in UTC
+        """
+        if value.tzinfo is not None:
+            offset = value.utcoffset()
+            value = value.replace(tzinfo=None) - offset
+        return cls((value - _EPOCH) // timedelta(microseconds=1))
+
+    @classmethod
+    def from_date(cls, value: date) -> 'Instant':
+        """
+        :param value: The date, the instant is the beginning of the day in UTC
+        """
+        return cls(days_from_civil(value.year, value.month, value.day) * MICROSECONDS_PER_DAY)
+
+    @classmethod
+    def from_epoch(cls, value: int, unit: str = 's') -> 'Instant':
+        """
+        :param value: The epoch value
+        :param unit: The unit of the epoch value. The options are `s`, `ms`, and `us`
+        """
+        factor = EPOCH_UNIT_MICROSECONDS.get(unit)
+        if factor is None:
+            raise ValueError()
+        return cls(value * factor)
+
+    def to_datetime(self, timezone=None) -> datetime:
+        """
+        Returns the aware datetime of the instant
+
+        :param timezone: The timezone of the result (a tzinfo or the name of a timezone), defaults to UTC
+        """
+        utc = (_EPOCH + timedelta(microseconds=self.micros)).replace(tzinfo=tz.utc())
+        if timezone is None:
+            return utc
+        return utc.astimezone(tz.resolve(timezone))
+
+    def to_epoch(self, unit: str = 's') -> int:
+        """
+        :param unit: The unit of the epoch value. The options are `s`, `ms`, and `us`
+        """
+        factor = EPOCH_UNIT_MICROSECONDS.get(unit)
+        if factor is None:
+            raise ValueError()
+        return self.micros // factor
+
+    @property
+    def days(self) -> int:
+        """The number of days since 1970-01-01 (in UTC)"""
+        return self.micros // MICROSECONDS_PER_DAY
+
+    @property
+    def civil(self) -> tuple[int, int, int]:
+        """The (year, month, day) in UTC"""
+        return civil_from_days(self.micros // MICROSECONDS_PER_DAY)
+
+    def add(self, microseconds: int) -> 'Instant':
+        """
+        :param microseconds: The microseconds to add (or subtract if negative)
+        """
+        return Instant(self.micros + microseconds)
+
+    def get_period(self, period: str, offset: int = 0) -> tuple['Instant', 'Instant']:
+        """
+        Returns the beginning and the ending of the period containing the instant, with the boundaries of `TimeUtility.get_period`
+
+        :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+        :param offset: The optional timezone offset in minutes
+        """
+        start, end = get_period_of(self.micros, period, offset)
+        return Instant(start), Instant(end)
+
+    def difference(self, other: 'Instant', time_span: str = 'second', total: bool = False) -> int:
+        """
+        Same as `TimeUtility.difference(self, other)`
+
+        :param other: The smaller instant
+        :param time_span: The time unit constants of TimeUtility, e.g. `TimeUtility.HOUR`
+        :param total: If True, the total duration is returned
+        """
+        return difference(self.micros, other.micros, time_span, total)
@@ -0,0 +1,181 @@
+"""
+Opt-in instrumentation of the TimeUtility methods.
+
+Enable it with `instrumentation.enable()` or by setting the `TIME_UTILITY_INSTRUMENTATION` environment variable to `1`.
+While it is enabled, the static methods of TimeUtility are replaced by the wrappers that record the calls.
+Only the outermost calls are recorded, so the methods called by the other methods (e.g. `make_aware` by `difference`) are not counted twice.
+When it is disabled, the original methods are restored, so there is no cost at all.
+"""
+# Python
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+import os
+import threading
+import time
+
+# This Package
+from .main import TimeUtility
+from .week import TimeUtilityWeek
+
+
+# The number of the latest durations kept per method to calculate the percentiles
+SAMPLE_SIZE = 1024
+
+_lock = threading.Lock()
+_originals: dict[str, staticmethod] = {}
+_stats: dict[str, '_MethodStats'] = {}
+
+# Set while an instrumented method runs, so the nested calls are not recorded
+_inside: ContextVar[bool] = ContextVar('time_utility_instrumentation_inside', default=False)
+
+# The period and time unit constants, recorded when they are passed to a method
+_CONSTANTS = frozenset((
+    TimeUtility.DAILY,
+    TimeUtility.WEEKLY,
+    TimeUtility.MONTHLY,
+    TimeUtility.ANNUAL,
+    TimeUtility.FOUR_WEEKLY,
+    TimeUtility.MICROSECOND,
+    TimeUtility.SECOND,
+    TimeUtility.MINUTE,
+    TimeUtility.HOUR,
+    TimeUtility.DAY,
+))
+
+
+class _MethodStats:
+
+    __slots__ = ('calls', 'total_ns', 'samples', 'constants')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.samples: deque[int] = deque(maxlen=SAMPLE_SIZE)
+        self.constants: dict[str, int] = {}
+
+
+def is_enabled() -> bool:
+    """
+    Checks if the instrumentation is enabled
+    """
+    return bool(_originals)
+
+
+def enable() -> None:
+    """
+    Replaces the static methods of TimeUtility with the instrumented wrappers
+    """
+    with _lock:
+        if _originals:
+            return
+        for name, value in list(vars(TimeUtility).items()):
+            if name.startswith('_') or not isinstance(value, staticmethod):
+                continue
+            _originals[name] = value
+            setattr(TimeUtility, name, staticmethod(_instrument(name, value.__func__)))
+
+
+def disable() -> None:
+    """
+    Restores the original static methods of TimeUtility. The recorded statistics are kept
+    """
+    with _lock:
+        for name, value in _originals.items():
+            setattr(TimeUtility, name, value)
+        _originals.clear()
+
+
+def reset() -> None:
+    """
+    Clears the recorded statistics
+    """
+    with _lock:
+        _stats.clear()
+
+
+def snapshot() -> dict:
+    """
+    Returns a copy of the recorded statistics.
+    The percentiles are calculated from the latest `SAMPLE_SIZE` calls of each method
+    """
+    with _lock:
+        methods = {}
+        for name, stats in _stats.items():
+            samples = sorted(stats.samples)
+            methods[name] = {
+                "calls": stats.calls,
+                "total_ns": stats.total_ns,
+                "mean_ns": stats.total_ns / stats.calls if stats.calls else 0,
+                "p50_ns": _percentile(samples, 0.5),
+                "p90_ns": _percentile(samples, 0.9),
+                "p99_ns": _percentile(samples, 0.99),
+                "constants": dict(stats.constants),
+            }
+
+    return {
+        "enabled": is_enabled(),
+        "methods": methods,
+        "caches": {
+            "boundary": _cache_stats(_get_original('boundary_cache_info')()),
+            "shared_week": _cache_stats(TimeUtilityWeek.shared_cache_info()),
+            "iso_year": _cache_stats(TimeUtilityWeek.iso_year_cache_info()),
+            "iso_week": _cache_stats(TimeUtilityWeek.iso_week_cache_info()),
+        },
+    }
+
+
+def _instrument(name: str, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if _inside.get():
+            return function(*args, **kwargs)
+        token = _inside.set(True)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            _inside.reset(token)
+            _record(name, duration, args, kwargs)
+    return wrapper
+
+
+def _get_original(name: str):
+    """Returns the original static method of TimeUtility, so reading the statistics is not recorded"""
+    with _lock:
+        method = _originals.get(name)
+    return method.__func__ if method is not None else getattr(TimeUtility, name)
+
+
+def _record(name: str, duration: int, args: tuple, kwargs: dict) -> None:
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _MethodStats()
+        stats.calls += 1
+        stats.total_ns += duration
+        stats.samples.append(duration)
+        for value in (*args, *kwargs.values()):
+            if isinstance(value, str) and value in _CONSTANTS:
+                stats.constants[value] = stats.constants.get(value, 0) + 1
+
+
+def _percentile(samples: list[int], fraction: float) -> int:
+    if not samples:
+        return 0
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def _cache_stats(info) -> dict:
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "hit_rate": info.hits / total if total else 0.0,
+    }
+
+
+if os.environ.get('TIME_UTILITY_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes', 'on'):
+    enable()
@@ -0,0 +1,210 @@
+# Python
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+# This Package
+from ._numpy import is_numpy_array, require_numpy
+
+
+# The smallest number of pending intervals before they are merged into the index
+_MIN_PENDING = 64
+
+
+class PeriodIndex:
+    """
+    An index of the (start, end) periods, e.g. the periods of `TimeUtility.get_period` or `TimeUtility.range`,
+    to find the periods containing a point or overlapping a range in O(log n + √n) (plus the number of the results).
+    The periods may overlap each other and both of their boundaries are inclusive, same as `get_period`.
+    The boundaries can be datetimes, dates, or numbers (e.g. the epoch values), as long as they are comparable with each other.
+
+    The periods are sorted by their start and form an implicit binary tree in which each node keeps the maximum end of its subtree.
+    The added periods are kept in a buffer, which is scanned by the queries (hence the √n) and merged into the tree when it grows beyond
+    max(64, √n) periods. An index which is not added to after it is built has no buffer, so its queries are O(log n)
+    """
+
+    __slots__ = ('_starts', '_ends', '_keys', '_max_ends', '_boundaries', '_pending')
+
+    def __init__(self, periods: Iterable[tuple] = ()):
+        """
+        :param periods: The (start, end) or (start, end, key) tuples. The key is returned along with the period by the queries
+        """
+        self._starts = []
+        self._ends = []
+        self._keys = []
+        self._max_ends = []
+        self._boundaries = []
+        self._pending = []
+        for period in periods:
+            self._pending.append(_check(*period))
+        self._merge()
+
+    def __len__(self) -> int:
+        return len(self._starts) + len(self._pending)
+
+    def add(self, start, end, key=None) -> None:
+        """
+        Adds a period to the index
+
+        :param start: The beginning of the period
+        :param end: The ending of the period (inclusive)
+        :param key: The optional key of the period, e.g. the tenant id
+        """
+        self._pending.append(_check(start, end, key))
+        if len(self._pending) > max(_MIN_PENDING, int(len(self._starts) ** 0.5)):
+            self._merge()
+
+    def containing(self, point) -> list[tuple]:
+        """
+        Returns the (start, end, key) of the periods containing the point, sorted by their start
+
+        :param point: The target point, e.g. a datetime
+        """
+        return self.overlapping(point, point)
+
+    def overlapping(self, start, end) -> list[tuple]:
+        """
+        Returns the (start, end, key) of the periods overlapping the range, sorted by their start
+
+        :param start: The beginning of the range
+        :param end: The ending of the range (inclusive)
+        """
+        if end < start:
+            raise ValueError()
+
+        result = []
+        starts, ends, keys, max_ends = self._starts, self._ends, self._keys, self._max_ends
+        stack = [(0, len(starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi == -1:
+                # A period of the result, pushed between its left and right subtrees
+                result.append((starts[lo], ends[lo], keys[lo]))
+                continue
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # None of the periods of this subtree ends after the start of the range
+            if max_ends[mid] < start:
+                continue
+            # The right subtree is pushed first so that the results are collected in the order of the starts
+            if starts[mid] <= end:
+                stack.append((mid + 1, hi))
+                if ends[mid] >= start:
+                    stack.append((mid, -1))
+            stack.append((lo, mid))
+
+        if self._pending:
+            pending = [p for p in self._pending if p[0] <= end and p[1] >= start]
+            if pending:
+                result.extend(pending)
+                result.sort(key=_start_end)
+        return result
+
+    def next_boundary(self, point):
+        """
+        Returns the first start or end of the periods after the point, or None if there is none
+
+        :param point: The target point, e.g. a datetime
+        """
+        boundaries = self._boundaries
+        i = bisect_right(boundaries, point)
+        found = boundaries[i] if i < len(boundaries) else None
+        for start, end, _ in self._pending:
+            for boundary in (start, end):
+                if boundary > point and (found is None or boundary < found):
+                    found = boundary
+        return found
+
+    def containing_many(self, points) -> list[list[tuple]]:
+        """
+        The batch version of `containing`
+
+        :param points: An iterable (or a numpy array) of the points
+        """
+        if is_numpy_array(points):
+            points = points.tolist()
+        return [self.overlapping(point, point) for point in points]
+
+    def overlapping_many(self, ranges) -> list[list[tuple]]:
+        """
+        The batch version of `overlapping`
+
+        :param ranges: An iterable of the (start, end) ranges
+        """
+        return [self.overlapping(start, end) for start, end in ranges]
+
+    def next_boundary_many(self, points):
+        """
+        The batch version of `next_boundary`. For numpy arrays of numbers, all the points are searched at once
+        and a numpy array is returned in which the points without a boundary after them are the smallest value of the dtype
+        (`np.iinfo(dtype).min`, or NaN for the floats), which is never a boundary after a point
+
+        :param points: An iterable (or a numpy array) of the points
+        """
+        if is_numpy_array(points) and points.dtype.kind in 'iuf':
+            np = require_numpy()
+            self._merge()
+            boundaries = np.asarray(self._boundaries, dtype=points.dtype)
+            missing = np.nan if points.dtype.kind == 'f' else np.iinfo(points.dtype).min
+            if len(boundaries) == 0:
+                return np.full(points.shape, missing, dtype=points.dtype)
+            indices = np.searchsorted(boundaries, points, side='right')
+            return np.where(indices < len(boundaries), boundaries[np.minimum(indices, len(boundaries) - 1)], missing).astype(points.dtype)
+        return [self.next_boundary(point) for point in points]
+
+    def _merge(self) -> None:
+        """Merges the pending periods into the sorted arrays and rebuilds the maximum ends of the tree"""
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        starts, ends, keys, boundaries = self._starts, self._ends, self._keys, self._boundaries
+
+        if len(pending) < len(starts):
+            # Only a few periods are added, so they are inserted into the sorted arrays
+            for start, end, key in pending:
+                lo = bisect_left(starts, start)
+                i = bisect_right(ends, end, lo, bisect_right(starts, start, lo))
+                starts.insert(i, start)
+                ends.insert(i, end)
+                keys.insert(i, key)
+                for boundary in (start, end):
+                    j = bisect_left(boundaries, boundary)
+                    if j == len(boundaries) or boundaries[j] != boundary:
+                        boundaries.insert(j, boundary)
+        else:
+            periods = list(zip(starts, ends, keys, strict=True)) + pending
+            periods.sort(key=_start_end)
+            self._starts = starts = [p[0] for p in periods]
+            self._ends = ends = [p[1] for p in periods]
+            self._keys = [p[2] for p in periods]
+            self._boundaries = sorted(set(starts).union(ends))
+
+        self._max_ends = list(ends)
+        _build_max_ends(ends, self._max_ends, 0, len(ends))
+
+
+def _check(start, end, key=None) -> tuple:
+    if end < start:
+        raise ValueError()
+    return start, end, key
+
+
+def _start_end(period: tuple) -> tuple:
+    return period[0], period[1]
+
+
+def _build_max_ends(ends: list, max_ends: list, lo: int, hi: int):
+    """Sets the maximum end of the subtree of each node (the middle of its range) and returns the maximum end of the range"""
+    mid = (lo + hi) // 2
+    value = ends[mid]
+    if lo < mid:
+        left = _build_max_ends(ends, max_ends, lo, mid)
+        if left > value:
+            value = left
+    if mid + 1 < hi:
+        right = _build_max_ends(ends, max_ends, mid + 1, hi)
+        if right > value:
+            value = right
+    max_ends[mid] = value
+    return value
@@ -1,13 +1,19 @@
 # Python
+from collections.abc import Iterator
 from datetime import datetime, timedelta, date
-from calendar import monthrange
-from typing import Tuple
-
-# Third Party
-import pytz
+from functools import lru_cache
 
 # This Package
 from .week import TimeUtilityWeek
+from ._numpy import require_numpy
+from . import clock, tz
+from ._calendar import EPOCH_UNIT_MICROSECONDS, days_in_month, is_leap_year
+from .buffers import adjust_offset_buffer
+from .parse import parse_many
+from .ranges import iter_periods, period_array
+from .expressions import Expression
+from .ordinals import slice_periods
+from .instant import difference
 
 
 class TimeUtility:
@@ -15,8 +21,10 @@ class TimeUtility:
 
     # Period Constants
     DAILY = "daily"
+    WEEKLY = "weekly"
     MONTHLY = "monthly"
     ANNUAL = "annual"
+    FOUR_WEEKLY = "four_weekly"
 
     # Time Unit Constants
     MICROSECOND = "microsecond"
@@ -25,6 +33,41 @@ class TimeUtility:
     HOUR = "hour"
     DAY = "day"
 
+    @staticmethod
+    def set_timezone_backend(backend: str) -> None:
+        """
+        Selects the library used for the timezones, i.e. the default UTC timezone and the timezones given by name.
+        Neither library is imported until a timezone is needed
+
+        :param backend: `pytz` (default) or `zoneinfo`. It can also be selected with the `TIME_UTILITY_TIMEZONE_BACKEND` environment variable
+        """
+        tz.set_backend(backend)
+
+    @staticmethod
+    def get_timezone(name: str):
+        """
+        Returns the timezone with the given name from the selected backend
+
+        :param name: The IANA name of the timezone, e.g. `Europe/Berlin`
+        """
+        return tz.get_timezone(name)
+
+    @staticmethod
+    def set_clock(new_clock: clock.Clock) -> clock.Clock:
+        """
+        Replaces the source of the current time (e.g. with `CoarseClock` or `FrozenClock`) and returns the previous one
+
+        :param new_clock: The new clock. The default is `SystemClock`, which calls `datetime.now`
+        """
+        return clock.set_clock(new_clock)
+
+    @staticmethod
+    def get_clock() -> clock.Clock:
+        """
+        Returns the source of the current time
+        """
+        return clock.get_clock()
+
     @staticmethod
     def is_naive(target_datetime: datetime) -> bool:
         """
@@ -44,148 +87,167 @@ class TimeUtility:
         return target_datetime.tzinfo is not None
 
     @staticmethod
-    def make_aware(target_datetime: datetime, timezone=pytz.utc) -> datetime:
+    def make_aware(target_datetime: datetime, timezone=None) -> datetime:
         """
         Return a new datetime object with the timezone information
 
         :param target_datetime: The target datetime object
-        :param timezone: The target timezone. The default value is UTC
+        :param timezone: The target timezone (a tzinfo or the name of a timezone). The default value is UTC
         """
-        return target_datetime.replace(tzinfo=timezone)
+        return target_datetime.replace(tzinfo=tz.resolve(timezone))
 
     @staticmethod
-    def now(timezone=pytz.utc) -> datetime:
+    def make_aware_many(target_datetimes, timezone=None, ambiguous: str = 'raise', nonexistent: str = 'raise'):
+        """
+        Makes many naive local datetimes aware in the given timezone, with the correct offset of each datetime (unlike `make_aware`, which only attaches the timezone).
+        The transition table of the timezone is built once and cached.
+        Returns a list of aware datetimes, or an int64 array of the UTC epoch microseconds for a numpy `datetime64` array
+
+        :param target_datetimes: A list of naive datetimes or a numpy `datetime64` array
+        :param timezone: The timezone of the local times (a tzinfo or the name of a timezone), defaults to UTC
+        :param ambiguous: The policy for the local times that happen twice. The options are `raise`, `earliest`, `latest`, and `none` (returns None)
+        :param nonexistent: The policy for the local times that do not exist. The options are `raise`, `shift_forward`, `shift_backward`, and `none` (returns None)
+        """
+        return tz.localize_many(target_datetimes, timezone, ambiguous, nonexistent)
+
+    @staticmethod
+    def from_epoch_many(values, timezone=None, epoch_unit: str = 's') -> list[datetime]:
+        """
+        Converts many epoch values to aware datetimes in the given timezone, using the cached transition table of the timezone
+
+        :param values: An iterable of epoch values
+        :param timezone: The target timezone (a tzinfo or the name of a timezone), defaults to UTC
+        :param epoch_unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+        """
+        return tz.from_epoch_many(values, timezone, epoch_unit)
+
+    @staticmethod
+    def now(timezone=None) -> datetime:
         """
         Returns the current date and time with the given time zone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         """
-        return datetime.now(tz=timezone)
+        return clock.now(tz.resolve(timezone))
 
     @staticmethod
-    def today(timezone=pytz.utc) -> date:
+    def today(timezone=None) -> date:
         """
         Returns the current date with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         """
-        return datetime.now(tz=timezone).date()
+        return clock.now(tz.resolve(timezone)).date()
 
     @staticmethod
-    def get_date_start(timezone=pytz.utc, year: int | None = None, month: int | None = None, day: int | None = None) -> datetime:
+    def get_date_start(timezone=None, year: int | None = None, month: int | None = None, day: int | None = None) -> datetime:
         """
         Returns the date and time of the beginning of the day with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         :param year: The target year, ignore or pass None to use the current year
         :param month: The target month, ignore or pass None to use the current month
         :param day: The target day, ignore or pass None to use the current day
         """
-        return datetime.now(tz=timezone).replace(
-            year=year if year is not None else datetime.now(tz=timezone).year,
-            month=month if month is not None else datetime.now(tz=timezone).month,
-            day=day if day is not None else datetime.now(tz=timezone).day,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0
+        now = clock.now(tz.resolve(timezone))
+        return _get_boundary(
+            now.tzinfo,
+            year if year is not None else now.year,
+            month if month is not None else now.month,
+            day if day is not None else now.day,
+            _DATE_START
         )
 
     @staticmethod
-    def get_date_end(timezone=pytz.utc, year: int | None = None, month: int | None = None, day: int | None = None) -> datetime:
+    def get_date_end(timezone=None, year: int | None = None, month: int | None = None, day: int | None = None) -> datetime:
         """
         Returns the date and time of the ending of the day with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         :param year: The target year, ignore or pass None to use the current year
         :param month: The target month, ignore or pass None to use the current month
         :param day: The target day, ignore or pass None to use the current day
         """
-        return datetime.now(tz=timezone).replace(
-            year=year if year is not None else datetime.now(tz=timezone).year,
-            month=month if month is not None else datetime.now(tz=timezone).month,
-            day=day if day is not None else datetime.now(tz=timezone).day,
-            hour=23,
-            minute=59,
-            second=59,
-            microsecond=999999
+        now = clock.now(tz.resolve(timezone))
+        return _get_boundary(
+            now.tzinfo,
+            year if year is not None else now.year,
+            month if month is not None else now.month,
+            day if day is not None else now.day,
+            _DATE_END
         )
 
     @staticmethod
-    def get_month_start(timezone=pytz.utc, year: int | None = None, month: int | None = None) -> datetime:
+    def get_month_start(timezone=None, year: int | None = None, month: int | None = None) -> datetime:
         """
         Returns the date and time of the beginning of the month with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         :param year: The target year, ignore or pass None to use the current year
         :param month: The target month, ignore or pass None to use the current month
         """
-        return datetime.now(tz=timezone).replace(
-            year=year if year is not None else datetime.now(tz=timezone).year,
-            month=month if month is not None else datetime.now(tz=timezone).month,
-            day=1,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0
+        now = clock.now(tz.resolve(timezone))
+        return _get_boundary(
+            now.tzinfo,
+            year if year is not None else now.year,
+            month if month is not None else now.month,
+            1,
+            _MONTH_START
         )
 
     @staticmethod
-    def get_month_end(timezone=pytz.utc, year: int | None = None, month: int | None = None) -> datetime:
+    def get_month_end(timezone=None, year: int | None = None, month: int | None = None) -> datetime:
         """
         Returns the date and time of the ending of the month with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         :param year: The target year, ignore or pass None to use the current year
         :param month: The target month, ignore or pass None to use the current month
         """
-        final_year = year if year is not None else datetime.now(tz=timezone).year
-        final_month = month if month is not None else datetime.now(tz=timezone).month
-        return datetime.now(tz=timezone).replace(
-            year=final_year,
-            month=final_month,
-            day=monthrange(final_year, final_month)[1],
-            hour=23,
-            minute=59,
-            second=59,
-            microsecond=999999
+        now = clock.now(tz.resolve(timezone))
+        return _get_boundary(
+            now.tzinfo,
+            year if year is not None else now.year,
+            month if month is not None else now.month,
+            1,
+            _MONTH_END
         )
 
     @staticmethod
-    def get_year_start(timezone=pytz.utc, year: int | None = None):
+    def get_year_start(timezone=None, year: int | None = None):
         """
         Returns the date and time of the beginning of the year with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         :param year: The target year, ignore or pass None to use the current year
         """
-        return datetime.now(tz=timezone).replace(
-            year=year if year is not None else datetime.now(tz=timezone).year,
-            month=1,
-            day=1,
-            hour=0,
-            minute=0,
-            second=0,
-            microsecond=0
-        )
+        now = clock.now(tz.resolve(timezone))
+        return _get_boundary(now.tzinfo, year if year is not None else now.year, 1, 1, _YEAR_START)
 
     @staticmethod
-    def get_year_end(timezone=pytz.utc, year: int | None = None):
+    def get_year_end(timezone=None, year: int | None = None):
         """
         Returns the date and time of the ending of the year with the given timezone
 
-        :param timezone: The desired timezone, defaults to UTC
+        :param timezone: The desired timezone (a tzinfo or the name of a timezone), defaults to UTC
         :param year: The target year, ignore or pass None to use the current year
         """
-        return datetime.now(tz=timezone).replace(
-            year=year if year is not None else datetime.now(tz=timezone).year,
-            month=12,
-            day=31,
-            hour=23,
-            minute=59,
-            second=59,
-            microsecond=999999
-        )
+        now = clock.now(tz.resolve(timezone))
+        return _get_boundary(now.tzinfo, year if year is not None else now.year, 1, 1, _YEAR_END)
+
+    @staticmethod
+    def boundary_cache_info():
+        """
+        Returns the hit/miss statistics of the cache used by the `get_*_start` and `get_*_end` functions and `get_period`
+        """
+        return _get_boundary.cache_info()
+
+    @staticmethod
+    def boundary_cache_clear() -> None:
+        """
+        Clears the cache used by the `get_*_start` and `get_*_end` functions and `get_period`
+        """
+        _get_boundary.cache_clear()
 
     @staticmethod
     def adjust_offset(original_datetime: datetime, offset: int, local_to_utc: bool) -> datetime:
@@ -203,25 +265,66 @@ class TimeUtility:
         return new_time
 
     @staticmethod
-    def get_period(year: int, month: int, day: int, period: str, offset: int = 0) -> Tuple[datetime, datetime]:
+    def adjust_offset_buffer(values, offset, local_to_utc: bool, unit: str = 'us', in_place: bool = False):
+        """
+        The version of `adjust_offset` for the buffers of int64 epoch values (e.g. `array('q')`, numpy arrays, or mmap slices).
+        With numpy installed, no Python object is created per value
+
+        :param values: Any object exposing the buffer protocol with the int64 epoch values
+        :param offset: The offset in minutes, or a buffer with one offset per value (Note that the Javascript offset obtained via `new Date().getTimezoneOffset()` should be multiplied by -1)
+        :param local_to_utc: Set to True if the values are in local time and set to False if the values are in UTC
+        :param unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+        :param in_place: Modify the given buffer instead of returning a new one
+        """
+        return adjust_offset_buffer(values, offset, local_to_utc, unit, in_place)
+
+    @staticmethod
+    def parse_many(strings, offsets=None, timezone=None, as_epoch: bool = False, epoch_unit: str = 'us'):
+        """
+        Parses many ISO 8601 / RFC 3339 strings into aware datetimes in UTC, or into a numpy int64 array of the epoch values.
+        All the strings must have the same shape (either all with or all without the timezone suffix), otherwise ValueError is raised
+
+        :param strings: An iterable of strings, e.g. `2024-03-01T12:34:56.123+02:00` or `2024-03-01 12:34:56`
+        :param offsets: The optional offsets in minutes of the strings without the timezone suffix, one per string. (Note that the Javascript offset obtained via `new Date().getTimezoneOffset()` should be multiplied by -1)
+        :param timezone: The timezone of the strings without the timezone suffix and without `offsets`, defaults to UTC
+        :param as_epoch: Return a numpy int64 array of the epoch values instead of the datetimes
+        :param epoch_unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+        """
+        return parse_many(strings, offsets, timezone, as_epoch, epoch_unit)
+
+    @staticmethod
+    def get_period(year: int, month: int, day: int, period: str, offset: int = 0) -> tuple[datetime, datetime]:
         """
         Returns the beginning and the ending datetime of a period
 
         :param year: The target year
         :param month: The target month
         :param day: The target day
-        :param period: The desired period time-span. Please use the period constants of TimeUtility such as `TimeUtility.DAILY'
+        :param period: The desired period time-span. Please use the period constants of TimeUtility such as `TimeUtility.DAILY`
         :param offset: The optional timezone offset in minutes. (Note that the Javascript offset obtained via `new Date().getTimezoneOffset()` should be multiplied by -1)
+        :raises ValueError: If the date is not valid
         """
+        # The boundaries are in UTC and all the date fields are given, so the clock is not needed
+        utc = tz.utc()
         if period == TimeUtility.DAILY:
-            start = TimeUtility.get_date_start(year=year, month=month, day=day)
-            end = TimeUtility.get_date_end(year=year, month=month, day=day)
+            start = _get_boundary(utc, year, month, day, _DATE_START)
+            end = _get_boundary(utc, year, month, day, _DATE_END)
+        elif period == TimeUtility.WEEKLY:
+            week = TimeUtilityWeek(date(year, month, day))
+            start = _get_boundary(utc, week.week_start.year, week.week_start.month, week.week_start.day, _DATE_START)
+            end = _get_boundary(utc, week.week_end.year, week.week_end.month, week.week_end.day, _DATE_END)
         elif period == TimeUtility.MONTHLY:
-            start = TimeUtility.get_month_start(year=year, month=month)
-            end = TimeUtility.get_month_end(year=year, month=month)
+            date(year, month, day)  # Only validates the date, the boundaries do not depend on the day
+            start = _get_boundary(utc, year, month, 1, _MONTH_START)
+            end = _get_boundary(utc, year, month, 1, _MONTH_END)
         elif period == TimeUtility.ANNUAL:
-            start = TimeUtility.get_year_start(year=year)
-            end = TimeUtility.get_year_end(year=year)
+            date(year, month, day)
+            start = _get_boundary(utc, year, 1, 1, _YEAR_START)
+            end = _get_boundary(utc, year, 1, 1, _YEAR_END)
+        elif period == TimeUtility.FOUR_WEEKLY:
+            from_d, _, to_d, _ = TimeUtilityWeek.get_four_week_period(date(year, month, day))
+            start = _get_boundary(utc, from_d.year, from_d.month, from_d.day, _DATE_START)
+            end = _get_boundary(utc, to_d.year, to_d.month, to_d.day, _DATE_END)
         else:
             raise ValueError()
 
@@ -230,6 +333,57 @@ class TimeUtility:
 
         return TimeUtility.adjust_offset(start, offset, False), TimeUtility.adjust_offset(end, offset, False)
 
+    @staticmethod
+    def range(start: datetime, end: datetime, period: str, step: int = 1, timezone=None) -> Iterator[tuple[datetime, datetime]]:
+        """
+        Lazily yields the beginning and the ending datetime of every period between two datetimes (including the periods containing them)
+
+        :param start: The first datetime. A naive datetime is considered to be in the given timezone
+        :param end: The last datetime. A naive datetime is considered to be in the given timezone
+        :param period: The desired period time-span. Please use the period constants of TimeUtility such as `TimeUtility.DAILY`
+        :param step: Yield every `step`-th period, defaults to 1
+        :param timezone: The timezone of the boundaries (a tzinfo or the name of a timezone), defaults to UTC
+        """
+        return iter_periods(start, end, period, step, timezone)
+
+    @staticmethod
+    def range_array(start: datetime, end: datetime, period: str, step: int = 1, timezone=None, unit: str = 'us'):
+        """
+        The array version of `range`. Returns the numpy arrays of the beginnings and the endings of the periods
+
+        :param start: The first datetime. A naive datetime is considered to be in the given timezone
+        :param end: The last datetime. A naive datetime is considered to be in the given timezone
+        :param period: The desired period time-span. Please use the period constants of TimeUtility such as `TimeUtility.DAILY`
+        :param step: Return every `step`-th period, defaults to 1
+        :param timezone: The timezone of the boundaries (a tzinfo or the name of a timezone), defaults to UTC
+        :param unit: The unit of the int64 epoch values (`s`, `ms`, or `us`), or `datetime64` for the UTC `datetime64[us]` values
+        """
+        return period_array(start, end, period, step, timezone, unit)
+
+    @staticmethod
+    def slice_periods(values, period: str, offset: int = 0, unit: str = 's'):
+        """
+        Splits a sorted timeline into the periods of `get_period` with a binary search per period, instead of calling `get_period` per value.
+        Returns the (period start, start index, end index) of the non-empty periods, as a list for a list of datetimes (or dates, or instants),
+        or as three numpy arrays for a numpy `datetime64` array or an int64 array (or a list of ints) of the epoch values
+
+        :param values: The sorted datetimes, or a numpy `datetime64` array or int64 array (or buffer, or list of ints) of the epoch values (UTC)
+        :param period: The desired period time-span. Please use the period constants of TimeUtility such as `TimeUtility.DAILY`
+        :param offset: The optional timezone offset in minutes, same as `get_period`
+        :param unit: The unit of the epoch values and of the returned period starts (`s`, `ms`, or `us`)
+        """
+        return slice_periods(values, period, offset, unit)
+
+    @staticmethod
+    def compile_expression(text: str) -> Expression:
+        """
+        Compiles a relative date expression, e.g. `start of previous month in Europe/Berlin` or `end of the four-week period containing today`.
+        The returned expression can be evaluated many times with `evaluate(reference=None)` and `evaluate_many(references)`
+
+        :param text: The expression
+        """
+        return Expression(text)
+
     @staticmethod
     def difference(large_time: datetime, small_time: datetime, time_span: str = 'second') -> int:
         """
@@ -256,6 +410,22 @@ class TimeUtility:
         else:
             raise ValueError()
 
+    @staticmethod
+    def difference_many(large_times, small_times, time_span: str = 'second', total: bool = False, epoch_unit: str = 's'):
+        """
+        The vectorized version of `difference` for arrays of datetimes. Returns a numpy int64 array
+
+        :param large_times: The larger datetimes, either as a numpy `datetime64` array or an int64 array of epoch values (UTC)
+        :param small_times: The smaller datetimes, in the same form as `large_times`
+        :param time_span: The time-span of difference. Please use the time unit constants of TimeUtility such as `TimeUtility.HOUR`
+        :param total: If False, the result matches `difference` (e.g. the hours are taken from the seconds component of the difference). If True, the total duration is returned in the given time-span
+        :param epoch_unit: The unit of the epoch values, if integer arrays are given. The options are `s`, `ms`, and `us`
+        """
+        np = require_numpy()
+        return difference(
+            _to_epoch_microseconds(np, large_times, epoch_unit), _to_epoch_microseconds(np, small_times, epoch_unit), time_span, total
+        )
+
     @staticmethod
     def is_leap_year(year: int | None = None):
         """
@@ -269,16 +439,75 @@ class TimeUtility:
         if isinstance(year, int) is False:
             raise ValueError()
 
-        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        return is_leap_year(year)
 
     @staticmethod
     def get_week(d: date) -> TimeUtilityWeek:
-        return TimeUtilityWeek(d)
+        return TimeUtilityWeek.get_shared(d)
 
     @staticmethod
     def get_week_by_week_number(year: int, week: int) -> TimeUtilityWeek:
         return TimeUtilityWeek.get_week_from_week_number(year, week)
 
+    @staticmethod
+    def get_week_numbers(dates):
+        return TimeUtilityWeek.get_week_numbers(dates)
+
+    @staticmethod
+    def get_week_starts_by_week_numbers(pairs):
+        return TimeUtilityWeek.get_week_starts_from_week_numbers(pairs)
+
     @staticmethod
     def get_four_week_period(d: date) -> tuple[date, int, date, int]:
         return TimeUtilityWeek.get_four_week_period(d)
+
+    @staticmethod
+    def get_four_week_period_many(dates, as_id: bool = False):
+        return TimeUtilityWeek.get_four_week_period_many(dates, as_id)
+
+
+# Boundary kinds of `_get_boundary`
+_DATE_START = 0
+_DATE_END = 1
+_MONTH_START = 2
+_MONTH_END = 3
+_YEAR_START = 4
+_YEAR_END = 5
+
+
+@lru_cache(maxsize=4096)
+def _get_boundary(tzinfo, year: int, month: int, day: int, kind: int) -> datetime:
+    """
+    Returns the start or the end of a day, month, or year. The datetime objects are immutable, so the cached instances are shared
+
+    :param tzinfo: The tzinfo of the clock snapshot (for pytz, this is the tzinfo with the offset of the snapshot)
+    :param year: The target year
+    :param month: The target month, ignored for the year boundaries
+    :param day: The target day, ignored for the month and the year boundaries
+    :param kind: One of the boundary kinds, e.g. `_DATE_START`
+    """
+    if kind == _DATE_START:
+        return datetime(year, month, day, tzinfo=tzinfo)
+    elif kind == _DATE_END:
+        return datetime(year, month, day, 23, 59, 59, 999999, tzinfo=tzinfo)
+    elif kind == _MONTH_START:
+        return datetime(year, month, 1, tzinfo=tzinfo)
+    elif kind == _MONTH_END:
+        return datetime(year, month, days_in_month(year, month), 23, 59, 59, 999999, tzinfo=tzinfo)
+    elif kind == _YEAR_START:
+        return datetime(year, 1, 1, tzinfo=tzinfo)
+    elif kind == _YEAR_END:
+        return datetime(year, 12, 31, 23, 59, 59, 999999, tzinfo=tzinfo)
+    raise ValueError()
+
+
+def _to_epoch_microseconds(np, values, epoch_unit: str):
+    """Converts a datetime64 or an integer epoch array to an int64 array of epoch microseconds"""
+    arr = np.asarray(values)
+    if arr.dtype.kind == 'M':
+        return arr.astype('datetime64[us]').astype(np.int64)
+    if arr.dtype.kind in 'iu':
+        if epoch_unit not in EPOCH_UNIT_MICROSECONDS:
+            raise ValueError()
+        return arr.astype(np.int64) * EPOCH_UNIT_MICROSECONDS[epoch_unit]
+    raise ValueError()
@@ -0,0 +1,298 @@
+"""
+The integer ordinals of the periods. The ordinals of a period kind are consecutive, so the previous period is `ordinal - 1`:
+
+- `daily`: the ordinal of the date (`date.toordinal()`)
+- `weekly`: the number of the ISO weeks since 0001-01-01 (the Monday of the week is `date.fromordinal(ordinal * 7 + 1)`)
+- `four_weekly`: `year * 13 + index of the period in the year`, same as the ids of `TimeUtility.get_four_week_period_many`
+- `monthly`: `year * 12 + month - 1`
+- `annual`: the year
+"""
+# Python
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from numbers import Integral
+
+# This Package
+from . import instant, tz
+from ._calendar import EPOCH_UNIT_MICROSECONDS
+from ._numpy import is_numpy_array, require_numpy
+from .buffers import as_int64_memoryview
+from ._periods import FOUR_WEEK_PERIODS_PER_YEAR, PERIODS, get_four_week_periods
+from .week import TimeUtilityWeek
+
+
+# The ordinal of 1970-01-01. The ordinal 1 (0001-01-01) is a Monday, so the weeks are counted from it
+_EPOCH_ORDINAL = 719163
+
+
+def to_ordinal(value, period: str, offset: int = 0) -> int:
+    """
+    Returns the ordinal of the period containing the value
+
+    :param value: A date, a datetime, or an `Instant`. A naive datetime is considered to be in local time
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, used for the aware datetimes and the instants, so that they are within `to_period(ordinal, period, offset)`
+    """
+    if period not in PERIODS:
+        raise ValueError()
+    if isinstance(value, instant.Instant):
+        days = (value.micros - offset * instant.MICROSECONDS_PER_MINUTE) // instant.MICROSECONDS_PER_DAY
+        return _from_days(days, period)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(tz.utc()) - timedelta(minutes=offset)
+        value = value.date()
+    return _from_days(value.toordinal() - _EPOCH_ORDINAL, period)
+
+
+def to_date(ordinal: int, period: str) -> date:
+    """
+    Returns the first date of the period
+
+    :param ordinal: The ordinal of the period
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    """
+    if period not in PERIODS:
+        raise ValueError()
+    return date.fromordinal(_to_days(ordinal, period) + _EPOCH_ORDINAL)
+
+
+def to_period(ordinal: int, period: str, offset: int = 0) -> tuple[datetime, datetime]:
+    """
+    Returns the beginning and the ending datetime of the period, same as `TimeUtility.get_period`
+
+    :param ordinal: The ordinal of the period
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    """
+    if period not in PERIODS:
+        raise ValueError()
+    utc = tz.utc()
+    start = datetime.combine(date.fromordinal(_to_days(ordinal, period) + _EPOCH_ORDINAL), time(), utc)
+    following = datetime.combine(date.fromordinal(_to_days(ordinal + 1, period) + _EPOCH_ORDINAL), time(), utc)
+    shift = timedelta(minutes=offset)
+    return start + shift, following - timedelta(microseconds=1) + shift
+
+
+def to_ordinals(values, period: str, offset: int = 0, unit: str = 's'):
+    """
+    The batch version of `to_ordinal`
+
+    :param values: A numpy `datetime64` array, a numpy int64 array (or buffer) of the epoch values, or a list of dates, datetimes, or instants
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `to_ordinal`. The numpy `datetime64` arrays and the epoch values are in UTC
+    :param unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+    :returns: A numpy int64 array for the numpy arrays and the buffers (an `array('q')` without numpy), otherwise a list of ints
+    """
+    if period not in PERIODS or unit not in EPOCH_UNIT_MICROSECONDS:
+        raise ValueError()
+
+    if is_numpy_array(values) and values.dtype.kind == 'M':
+        np = require_numpy()
+        micros = values.astype('datetime64[us]').astype(np.int64)
+        return _from_days_array(np, (micros - offset * instant.MICROSECONDS_PER_MINUTE) // instant.MICROSECONDS_PER_DAY, period)
+
+    if not is_numpy_array(values):
+        try:
+            view = as_int64_memoryview(values)
+        except TypeError:
+            return [to_ordinal(value, period, offset) for value in values]
+    factor = EPOCH_UNIT_MICROSECONDS[unit]
+    shift = offset * instant.MICROSECONDS_PER_MINUTE
+
+    try:
+        np = require_numpy()
+    except ImportError:
+        np = None
+
+    if np is None:
+        return array('q', (_from_days((v * factor - shift) // instant.MICROSECONDS_PER_DAY, period) for v in view))
+    values = values if is_numpy_array(values) else np.frombuffer(view, dtype=np.int64)
+    return _from_days_array(np, (values.astype(np.int64) * factor - shift) // instant.MICROSECONDS_PER_DAY, period)
+
+
+def to_periods(ordinals, period: str, offset: int = 0, unit: str = 'us'):
+    """
+    The batch version of `to_period`
+
+    :param ordinals: A numpy int64 array or a list of the ordinals
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    :param unit: The unit of the returned epoch values for a numpy array. The options are `s`, `ms`, and `us`
+    :returns: Two numpy int64 arrays of the epoch values of the beginnings and the endings for a numpy array, otherwise a list of the (start, end) datetimes
+    """
+    if period not in PERIODS or unit not in EPOCH_UNIT_MICROSECONDS:
+        raise ValueError()
+    if not is_numpy_array(ordinals):
+        return [to_period(ordinal, period, offset) for ordinal in ordinals]
+
+    np = require_numpy()
+    ordinals = ordinals.astype(np.int64)
+    shift = offset * instant.MICROSECONDS_PER_MINUTE
+    starts = _to_days_array(np, ordinals, period) * instant.MICROSECONDS_PER_DAY + shift
+    ends = _to_days_array(np, ordinals + 1, period) * instant.MICROSECONDS_PER_DAY - 1 + shift
+    factor = EPOCH_UNIT_MICROSECONDS[unit]
+    return starts // factor, ends // factor
+
+
+def slice_periods(values, period: str, offset: int = 0, unit: str = 's'):
+    """
+    Splits the sorted values into the periods, same as `to_period` (and `TimeUtility.get_period`) with the offset.
+    The boundary of each period is located with a binary search, so the values are not converted one by one. The empty periods are skipped
+
+    :param values: The sorted values: a numpy `datetime64` array, a numpy int64 array (or buffer, or list of ints) of the epoch values, or a list of dates, datetimes, or instants
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `to_ordinal`. The numpy `datetime64` arrays and the epoch values are in UTC
+    :param unit: The unit of the epoch values and of the returned period starts. The options are `s`, `ms`, and `us`
+    :returns: For a list, a list of the (period start, start index, end index) tuples, so that `values[start index:end index]` are the values of the period,
+        and the period start is the beginning datetime of `to_period`. For the numpy arrays, the buffers, and the lists of ints, three numpy int64 arrays of the period starts
+        (the epoch values, or `datetime64[us]` for a `datetime64` array), the start indexes, and the end indexes (a list of the tuples without numpy)
+    """
+    if period not in PERIODS or unit not in EPOCH_UNIT_MICROSECONDS:
+        raise ValueError()
+
+    if not is_numpy_array(values):
+        if len(values) and isinstance(values[0], Integral):
+            # The epoch values (including the numpy integers), which are sliced as a buffer
+            values = array('q', values)
+        try:
+            view = as_int64_memoryview(values)
+        except TypeError:
+            return _slice_objects(values, period, offset)
+    factor = EPOCH_UNIT_MICROSECONDS[unit]
+    shift = offset * instant.MICROSECONDS_PER_MINUTE
+
+    try:
+        np = require_numpy()
+    except ImportError:
+        np = None
+
+    if np is None:
+        return _slice_epochs(view, period, shift, factor, bisect_left)
+
+    is_datetime64 = is_numpy_array(values) and values.dtype.kind == 'M'
+    if is_datetime64:
+        values, factor = values.astype('datetime64[us]').astype(np.int64), 1
+    else:
+        values = values.astype(np.int64, copy=False) if is_numpy_array(values) else np.frombuffer(view, dtype=np.int64)
+
+    if values.size == 0:
+        starts = indexes = np.array([], dtype=np.int64)
+        return starts.astype('datetime64[us]') if is_datetime64 else starts, indexes, indexes
+
+    first = _from_days((int(values[0]) * factor - shift) // instant.MICROSECONDS_PER_DAY, period)
+    last = _from_days((int(values[-1]) * factor - shift) // instant.MICROSECONDS_PER_DAY, period)
+    if last - first < values.size:
+        # All the boundaries between the first and the last value are searched at once
+        boundaries = _to_days_array(np, np.arange(first, last + 2, dtype=np.int64), period) * instant.MICROSECONDS_PER_DAY + shift
+        indexes = np.searchsorted(values, -(-boundaries // factor))
+        keep = indexes[1:] > indexes[:-1]
+        starts, start_indexes, end_indexes = (boundaries[:-1] // factor)[keep], indexes[:-1][keep], indexes[1:][keep]
+    else:
+        # Sparse values, so only the boundaries of the non-empty periods are searched
+        slices = _slice_epochs(values, period, shift, factor, lambda a, value, lo: lo + int(np.searchsorted(a[lo:], value)))
+        starts, start_indexes, end_indexes = (np.array(column, dtype=np.int64) for column in zip(*slices, strict=True))
+
+    if is_datetime64:
+        starts = starts.astype('datetime64[us]')
+    return starts, start_indexes.astype(np.int64), end_indexes.astype(np.int64)
+
+
+def _slice_objects(values, period: str, offset: int) -> list[tuple[datetime, int, int]]:
+    slices = []
+    i = 0
+    while i < len(values):
+        value = values[i]
+        ordinal = to_ordinal(value, period, offset)
+        j = bisect_left(values, _get_start_like(value, ordinal + 1, period, offset), i + 1)
+        slices.append((to_period(ordinal, period, offset)[0], i, j))
+        i = j
+    return slices
+
+
+def _get_start_like(value, ordinal: int, period: str, offset: int):
+    """Returns the beginning of the period in the same form as the value, so they can be compared"""
+    if isinstance(value, instant.Instant):
+        return instant.Instant(_to_days(ordinal, period) * instant.MICROSECONDS_PER_DAY + offset * instant.MICROSECONDS_PER_MINUTE)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return to_period(ordinal, period, offset)[0]
+        return datetime.combine(to_date(ordinal, period), time())
+    return to_date(ordinal, period)
+
+
+def _slice_epochs(values, period: str, shift: int, factor: int, search) -> list[tuple[int, int, int]]:
+    """Returns the (period start, start index, end index) of the epoch values, with `search(values, value, lo)` as the binary search"""
+    slices = []
+    i = 0
+    while i < len(values):
+        ordinal = _from_days((int(values[i]) * factor - shift) // instant.MICROSECONDS_PER_DAY, period)
+        following = _to_days(ordinal + 1, period) * instant.MICROSECONDS_PER_DAY + shift
+        # The first value at or after the following period, rounded up to the unit of the values
+        j = search(values, -(-following // factor), i + 1)
+        slices.append(((_to_days(ordinal, period) * instant.MICROSECONDS_PER_DAY + shift) // factor, i, j))
+        i = j
+    return slices
+
+
+def _from_days(days: int, period: str) -> int:
+    """Returns the ordinal of the period of the day (the number of the days since 1970-01-01)"""
+    if period == "daily":
+        return days + _EPOCH_ORDINAL
+    elif period == "weekly":
+        return (days + _EPOCH_ORDINAL - 1) // 7
+    year, month, _ = instant.civil_from_days(days)
+    if period == "monthly":
+        return year * 12 + month - 1
+    elif period == "annual":
+        return year
+    starts, _ = get_four_week_periods(year)
+    return year * FOUR_WEEK_PERIODS_PER_YEAR + bisect_right(starts, days + _EPOCH_ORDINAL) - 1
+
+
+def _to_days(ordinal: int, period: str) -> int:
+    """Returns the first day (the number of the days since 1970-01-01) of the period"""
+    if period == "daily":
+        return ordinal - _EPOCH_ORDINAL
+    elif period == "weekly":
+        return ordinal * 7 + 1 - _EPOCH_ORDINAL
+    elif period == "monthly":
+        return instant.days_from_civil(ordinal // 12, ordinal % 12 + 1, 1)
+    elif period == "annual":
+        return instant.days_from_civil(ordinal, 1, 1)
+    year, index = divmod(ordinal, FOUR_WEEK_PERIODS_PER_YEAR)
+    return get_four_week_periods(year)[0][index] - _EPOCH_ORDINAL
+
+
+def _from_days_array(np, days, period: str):
+    if period == "daily":
+        return days + _EPOCH_ORDINAL
+    elif period == "weekly":
+        return (days + _EPOCH_ORDINAL - 1) // 7
+    elif period == "monthly":
+        return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    elif period == "annual":
+        return days.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int64) + 1970
+    return TimeUtilityWeek.get_four_week_period_many(days.astype('datetime64[D]'), as_id=True)
+
+
+def _to_days_array(np, ordinals, period: str):
+    if period == "daily":
+        return ordinals - _EPOCH_ORDINAL
+    elif period == "weekly":
+        return ordinals * 7 + 1 - _EPOCH_ORDINAL
+    elif period == "monthly":
+        return (ordinals - 1970 * 12).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+    elif period == "annual":
+        return (ordinals - 1970).astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64)
+    if ordinals.size == 0:
+        return ordinals
+
+    # The periods tile the calendar, so the starts of all the periods of the covered years are consecutive
+    first_year = int(ordinals.min()) // FOUR_WEEK_PERIODS_PER_YEAR
+    last_year = int(ordinals.max()) // FOUR_WEEK_PERIODS_PER_YEAR
+    starts = np.array(
+        [start for year in range(first_year, last_year + 1) for start in get_four_week_periods(year)[0]], dtype=np.int64
+    ) - _EPOCH_ORDINAL
+    return starts[ordinals - first_year * FOUR_WEEK_PERIODS_PER_YEAR]
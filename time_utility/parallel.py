@@ -0,0 +1,250 @@
+"""
+Parallel assignment of many timestamps to the periods of `TimeUtility.get_period`.
+
+The input is split into chunks which are bucketed by a pool of processes. The partial results are merged in the order
+of the chunks, so the result does not depend on the number of the workers or the order in which the chunks finish.
+"""
+# Python
+from collections import deque
+from collections.abc import Iterable
+import csv
+from itertools import islice
+import os
+
+# This Package
+from . import instant
+from ._calendar import EPOCH_UNIT_MICROSECONDS
+from ._numpy import require_numpy
+from ._periods import PERIODS
+from .parse import parse_many
+
+
+AGGREGATE_COUNT = "count"
+AGGREGATE_SUM = "sum"
+
+
+def bucket(values: Iterable, period: str, offset: int = 0, epoch_unit: str = 's', aggregate: str = AGGREGATE_COUNT,
+           workers: int | None = None, chunk_size: int = 100_000) -> dict:
+    """
+    Assigns the epoch values to the periods and returns the count (or the sum) of each period, sorted by the periods
+
+    :param values: An iterable of the epoch values (UTC), or of the (epoch value, number) pairs if `aggregate` is `sum`
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    :param epoch_unit: The unit of the epoch values and of the returned period starts. The options are `s`, `ms`, and `us`
+    :param aggregate: `count` to count the values of each period, or `sum` to add up the numbers of the pairs
+    :param workers: The number of the processes, defaults to the number of the CPUs. With 1, the chunks are processed in this process
+    :param chunk_size: The number of the values sent to a process at once
+    :returns: A dict of the start of each period (an epoch value) to its count or sum. The sums of integers are exact integers
+    """
+    _check(period, epoch_unit, aggregate)
+    if chunk_size < 1:
+        raise ValueError()
+
+    def tasks():
+        iterator = iter(values)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            if aggregate == AGGREGATE_SUM:
+                times, weights = [v[0] for v in chunk], [v[1] for v in chunk]
+            else:
+                times, weights = chunk, None
+            yield _bucket_chunk, (times, weights, period, offset, epoch_unit)
+
+    return _run(tasks(), workers)
+
+
+def bucket_file(path: str, period: str, offset: int = 0, epoch_unit: str = 's', aggregate: str = AGGREGATE_COUNT,
+                column: int | str | None = None, value_column: int | str | None = None, delimiter: str = ',',
+                header: bool = False, timezone=None, workers: int | None = None, chunk_bytes: int = 16 * 1024 * 1024) -> dict:
+    """
+    The file version of `bucket`. The file is split into the ranges of lines which are read by the processes themselves
+
+    :param path: The path of a text file with one epoch value per line, or of a CSV file
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param offset: The optional timezone offset in minutes, same as `TimeUtility.get_period`
+    :param epoch_unit: The unit of the epoch values and of the returned period starts. The options are `s`, `ms`, and `us`
+    :param aggregate: `count` to count the lines of each period, or `sum` to add up the numbers of `value_column`
+    :param column: The index (or the header name) of the CSV column with the timestamps, either the epoch values or the ISO 8601 strings. None for the files with one epoch value per line.
+        The format is detected from the first value of each range of lines, so all the values of the column must have the same format
+    :param value_column: The index (or the header name) of the CSV column with the numbers to add up if `aggregate` is `sum`.
+        The integers are added up as exact integers and the other numbers as floats
+    :param delimiter: The delimiter of the CSV columns
+    :param header: Set to True if the first line is the header
+    :param timezone: The timezone of the ISO 8601 strings without the timezone suffix, see `TimeUtility.parse_many`
+    :param workers: The number of the processes, defaults to the number of the CPUs. With 1, the ranges are processed in this process
+    :param chunk_bytes: The approximate size of the range of a file read by a process at once
+    :returns: A dict of the start of each period (an epoch value) to its count or sum
+    """
+    _check(period, epoch_unit, aggregate)
+    if chunk_bytes < 1 or (aggregate == AGGREGATE_SUM and value_column is None):
+        raise ValueError()
+
+    names = None
+    if header:
+        with open(path, newline='') as f:
+            names = next(csv.reader(f, delimiter=delimiter), [])
+    column = _column_index(column, names)
+    value_column = _column_index(value_column, names)
+
+    size = os.path.getsize(path)
+    tasks = (
+        (_bucket_range, (path, start, min(start + chunk_bytes, size), header, column, value_column, delimiter, timezone, period, offset, epoch_unit))
+        for start in range(0, size, chunk_bytes)
+    )
+    return _run(tasks, workers)
+
+
+def _check(period: str, epoch_unit: str, aggregate: str) -> None:
+    if period not in PERIODS or epoch_unit not in EPOCH_UNIT_MICROSECONDS or aggregate not in (AGGREGATE_COUNT, AGGREGATE_SUM):
+        raise ValueError()
+
+
+def _column_index(column, names: list[str] | None) -> int | None:
+    if column is None or isinstance(column, int):
+        return column
+    if names is None or column not in names:
+        raise ValueError("Unknown column: {c}".format(c=column))
+    return names.index(column)
+
+
+def _run(tasks: Iterable[tuple], workers: int | None) -> dict:
+    """Runs the tasks, keeping at most two tasks per worker in flight, and merges their results in order"""
+    workers = workers or os.cpu_count() or 1
+    total = {}
+
+    if workers == 1:
+        for function, args in tasks:
+            _merge(total, function(*args))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for function, args in tasks:
+                pending.append(executor.submit(function, *args))
+                if len(pending) >= workers * 2:
+                    _merge(total, pending.popleft().result())
+            while pending:
+                _merge(total, pending.popleft().result())
+
+    return dict(sorted(total.items()))
+
+
+def _merge(total: dict, partial: dict) -> None:
+    for key, value in partial.items():
+        total[key] = total.get(key, 0) + value
+
+
+def _bucket_chunk(times: list, weights: list | None, period: str, offset: int, epoch_unit: str) -> dict:
+    """
+    Buckets a chunk of the epoch values. The values are grouped by their (offset) day first,
+    so the period is only calculated once per day. The integer weights are added up as integers, with or without numpy
+    """
+    factor = EPOCH_UNIT_MICROSECONDS[epoch_unit]
+    shift = offset * instant.MICROSECONDS_PER_MINUTE
+    day = instant.MICROSECONDS_PER_DAY
+
+    try:
+        np = require_numpy()
+    except ImportError:
+        np = None
+
+    weight_array = None
+    if np is not None and weights is not None:
+        weight_array = np.asarray(weights)
+        if weight_array.dtype.kind not in 'biuf' or (weight_array.dtype.kind in 'biu' and not _fits_int64(weight_array)):
+            # E.g. the integers beyond int64, or the uint64 weights and the sums which would overflow int64, which are added up in Python
+            weights = weight_array.tolist()
+            np = None
+
+    if np is not None:
+        days = (np.asarray(times, dtype=np.int64) * factor - shift) // day
+        unique_days, inverse = np.unique(days, return_inverse=True)
+        inverse = inverse.ravel()
+        if weight_array is None:
+            sums = np.bincount(inverse, minlength=len(unique_days))
+        elif weight_array.dtype.kind == 'f':
+            sums = np.bincount(inverse, weights=weight_array, minlength=len(unique_days))
+        else:
+            # `bincount` adds up the weights as float64, which loses the precision of the integers above 2**53.
+            # `_fits_int64` checked that no sum can overflow int64
+            sums = np.zeros(len(unique_days), dtype=np.int64)
+            np.add.at(sums, inverse, weight_array.astype(np.int64))
+        per_day = zip(unique_days.tolist(), sums.tolist(), strict=True)
+    else:
+        per_day = {}
+        if weights is None:
+            for t in times:
+                d = (t * factor - shift) // day
+                per_day[d] = per_day.get(d, 0) + 1
+        else:
+            for t, w in zip(times, weights, strict=True):
+                d = (t * factor - shift) // day
+                per_day[d] = per_day.get(d, 0) + w
+        per_day = per_day.items()
+
+    result = {}
+    for d, value in per_day:
+        year, month, date_day = instant.civil_from_days(d)
+        key = instant.get_period(year, month, date_day, period, offset)[0] // factor
+        result[key] = result.get(key, 0) + value
+    return result
+
+
+def _fits_int64(weights) -> bool:
+    """Checks that the integer weights and any sum of them fit in int64"""
+    if not len(weights):
+        return True
+    largest = max(int(weights.max()), -int(weights.min()))
+    return largest * len(weights) <= 2 ** 63 - 1
+
+
+def _parse_weight(value: str) -> int | float:
+    """Parses a number of the value column, as an int if it is an integer so the sums are exact"""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _bucket_range(path: str, start: int, end: int, header: bool, column: int | None, value_column: int | None,
+                  delimiter: str, timezone, period: str, offset: int, epoch_unit: str) -> dict:
+    """Buckets the lines starting in the byte range [start, end) of the file"""
+    with open(path, 'rb') as f:
+        if start:
+            # The line crossing the start belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        data = f.read(max(0, end - f.tell()))
+        if data and not data.endswith(b'\n'):
+            data += f.readline()
+
+    lines = data.decode().splitlines()
+    if header and start == 0:
+        lines = lines[1:]
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return {}
+
+    weights = None
+    if column is None:
+        values = lines
+    else:
+        rows = list(csv.reader(lines, delimiter=delimiter))
+        values = [row[column] for row in rows]
+        if value_column is not None:
+            weights = [_parse_weight(row[value_column]) for row in rows]
+
+    # The format of the timestamps is detected from the first value of the range, so a file may not mix the two formats
+    if values[0].strip().lstrip('-').isdigit():
+        times = [int(v) for v in values]
+    else:
+        factor = EPOCH_UNIT_MICROSECONDS[epoch_unit]
+        times = [
+            instant.Instant.from_datetime(d).micros // factor
+            for d in parse_many([v.strip() for v in values], timezone=timezone)
+        ]
+    return _bucket_chunk(times, weights, period, offset, epoch_unit)
@@ -0,0 +1,98 @@
+# Python
+from datetime import datetime, timedelta
+import re
+import sys
+
+# This Package
+from . import tz
+from ._calendar import EPOCH_UNIT_MICROSECONDS
+from ._numpy import require_numpy
+
+
+# The suffix of the strings with the timezone information, e.g. `Z`, `+02:00`, or `-0530`
+_OFFSET_SUFFIX = re.compile(r'(Z|[+-]\d{2}(:?\d{2})?)$')
+
+# `datetime.fromisoformat` accepts `Z`, `+HHMM`, and `+HH` since Python 3.11 (only `+HH:MM` before)
+_NEEDS_SUFFIX_NORMALIZATION = sys.version_info < (3, 11)
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def parse_many(strings, offsets=None, timezone=None, as_epoch: bool = False, epoch_unit: str = 'us'):
+    """
+    Parses many ISO 8601 / RFC 3339 strings. All the strings must have the same shape (either all with or all without the timezone suffix),
+    so the same parser is used for the whole batch. A batch of mixed shapes raises ValueError.
+    Returns a list of aware datetimes in UTC, or a numpy int64 array of the epoch values if `as_epoch` is True
+
+    :param strings: An iterable of strings, e.g. `2024-03-01T12:34:56.123+02:00`
+    :param offsets: The optional offsets in minutes of the strings without the timezone suffix, one per string, with the same sign convention as `adjust_offset` (i.e. the Javascript `getTimezoneOffset()` multiplied by -1)
+    :param timezone: The timezone of the strings without the timezone suffix and without `offsets` (a tzinfo or the name of a timezone), defaults to UTC
+    :param as_epoch: Return a numpy int64 array of the epoch values instead of the datetimes
+    :param epoch_unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+    """
+    if epoch_unit not in EPOCH_UNIT_MICROSECONDS:
+        raise ValueError()
+
+    strings = strings if isinstance(strings, list) else list(strings)
+    if offsets is not None:
+        offsets = offsets.tolist() if hasattr(offsets, 'tolist') else list(offsets)
+        if len(offsets) != len(strings):
+            raise ValueError()
+
+    suffixes = sum(1 for s in strings if _has_suffix(s))
+    if suffixes not in (0, len(strings)):
+        raise ValueError("The strings must either all have or all not have the timezone suffix")
+    has_suffix = suffixes > 0
+
+    if as_epoch:
+        np = require_numpy()
+        if not has_suffix and (timezone is None or offsets is not None):
+            # numpy parses the naive ISO strings in C
+            values = np.array(strings, dtype='datetime64[us]').astype(np.int64)
+            if offsets is not None:
+                values -= np.array(offsets, dtype=np.int64) * 60_000_000
+            return values // EPOCH_UNIT_MICROSECONDS[epoch_unit]
+
+        utc = tz.utc()
+        return np.array([
+            (d.astimezone(utc).replace(tzinfo=None) - _EPOCH) // _ONE_MICROSECOND
+            for d in _parse_aware(strings, has_suffix, offsets, timezone)
+        ], dtype=np.int64) // EPOCH_UNIT_MICROSECONDS[epoch_unit]
+
+    return _parse_aware(strings, has_suffix, offsets, timezone)
+
+
+def _parse_aware(strings: list[str], has_suffix: bool, offsets: list[int] | None, timezone) -> list[datetime]:
+    utc = tz.utc()
+    parse = datetime.fromisoformat
+
+    if has_suffix:
+        if _NEEDS_SUFFIX_NORMALIZATION:
+            return [parse(_normalize_suffix(s)).astimezone(utc) for s in strings]
+        return [parse(s).astimezone(utc) for s in strings]
+
+    if offsets is not None:
+        return [(parse(s) - timedelta(minutes=offset)).replace(tzinfo=utc) for s, offset in zip(strings, offsets, strict=True)]
+
+    zone = tz.resolve(timezone)
+    if zone is utc:
+        return [parse(s).replace(tzinfo=utc) for s in strings]
+    return [d.astimezone(utc) for d in tz.localize_many([parse(s) for s in strings], zone)]
+
+
+def _has_suffix(value: str) -> bool:
+    """Checks that the string ends with the timezone suffix after the time (e.g. not the `-01` day of a date-only string)"""
+    return _OFFSET_SUFFIX.search(value) is not None and ('T' in value or ' ' in value.strip())
+
+
+def _normalize_suffix(value: str) -> str:
+    """Returns the string with the `+HH:MM` suffix, e.g. `+00:00` for `Z` and `-05:30` for `-0530`"""
+    suffix = _OFFSET_SUFFIX.search(value).group(1)
+    if suffix == 'Z':
+        return value[:-1] + '+00:00'
+    if len(suffix) == 3:
+        return value + ':00'
+    if len(suffix) == 5:
+        return value[:-2] + ':' + value[-2:]
+    return value
@@ -0,0 +1,99 @@
+# Python
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta
+
+# This Package
+from . import tz
+from ._calendar import EPOCH_UNIT_MICROSECONDS
+from ._numpy import require_numpy
+from ._periods import ANNUAL, DAILY, DAY_END, MONTHLY, PERIODS, WEEKLY, advance, get_period_start
+
+
+def iter_periods(start: datetime, end: datetime, period: str, step: int = 1, timezone=None) -> Iterator[tuple[datetime, datetime]]:
+    """
+    Lazily yields the (start, end) of every period between two datetimes, including the periods containing them.
+    The boundaries are the same as `TimeUtility.get_period` in the given timezone.
+    Each period is calculated from the previous one
+
+    :param start: The first datetime. A naive datetime is considered to be in the given timezone
+    :param end: The last datetime. A naive datetime is considered to be in the given timezone
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param step: Yield every `step`-th period
+    :param timezone: The timezone of the boundaries (a tzinfo or the name of a timezone), defaults to UTC
+    """
+    if period not in PERIODS or step < 1:
+        raise ValueError()
+
+    zone = tz.resolve(timezone)
+    last = _get_local_date(end, zone)
+    d = get_period_start(_get_local_date(start, zone), period)
+
+    while d <= last:
+        following = advance(d, period, 1)
+        yield (
+            tz.localize(datetime.combine(d, time()), zone, tz.AMBIGUOUS_EARLIEST, tz.NONEXISTENT_SHIFT_FORWARD),
+            tz.localize(datetime.combine(following - timedelta(days=1), DAY_END), zone, tz.AMBIGUOUS_LATEST, tz.NONEXISTENT_SHIFT_BACKWARD),
+        )
+        d = following if step == 1 else advance(d, period, step)
+
+
+def period_array(start: datetime, end: datetime, period: str, step: int = 1, timezone=None, unit: str = 'us'):
+    """
+    The array version of `iter_periods`. Returns two numpy arrays of the starts and the ends of the periods,
+    either as int64 epoch values or as UTC `datetime64[us]` values
+
+    :param start: The first datetime. A naive datetime is considered to be in the given timezone
+    :param end: The last datetime. A naive datetime is considered to be in the given timezone
+    :param period: The period constants of TimeUtility, e.g. `TimeUtility.DAILY`
+    :param step: Return every `step`-th period
+    :param timezone: The timezone of the boundaries (a tzinfo or the name of a timezone), defaults to UTC
+    :param unit: The unit of the epoch values, `s`, `ms`, or `us`, or `datetime64` for the UTC `datetime64[us]` values
+    """
+    np = require_numpy()
+    if period not in PERIODS or step < 1:
+        raise ValueError()
+    if unit not in ('s', 'ms', 'us', 'datetime64'):
+        raise ValueError()
+
+    zone = tz.resolve(timezone)
+    first = get_period_start(_get_local_date(start, zone), period)
+    last = _get_local_date(end, zone)
+
+    if period == DAILY:
+        starts = np.arange(np.datetime64(first, 'D'), np.datetime64(last, 'D') + 1, step)
+        ends = starts + 1
+    elif period == WEEKLY:
+        starts = np.arange(np.datetime64(first, 'D'), np.datetime64(last, 'D') + 1, 7 * step)
+        ends = starts + 7
+    elif period == MONTHLY:
+        months = np.arange(np.datetime64(first, 'M'), np.datetime64(last, 'M') + 1, step)
+        starts = months.astype('datetime64[D]')
+        ends = (months + 1).astype('datetime64[D]')
+    elif period == ANNUAL:
+        years = np.arange(np.datetime64(first, 'Y'), np.datetime64(last, 'Y') + 1, step)
+        starts = years.astype('datetime64[D]')
+        ends = (years + 1).astype('datetime64[D]')
+    else:
+        dates = []
+        d = first
+        while d <= last:
+            dates.append(d)
+            d = advance(d, period, step)
+        starts = np.array(dates, dtype='datetime64[D]')
+        ends = np.array([advance(d, period, 1) for d in dates], dtype='datetime64[D]')
+
+    local_starts = starts.astype('datetime64[us]')
+    local_ends = ends.astype('datetime64[us]') - 1
+    utc_starts = tz.localize_many(local_starts, zone, tz.AMBIGUOUS_EARLIEST, tz.NONEXISTENT_SHIFT_FORWARD)
+    utc_ends = tz.localize_many(local_ends, zone, tz.AMBIGUOUS_LATEST, tz.NONEXISTENT_SHIFT_BACKWARD)
+
+    if unit == 'datetime64':
+        return utc_starts.astype('datetime64[us]'), utc_ends.astype('datetime64[us]')
+    divisor = EPOCH_UNIT_MICROSECONDS[unit]
+    return utc_starts // divisor, utc_ends // divisor
+
+
+def _get_local_date(value: datetime, zone) -> date:
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(zone).date()
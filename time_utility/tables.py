@@ -0,0 +1,225 @@
+"""
+The precomputed calendar tables of the years 1 to 9999: the ISO weeks, the leap years (so the lengths of the months), and the four-week periods.
+
+The tables are written once to a binary file with `build` (or `python -m time_utility.tables`), e.g. when a container image is built,
+and the file is memory-mapped on first use, so the short-lived processes neither compute nor parse them.
+Without the file (or with an invalid file), the tables are computed on the fly and cached per year.
+
+The file starts with a 16-byte header: the magic `TUCT`, the version (uint16), the first and the last year (uint16),
+the size of a record (uint16), and the CRC-32 of the records (uint32). Then a fixed-size record per year (little-endian):
+the ordinal of the first day of the ISO week 1 (int32), the number of the ISO weeks (uint8), 1 for a leap year (uint8),
+and the start ordinals (int32), the first weeks (uint8), and the last weeks (uint8) of the 13 four-week periods.
+"""
+# Python
+from datetime import date
+import os
+import struct
+import sys
+import threading
+
+# This Package
+from ._calendar import DAYS_IN_MONTH, is_leap_year
+
+
+MAGIC = b'TUCT'
+VERSION = 1
+
+FIRST_YEAR = 1
+LAST_YEAR = 9999
+
+_HEADER = struct.Struct('<4sHHHHI')
+_RECORD = struct.Struct('<iBB13i13B13B')
+
+
+class CalendarTables:
+    """
+    The memory-mapped calendar tables. The header and the checksum are validated when the file is opened,
+    then each lookup reads one record of the year, so the whole file is never parsed
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: The path of the file written by `build`
+        """
+        import mmap
+        import zlib
+
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size >= _HEADER.size else None
+        if self._mmap is None:
+            raise ValueError("Invalid calendar tables: {p}".format(p=path))
+
+        magic, version, first_year, last_year, record_size, checksum = _HEADER.unpack_from(self._mmap)
+        valid = (
+            magic == MAGIC
+            and version == VERSION
+            and record_size == _RECORD.size
+            and first_year <= last_year
+            and size == _HEADER.size + (last_year - first_year + 1) * _RECORD.size
+        )
+        if valid:
+            with memoryview(self._mmap) as view:
+                valid = zlib.crc32(view[_HEADER.size:]) == checksum
+        if not valid:
+            self.close()
+            raise ValueError("Invalid calendar tables: {p}".format(p=path))
+        self.first_year = first_year
+        self.last_year = last_year
+
+    def __contains__(self, year: int) -> bool:
+        return self.first_year <= year <= self.last_year
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def get_iso_year(self, year: int) -> tuple[int, int]:
+        """
+        Returns the ordinal of the first day (Monday) of the week 1 and the number of ISO weeks of the given year
+
+        :param year: The target ISO year
+        """
+        record = self._get_record(year)
+        return record[0], record[1]
+
+    def is_leap_year(self, year: int) -> bool:
+        """
+        :param year: The target year
+        """
+        return bool(self._get_record(year)[2])
+
+    def get_days_in_month(self, year: int, month: int) -> int:
+        """
+        :param year: The target year
+        :param month: The target month
+        """
+        if month == 2:
+            return 28 + self._get_record(year)[2]
+        return DAYS_IN_MONTH[month]
+
+    def get_four_week_periods(self, year: int) -> tuple[tuple[int, ...], tuple[tuple[date, int, date, int], ...]]:
+        """
+        Returns the start ordinals and the four-week periods of the given year, as returned by `TimeUtility.get_four_week_period`
+
+        :param year: The target year
+        """
+        record = self._get_record(year)
+        starts = record[3:16]
+        # The periods tile the year, so each period ends the day before the next one starts
+        ends = [start - 1 for start in starts[1:]]
+        ends.append(starts[0] + 364 + record[2])
+        periods = tuple(
+            (date.fromordinal(start), first_week, date.fromordinal(end), last_week)
+            for start, first_week, end, last_week in zip(starts, record[16:29], ends, record[29:42], strict=True)
+        )
+        return starts, periods
+
+    def _get_record(self, year: int) -> tuple:
+        if not self.first_year <= year <= self.last_year:
+            raise ValueError()
+        return _RECORD.unpack_from(self._mmap, _HEADER.size + (year - self.first_year) * _RECORD.size)
+
+
+def get_default_path() -> str:
+    """
+    Returns the path of the tables of the process: the `TIME_UTILITY_CALENDAR_TABLES` environment variable,
+    or `calendar-v1.bin` in the cache directory (`$XDG_CACHE_HOME/time_utility`, by default `~/.cache/time_utility`)
+    """
+    path = os.environ.get('TIME_UTILITY_CALENDAR_TABLES')
+    if path:
+        return path
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'time_utility', 'calendar-v{v}.bin'.format(v=VERSION))
+
+
+def build(path: str | None = None) -> str:
+    """
+    Computes the tables and writes them to the file (atomically, so the concurrent readers never see a partial file).
+    Returns the path of the file
+
+    :param path: The path of the file, defaults to `get_default_path()`
+    """
+    import zlib
+    from ._periods import compute_four_week_periods, compute_iso_year
+
+    path = path or get_default_path()
+    records = bytearray()
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        week_one, weeks = compute_iso_year(year)
+        starts, periods = compute_four_week_periods(year)
+        records += _RECORD.pack(week_one, weeks, is_leap_year(year), *starts, *(p[1] for p in periods), *(p[3] for p in periods))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = "{p}.{pid}.tmp".format(p=path, pid=os.getpid())
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, FIRST_YEAR, LAST_YEAR, _RECORD.size, zlib.crc32(records)))
+        f.write(records)
+    os.replace(temporary, path)
+    return path
+
+
+_lock = threading.Lock()
+_tables: CalendarTables | None = None
+_loaded = False
+
+
+def get_tables() -> CalendarTables | None:
+    """
+    Returns the tables of the process, loaded from `get_default_path()` on first use.
+    Returns None, so the tables are computed on the fly, if the file is missing or invalid
+    """
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                _set(_open(get_default_path()))
+    return _tables
+
+
+def load(path: str | None = None) -> bool:
+    """
+    Loads the tables of the process from the file, replacing the loaded tables.
+    Returns False, so the tables are computed on the fly, if the file is missing or invalid
+
+    :param path: The path of the file, defaults to `get_default_path()`
+    """
+    tables = _open(path or get_default_path())
+    with _lock:
+        _set(tables)
+    return tables is not None
+
+
+def unload() -> None:
+    """
+    Computes the tables on the fly until `load` is called. The values are the same either way
+    """
+    with _lock:
+        _set(None)
+
+
+def _open(path: str) -> CalendarTables | None:
+    try:
+        return CalendarTables(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _set(tables: CalendarTables | None) -> None:
+    # The replaced tables are not closed, since the concurrent readers may still use them
+    global _tables, _loaded
+    _tables = tables
+    _loaded = True
+
+
+if __name__ == '__main__':
+    print(build(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,346 @@
+# Python
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+import os
+
+# This Package
+from ._calendar import EPOCH_UNIT_MICROSECONDS
+from ._numpy import require_numpy, is_numpy_array
+
+
+# Policies for the local times that happen twice (e.g. when the clocks are turned back)
+AMBIGUOUS_RAISE = "raise"
+AMBIGUOUS_EARLIEST = "earliest"
+AMBIGUOUS_LATEST = "latest"
+
+# Policies for the local times that do not exist (e.g. when the clocks are turned forward)
+NONEXISTENT_RAISE = "raise"
+NONEXISTENT_SHIFT_FORWARD = "shift_forward"
+NONEXISTENT_SHIFT_BACKWARD = "shift_backward"
+
+# Policy for both, to return None instead of the datetime (not supported for numpy arrays)
+NONE = "none"
+
+# Timezone backends
+PYTZ = "pytz"
+ZONEINFO = "zoneinfo"
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+_backend = os.environ.get('TIME_UTILITY_TIMEZONE_BACKEND', PYTZ)
+_utc = None
+
+
+def set_backend(backend: str) -> None:
+    """
+    Selects the library used for the timezones, i.e. the default UTC timezone and the timezones given by name.
+    The library is imported on first use
+
+    :param backend: `pytz` (default) or `zoneinfo`
+    """
+    global _backend, _utc
+    if backend not in (PYTZ, ZONEINFO):
+        raise ValueError()
+    _backend = backend
+    _utc = None
+    get_timezone.cache_clear()
+
+
+def get_backend() -> str:
+    """
+    Returns the name of the selected timezone backend
+    """
+    return _backend
+
+
+def utc():
+    """
+    Returns the UTC timezone of the selected backend
+    """
+    global _utc
+    if _utc is None:
+        if _backend == PYTZ:
+            import pytz
+            _utc = pytz.utc
+        else:
+            _utc = dt_timezone.utc
+    return _utc
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str):
+    """
+    Returns the timezone with the given name (e.g. `Europe/Berlin`) from the selected backend
+
+    :param name: The IANA name of the timezone
+    """
+    if _backend == PYTZ:
+        import pytz
+        return pytz.timezone(name)
+
+    import zoneinfo
+    return zoneinfo.ZoneInfo(name)
+
+
+def resolve(timezone):
+    """
+    Returns the tzinfo of a `timezone` parameter. None is the UTC of the selected backend and a string is the name of a timezone
+
+    :param timezone: None, the name of a timezone, or a tzinfo
+    """
+    if timezone is None:
+        return utc()
+    if isinstance(timezone, str):
+        return get_timezone(timezone)
+    return timezone
+
+
+class _Transitions:
+    """The UTC transition table of a timezone"""
+
+    __slots__ = ('utc_times', 'offsets', 'tzinfos', 'local_before', 'local_after')
+
+    def __init__(self, utc_times: list[datetime], offsets: list[timedelta], tzinfos: list):
+        self.utc_times = utc_times
+        self.offsets = offsets
+        self.tzinfos = tzinfos
+        # The wall time at each transition, with the offset before and after the transition
+        self.local_before = [utc_times[0]] + [utc_times[i] + offsets[i - 1] for i in range(1, len(utc_times))]
+        self.local_after = [utc_times[0]] + [utc_times[i] + offsets[i] for i in range(1, len(utc_times))]
+
+
+@lru_cache(maxsize=256)
+def _get_transitions(timezone) -> _Transitions | None:
+    """
+    Builds the transition table of the given timezone once.
+    Returns None for the timezones that do not expose their transitions (e.g. zoneinfo)
+
+    :param timezone: A tzinfo
+    """
+    if hasattr(timezone, '_utc_transition_times'):
+        # pytz timezones with DST keep their UTC transition table and a tzinfo instance per offset. pytz has no public API
+        # for them, and calling `utcoffset` per transition would build the same table much slower, so the attributes are read directly.
+        # The other timezones (the static pytz timezones, UTC, and zoneinfo) fall back below
+        return _Transitions(
+            list(timezone._utc_transition_times),  # noqa: SLF001
+            [info[0] for info in timezone._transition_info],  # noqa: SLF001
+            [timezone._tzinfos[info] for info in timezone._transition_info]  # noqa: SLF001
+        )
+
+    offset = timezone.utcoffset(None)
+    if offset is None:
+        return None
+    return _Transitions([datetime.min], [offset], [timezone])
+
+
+def localize_many(values, timezone, ambiguous: str = AMBIGUOUS_RAISE, nonexistent: str = NONEXISTENT_RAISE):
+    """
+    Makes the naive local datetimes aware in the given timezone using its transition table.
+    For a list of datetimes, returns a list of aware datetimes.
+    For a numpy `datetime64` array, returns an int64 array of the UTC epoch microseconds
+
+    :param values: A list of naive datetimes or a numpy `datetime64` array, in the local time of the timezone
+    :param timezone: The timezone of the local times
+    :param ambiguous: The policy for the local times that happen twice. The options are `raise`, `earliest`, `latest`, and `none`
+    :param nonexistent: The policy for the local times that do not exist. The options are `raise`, `shift_forward`, `shift_backward`, and `none`
+    """
+    _check_policies(ambiguous, nonexistent)
+    timezone = resolve(timezone)
+    transitions = _get_transitions(timezone)
+    if transitions is None:
+        if is_numpy_array(values):
+            return _localize_array_by_fold(values, timezone, ambiguous, nonexistent)
+        return [_localize_by_fold(t, timezone, ambiguous, nonexistent) for t in values]
+
+    if is_numpy_array(values):
+        return _localize_array(values, transitions, ambiguous, nonexistent)
+    return [_localize(t, transitions, ambiguous, nonexistent) for t in values]
+
+
+def localize(value: datetime, timezone, ambiguous: str = AMBIGUOUS_RAISE, nonexistent: str = NONEXISTENT_RAISE) -> datetime | None:
+    """
+    The scalar version of `localize_many`
+
+    :param value: A naive datetime in the local time of the timezone
+    :param timezone: The timezone of the local time
+    :param ambiguous: The policy for the local times that happen twice. The options are `raise`, `earliest`, `latest`, and `none`
+    :param nonexistent: The policy for the local times that do not exist. The options are `raise`, `shift_forward`, `shift_backward`, and `none`
+    """
+    _check_policies(ambiguous, nonexistent)
+    timezone = resolve(timezone)
+    transitions = _get_transitions(timezone)
+    if transitions is None:
+        return _localize_by_fold(value, timezone, ambiguous, nonexistent)
+    if len(transitions.utc_times) == 1:
+        return value.replace(tzinfo=timezone)
+    return _localize(value, transitions, ambiguous, nonexistent)
+
+
+def from_epoch_many(values, timezone, epoch_unit: str = 's') -> list[datetime]:
+    """
+    Converts the epoch values to aware datetimes in the given timezone
+
+    :param values: An iterable of epoch values
+    :param timezone: The target timezone
+    :param epoch_unit: The unit of the epoch values. The options are `s`, `ms`, and `us`
+    """
+    factor = EPOCH_UNIT_MICROSECONDS.get(epoch_unit)
+    if factor is None:
+        raise ValueError()
+
+    timezone = resolve(timezone)
+    transitions = _get_transitions(timezone)
+    if transitions is None:
+        utc_epoch = _EPOCH.replace(tzinfo=dt_timezone.utc)
+        return [(utc_epoch + timedelta(microseconds=int(value) * factor)).astimezone(timezone) for value in values]
+
+    utc_times, offsets, tzinfos = transitions.utc_times, transitions.offsets, transitions.tzinfos
+    result = []
+    for value in values:
+        utc = _EPOCH + timedelta(microseconds=int(value) * factor)
+        k = bisect_right(utc_times, utc) - 1
+        result.append((utc + offsets[k]).replace(tzinfo=tzinfos[k]))
+    return result
+
+
+def _check_policies(ambiguous: str, nonexistent: str) -> None:
+    if ambiguous not in (AMBIGUOUS_RAISE, AMBIGUOUS_EARLIEST, AMBIGUOUS_LATEST, NONE):
+        raise ValueError()
+    if nonexistent not in (NONEXISTENT_RAISE, NONEXISTENT_SHIFT_FORWARD, NONEXISTENT_SHIFT_BACKWARD, NONE):
+        raise ValueError()
+
+
+def _localize(t: datetime, transitions: _Transitions, ambiguous: str, nonexistent: str) -> datetime | None:
+    utc_times, offsets = transitions.utc_times, transitions.offsets
+    last = len(utc_times) - 1
+
+    # The offsets are much shorter than the time between two transitions, so only the neighbours of the
+    # transition found by treating the local time as UTC can be in effect
+    i = bisect_right(utc_times, t) - 1
+    valid = []
+    for k in range(max(i - 1, 0), min(i + 1, last) + 1):
+        utc = t - offsets[k]
+        if utc_times[k] <= utc and (k == last or utc < utc_times[k + 1]):
+            valid.append(k)
+
+    if len(valid) == 1:
+        return t.replace(tzinfo=transitions.tzinfos[valid[0]])
+
+    if len(valid) > 1:
+        if ambiguous == AMBIGUOUS_RAISE:
+            raise ValueError("{t} is ambiguous".format(t=t))
+        elif ambiguous == NONE:
+            return None
+        # The earlier occurrence is the one with the earlier transition
+        k = valid[0] if ambiguous == AMBIGUOUS_EARLIEST else valid[-1]
+        return t.replace(tzinfo=transitions.tzinfos[k])
+
+    if nonexistent == NONEXISTENT_RAISE:
+        raise ValueError("{t} does not exist".format(t=t))
+    elif nonexistent == NONE:
+        return None
+
+    j = bisect_right(transitions.local_before, t) - 1
+    if nonexistent == NONEXISTENT_SHIFT_FORWARD:
+        return transitions.local_after[j].replace(tzinfo=transitions.tzinfos[j])
+    return (transitions.local_before[j] - _ONE_MICROSECOND).replace(tzinfo=transitions.tzinfos[j - 1])
+
+
+def _localize_by_fold(t: datetime, timezone, ambiguous: str, nonexistent: str) -> datetime | None:
+    """Localizes with the `fold` attribute (PEP 495), for the timezones without a transition table"""
+    first = t.replace(tzinfo=timezone, fold=0)
+    second = t.replace(tzinfo=timezone, fold=1)
+    first_offset = first.utcoffset()
+    second_offset = second.utcoffset()
+
+    if first_offset == second_offset:
+        return first
+
+    if first_offset > second_offset:
+        if ambiguous == AMBIGUOUS_RAISE:
+            raise ValueError("{t} is ambiguous".format(t=t))
+        elif ambiguous == NONE:
+            return None
+        return first if ambiguous == AMBIGUOUS_EARLIEST else second
+
+    if nonexistent == NONEXISTENT_RAISE:
+        raise ValueError("{t} does not exist".format(t=t))
+    elif nonexistent == NONE:
+        return None
+
+    # In a gap, the fold 0 has the offset before the transition and the fold 1 has the offset after it.
+    # The transition is between these two UTC times, so it is found with a binary search
+    low = (t - second_offset - _EPOCH) // _ONE_MICROSECOND
+    high = (t - first_offset - _EPOCH) // _ONE_MICROSECOND
+    utc_epoch = _EPOCH.replace(tzinfo=dt_timezone.utc)
+    while low < high:
+        middle = (low + high) // 2
+        if (utc_epoch + timedelta(microseconds=middle)).astimezone(timezone).utcoffset() == second_offset:
+            high = middle
+        else:
+            low = middle + 1
+
+    transition = utc_epoch + timedelta(microseconds=low)
+    if nonexistent == NONEXISTENT_SHIFT_FORWARD:
+        return transition.astimezone(timezone)
+    return (transition - _ONE_MICROSECOND).astimezone(timezone)
+
+
+def _localize_array_by_fold(values, timezone, ambiguous: str, nonexistent: str):
+    np = require_numpy()
+    if ambiguous == NONE or nonexistent == NONE:
+        raise ValueError()
+
+    local = np.asarray(values).astype('datetime64[us]').astype(np.int64)
+    result = np.empty(local.shape, dtype=np.int64)
+    for i, value in enumerate(local.tolist()):
+        aware = _localize_by_fold(_EPOCH + timedelta(microseconds=value), timezone, ambiguous, nonexistent)
+        result[i] = (aware.replace(tzinfo=None) - aware.utcoffset() - _EPOCH) // _ONE_MICROSECOND
+    return result
+
+
+def _localize_array(values, transitions: _Transitions, ambiguous: str, nonexistent: str):
+    np = require_numpy()
+    if ambiguous == NONE or nonexistent == NONE:
+        raise ValueError()
+
+    local = np.asarray(values).astype('datetime64[us]').astype(np.int64)
+    utc_times = _to_epoch_microseconds(np, transitions.utc_times)
+    offsets = np.array([o // _ONE_MICROSECOND for o in transitions.offsets], dtype=np.int64)
+    next_times = np.append(utc_times[1:], np.iinfo(np.int64).max)
+    last = len(utc_times) - 1
+
+    i = np.searchsorted(utc_times, local, side='right') - 1
+    candidates = np.stack([i - 1, i, i + 1])
+    in_range = (candidates >= 0) & (candidates <= last)
+    candidates = np.clip(candidates, 0, last)
+    utc = local - offsets[candidates]
+    valid = in_range & (utc_times[candidates] <= utc) & (utc < next_times[candidates])
+    count = valid.sum(axis=0)
+
+    if ambiguous == AMBIGUOUS_RAISE and (count > 1).any():
+        raise ValueError("{n} local times are ambiguous".format(n=int((count > 1).sum())))
+    if nonexistent == NONEXISTENT_RAISE and (count == 0).any():
+        raise ValueError("{n} local times do not exist".format(n=int((count == 0).sum())))
+
+    # The earliest occurrence is the valid candidate with the smallest UTC time
+    maximum = np.iinfo(np.int64).max
+    minimum = np.iinfo(np.int64).min
+    if ambiguous == AMBIGUOUS_LATEST:
+        result = np.where(valid, utc, minimum).max(axis=0)
+    else:
+        result = np.where(valid, utc, maximum).min(axis=0)
+
+    missing = count == 0
+    if missing.any():
+        local_before = _to_epoch_microseconds(np, transitions.local_before)
+        j = np.searchsorted(local_before, local[missing], side='right') - 1
+        shifted = utc_times[j] if nonexistent == NONEXISTENT_SHIFT_FORWARD else utc_times[j] - 1
+        result[missing] = shifted
+    return result
+
+
+def _to_epoch_microseconds(np, values: list[datetime]):
+    return np.array([(v - _EPOCH) // _ONE_MICROSECOND for v in values], dtype=np.int64)
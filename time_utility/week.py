@@ -1,83 +1,236 @@
 # Python
-from datetime import date, timedelta, datetime
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+
+# This Package
+from . import tables
+from ._numpy import require_numpy, is_numpy_array
+from ._periods import (
+    FOUR_WEEK_PERIODS_PER_YEAR, compute_four_week_period, get_four_week_periods, get_iso_year, get_week_number, get_week_start_ordinal,
+)
 
 
 class TimeUtilityWeek:
+    """
+    The ISO week of a date. The instances are immutable and compare (and hash) equal if they are in the same ISO week.
+    The week number, the start, and the end of the week are looked up on first access, and they are stored once per ISO week,
+    so the instances of the seven days of a week share them
+    """
+
+    __slots__ = ('od', '_week')
 
     def __init__(self, od: date):
-        self.od: date = od
-        self.week_number: int = od.isocalendar()[1]
-        self.week_start = od - timedelta(days=od.isoweekday() - 1)
-        self.week_end = od + timedelta(days=7 - od.isoweekday())
+        object.__setattr__(self, 'od', od)
+        object.__setattr__(self, '_week', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TimeUtilityWeek is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("TimeUtilityWeek is immutable")
+
+    def __reduce__(self):
+        return self.__class__, (self.od,)
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeUtilityWeek):
+            return NotImplemented
+        return self.iso_year == other.iso_year and self.week_number == other.week_number
+
+    def __hash__(self):
+        return hash((self.iso_year, self.week_number))
+
+    def __repr__(self):
+        return "TimeUtilityWeek({y}-W{w:02d}, od={od})".format(y=self.iso_year, w=self.week_number, od=self.od.isoformat())
+
+    @property
+    def iso_year(self) -> int:
+        return self._get_week().iso_year
+
+    @property
+    def week_number(self) -> int:
+        return self._get_week().week_number
+
+    @property
+    def week_start(self) -> date:
+        return self._get_week().week_start
+
+    @property
+    def week_end(self) -> date:
+        return self._get_week().week_end
+
+    def _get_week(self) -> '_IsoWeek':
+        week = self._week
+        if week is None:
+            week = _get_iso_week(*get_week_number(self.od))
+            object.__setattr__(self, '_week', week)
+        return week
+
+    @classmethod
+    def get_shared(cls, d: date) -> 'TimeUtilityWeek':
+        """
+        Returns a shared instance of the week of the given date, so that the repeated dates do not create new objects.
+        The data of the week itself is shared by all the dates of the week, see `iso_week_cache_info`
+
+        :param d: The target date
+        """
+        return _get_shared_week(d)
+
+    @staticmethod
+    def shared_cache_info():
+        """
+        Returns the hit/miss statistics of the cache of the shared instances
+        """
+        return _get_shared_week.cache_info()
+
+    @staticmethod
+    def iso_week_cache_info():
+        """
+        Returns the hit/miss statistics of the cache of the per-week data (the ISO year, the week number, the start, and the end)
+        """
+        return _get_iso_week.cache_info()
+
+    @staticmethod
+    def iso_year_cache_info():
+        """
+        Returns the hit/miss statistics of the cache of the per-year ISO week index
+        """
+        return get_iso_year.cache_info()
 
     @classmethod
     def get_week_from_week_number(cls, year: int, week: int) -> 'TimeUtilityWeek':
-        w = "{y}-W{wn}".format(y=year, wn=week)
-        d = datetime.strptime(w + '-1', '%G-W%V-%u').date()
-        return cls(d)
+        return cls(date.fromordinal(get_week_start_ordinal(year, week)))
+
+    @staticmethod
+    def get_week_number(d: date) -> tuple[int, int]:
+        """
+        Returns the ISO year and the ISO week number of the given date
+
+        :param d: The target date
+        """
+        return get_week_number(d)
+
+    @staticmethod
+    def get_week_numbers(dates):
+        """
+        The batch version of `get_week_number`.
+        Returns a list of (ISO year, week number) tuples for a list of dates,
+        or a numpy int array of shape (n, 2) for a numpy `datetime64` array
+
+        :param dates: A list of dates or a numpy `datetime64` array
+        """
+        if not is_numpy_array(dates):
+            return [TimeUtilityWeek.get_week_number(d) for d in dates]
+
+        np = require_numpy()
+        days = np.asarray(dates).astype('datetime64[D]')
+        # The ISO year of a date is the year of the Thursday of its week
+        weekday = (days.astype(np.int64) + 3) % 7  # Monday is 0
+        thursday = days - weekday + 3
+        iso_year = thursday.astype('datetime64[Y]')
+        week = (thursday - iso_year.astype('datetime64[D]')).astype(np.int64) // 7 + 1
+        return np.stack([iso_year.astype(np.int64) + 1970, week], axis=-1)
+
+    @staticmethod
+    def get_week_starts_from_week_numbers(pairs):
+        """
+        The batch version of `get_week_from_week_number`, returning only the first day (Monday) of the weeks.
+        Returns a list of dates for a list of (year, week) pairs,
+        or a numpy `datetime64[D]` array for a numpy int array of shape (n, 2)
+
+        :param pairs: A list of (ISO year, week number) pairs or a numpy int array of shape (n, 2)
+        """
+        if not is_numpy_array(pairs):
+            return [date.fromordinal(get_week_start_ordinal(year, week)) for year, week in pairs]
+
+        np = require_numpy()
+        arr = np.asarray(pairs, dtype=np.int64)
+        years, weeks = arr[:, 0], arr[:, 1]
+        if ((weeks < 1) | (weeks > 53)).any():
+            raise ValueError()
+        jan_4 = (years - 1970).astype('datetime64[Y]').astype('datetime64[D]') + 3
+        week_one = jan_4 - (jan_4.astype(np.int64) + 3) % 7
+        return week_one + (weeks - 1) * 7
 
     @classmethod
     def get_four_week_period(cls, d: date) -> tuple[date, int, date, int]:
-        week = cls(d)
-
-        first_week = 1
-        last_week = 4
-
-        if week.week_number == 1 and d.month == 12:  # The last few days of year but in the first week of next year
-            last_day_of_last_week = d - timedelta(days=1)
-            last_week_of_year = cls(last_day_of_last_week)
-            first_week = 49
-            last_week = 1
-
-            from_d = cls.get_week_from_week_number(d.year, 49).week_start
-            to_d = date(week.week_start.year, 12, 31)
-
-        elif week.week_number == 1 and d.month == 1 and week.week_start.month == 12:  # The Week 1 starts before Jan 1 and the selected date is in the new year
-            first_week = 1
-            last_week = 4
-            from_d = date(d.year, 1, 1)
-            to_d = cls.get_week_from_week_number(week.week_start.year + 1, 4).week_end
-
-        elif week.week_number == 1 and week.week_start.month == 1 and week.week_start.isoweekday() == 1 and week.week_start.day == 1:  # The first day of year and the first day of the week 1
-            first_week = 1
-            last_week = 4
-            from_d = date(week.week_start.year, 1, 1)
-            to_d = date(week.week_start.year, 1, 28)
-        elif week.week_number == 1 and week.week_start.month == 1 and week.week_start.isoweekday() > 1:  # The first day of the week 1 starts after Jan 1
-            last_day_of_last_week = week.week_start - timedelta(days=1)
-            last_week_of_year = cls(last_day_of_last_week)
-            first_week = last_week_of_year.week_number
-            last_week = 4
-            from_d = week.week_start  # date(d.year, 1, 1)
-            to_d = cls.get_week_from_week_number(week.week_start.year, 4).week_end
-        elif week.week_number >= 52 and d.year > week.week_start.year:  # The first few days of the year in the last week of the last year
-            first_week = week.week_number
-            last_week = 4
-            from_d = date(d.year, 1, 1)
-            to_d = cls.get_week_from_week_number(d.year, 4).week_end
-        elif week.week_number >= 49:
-            first_week = 49
-            from_d = cls.get_week_from_week_number(week.week_start.year, 49).week_start
-            to_d = date(week.week_start.year, 12, 31)
-            last_week = cls(to_d).week_number
-        elif week.week_number <= 4:
-            from_d = date(week.week_start.year, 1, 1)
-            first_week = cls(from_d).week_number
-            last_week = 4
-            to_d = cls.get_week_from_week_number(week.week_start.year, 4).week_end
-        else:
-            if week.week_number % 4 == 0:
-                first_week = week.week_number - 3
-                last_week = week.week_number
-            else:
-                first_week = week.week_number - ((week.week_number % 4) - 1)
-                last_week = week.week_number + (4 - (week.week_number % 4))
-
-            # The first and last calculated weeks
-            fw = cls.get_week_from_week_number(d.year, first_week)
-            lw = cls.get_week_from_week_number(d.year, last_week)
-
-            from_d = fw.week_start
-            to_d = lw.week_end
-
-        return from_d, first_week, to_d, last_week
+        calendar_tables = tables.get_tables()
+        if calendar_tables is not None and d.year in calendar_tables:
+            starts, periods = get_four_week_periods(d.year)
+            return periods[bisect_right(starts, d.toordinal()) - 1]
+        return compute_four_week_period(d)
+
+    @classmethod
+    def get_four_week_period_many(cls, dates, as_id: bool = False):
+        """
+        The batch version of `get_four_week_period`, using a per-year table of the periods.
+        For a list of dates, returns the lists of (from dates, first weeks, to dates, last weeks),
+        and for a numpy `datetime64` array, returns the same as numpy arrays
+
+        :param dates: A list of dates or a numpy `datetime64` array
+        :param as_id: If True, only the period ids are returned (`year * 13 + index of the period in the year`)
+        """
+        if not is_numpy_array(dates):
+            periods = []
+            ids = []
+            for d in dates:
+                table = get_four_week_periods(d.year)
+                index = bisect_right(table[0], d.toordinal()) - 1
+                periods.append(table[1][index])
+                ids.append(d.year * FOUR_WEEK_PERIODS_PER_YEAR + index)
+            if as_id:
+                return ids
+            return [p[0] for p in periods], [p[1] for p in periods], [p[2] for p in periods], [p[3] for p in periods]
+
+        np = require_numpy()
+        days = np.asarray(dates).astype('datetime64[D]')
+        if days.size == 0:
+            empty_days = np.array([], dtype='datetime64[D]')
+            empty_ints = np.array([], dtype=np.int64)
+            return empty_ints if as_id else (empty_days, empty_ints, empty_days, empty_ints)
+
+        # The periods tile the calendar, so the starts of all the periods of the covered years are sorted
+        first_year = int(days.min().astype('datetime64[Y]').astype(np.int64)) + 1970
+        last_year = int(days.max().astype('datetime64[Y]').astype(np.int64)) + 1970
+        periods = [p for year in range(first_year, last_year + 1) for p in get_four_week_periods(year)[1]]
+        starts = np.array([p[0] for p in periods], dtype='datetime64[D]')
+        index = np.searchsorted(starts, days, side='right') - 1
+
+        if as_id:
+            return index.astype(np.int64) + first_year * FOUR_WEEK_PERIODS_PER_YEAR
+        return (
+            starts[index],
+            np.array([p[1] for p in periods], dtype=np.int64)[index],
+            np.array([p[2] for p in periods], dtype='datetime64[D]')[index],
+            np.array([p[3] for p in periods], dtype=np.int64)[index],
+        )
+
+
+@lru_cache(maxsize=8192)
+def _get_shared_week(d: date) -> TimeUtilityWeek:
+    return TimeUtilityWeek(d)
+
+
+class _IsoWeek:
+    """The data of an ISO week, shared by the `TimeUtilityWeek` instances of its dates"""
+
+    __slots__ = ('iso_year', 'week_number', 'week_start', '_week_end')
+
+    def __init__(self, iso_year: int, week_number: int, week_start: date):
+        self.iso_year = iso_year
+        self.week_number = week_number
+        self.week_start = week_start
+        self._week_end = None
+
+    @property
+    def week_end(self) -> date:
+        # Created on first access, since the end of the last week of 9999 is out of the range of date
+        if self._week_end is None:
+            self._week_end = self.week_start + timedelta(days=6)
+        return self._week_end
+
+
+@lru_cache(maxsize=8192)
+def _get_iso_week(iso_year: int, week_number: int) -> _IsoWeek:
+    return _IsoWeek(iso_year, week_number, date.fromordinal(get_week_start_ordinal(iso_year, week_number)))
@@ -0,0 +1,162 @@
+# Python
+from datetime import datetime, timedelta, timezone
+import operator
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+
+# This Package
+from .main import TimeUtility
+
+
+class Window:
+    """A closed period of a stream with the aggregated value of its events"""
+
+    __slots__ = ('start', 'end', 'count', 'value')
+
+    def __init__(self, start: datetime, end: datetime, count: int, value: object):
+        self.start = start
+        self.end = end
+        self.count = count
+        self.value = value
+
+    def __repr__(self):
+        return "Window(start={s}, end={e}, count={c}, value={v!r})".format(s=self.start.isoformat(), e=self.end.isoformat(), c=self.count, v=self.value)
+
+
+class TumblingWindowAggregator:
+    """
+    Aggregates a stream of (timestamp, value) pairs into the periods of `TimeUtility.get_period`.
+    Only the open windows are kept in memory. A window is emitted once the watermark
+    (the latest timestamp seen minus the allowed lateness) passes its end
+    """
+
+    def __init__(
+        self,
+        period: str,
+        offset: int = 0,
+        allowed_lateness: timedelta = timedelta(0),
+        aggregate: Callable[[object, object], object] = operator.add,
+        initial: object = 0
+    ):
+        """
+        :param period: The period of the windows. Please use the period constants of TimeUtility such as `TimeUtility.DAILY`
+        :param offset: The optional timezone offset in minutes, same as `get_period`
+        :param allowed_lateness: How long a window is kept open after its end, to accept the out of order events
+        :param aggregate: The function to add a value to the aggregated value of a window, defaults to sum
+        :param initial: The initial aggregated value of every window
+        """
+        if period not in (TimeUtility.DAILY, TimeUtility.WEEKLY, TimeUtility.MONTHLY, TimeUtility.ANNUAL, TimeUtility.FOUR_WEEKLY):
+            raise ValueError()
+
+        self.period = period
+        self.offset = offset
+        self.allowed_lateness = allowed_lateness
+        self.aggregate = aggregate
+        self.initial = initial
+
+        self.watermark: datetime | None = None
+        self.late_events = 0
+
+        self._open: dict[datetime, Window] = {}
+        self._next_close: datetime | None = None
+        self._closed_until: datetime | None = None
+        self._last: Window | None = None
+
+    def add(self, timestamp: datetime, value: object) -> list[Window]:
+        """
+        Adds an event to its window and returns the windows closed by the new watermark.
+        The events of a window that ended before the watermark (or was already emitted) are dropped and counted in `late_events`
+
+        :param timestamp: The time of the event. Naive datetimes are considered to be in UTC
+        :param value: The value of the event
+        """
+        if timestamp.tzinfo is None:
+            timestamp = TimeUtility.make_aware(timestamp)
+
+        if self._closed_until is not None and timestamp <= self._closed_until:
+            self.late_events += 1
+            return []
+
+        window = self._last
+        if window is None or not (window.start <= timestamp <= window.end):
+            start, end = self._get_period(timestamp)
+            # A window ending before the watermark is closed, even if it was never opened
+            if self.watermark is not None and end < self.watermark:
+                self.late_events += 1
+                return []
+            window = self._get_window(start, end)
+            self._last = window
+
+        window.count += 1
+        window.value = self.aggregate(window.value, value)
+
+        return self.advance_watermark(timestamp - self.allowed_lateness)
+
+    def advance_watermark(self, watermark: datetime) -> list[Window]:
+        """
+        Moves the watermark forward (it never moves back) and returns the windows that ended before it
+
+        :param watermark: The new watermark
+        """
+        if self.watermark is not None and watermark <= self.watermark:
+            return []
+        self.watermark = watermark
+
+        if self._next_close is None or self._next_close >= watermark:
+            return []
+
+        closed = sorted((w for w in self._open.values() if w.end < watermark), key=lambda w: w.start)
+        for w in closed:
+            del self._open[w.start]
+        self._closed_until = closed[-1].end if self._closed_until is None else max(self._closed_until, closed[-1].end)
+        self._next_close = min((w.end for w in self._open.values()), default=None)
+        if self._last is not None and self._last.start not in self._open:
+            self._last = None
+        return closed
+
+    def flush(self) -> list[Window]:
+        """
+        Closes and returns all the open windows, e.g. at the end of the stream
+        """
+        closed = sorted(self._open.values(), key=lambda w: w.start)
+        self._open.clear()
+        self._next_close = None
+        self._last = None
+        if closed:
+            self._closed_until = closed[-1].end if self._closed_until is None else max(self._closed_until, closed[-1].end)
+        return closed
+
+    def process(self, stream: Iterable[tuple[datetime, object]]) -> Iterator[Window]:
+        """
+        Consumes the stream lazily and yields the windows as they are closed. The remaining windows are yielded at the end of the stream
+
+        :param stream: An iterable of (timestamp, value) pairs
+        """
+        for timestamp, value in stream:
+            yield from self.add(timestamp, value)
+        yield from self.flush()
+
+    async def process_async(self, stream: AsyncIterable[tuple[datetime, object]]) -> AsyncIterator[Window]:
+        """
+        The async version of `process`
+
+        :param stream: An async iterable of (timestamp, value) pairs
+        """
+        async for timestamp, value in stream:
+            for window in self.add(timestamp, value):
+                yield window
+        for window in self.flush():
+            yield window
+
+    def _get_period(self, timestamp: datetime) -> tuple[datetime, datetime]:
+        # `get_period` shifts the UTC boundaries by the offset, so the date of the period is the date of the shifted back timestamp
+        local = TimeUtility.adjust_offset(timestamp.astimezone(timezone.utc), self.offset, True)
+        return TimeUtility.get_period(local.year, local.month, local.day, self.period, self.offset)
+
+    def _get_window(self, start: datetime, end: datetime) -> Window:
+        window = self._open.get(start)
+        if window is None:
+            window = Window(start, end, 0, self.initial)
+            self._open[start] = window
+            if self._next_close is None or end < self._next_close:
+                self._next_close = end
+        return window